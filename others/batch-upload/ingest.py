@@ -0,0 +1,169 @@
+import datetime
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import os
+import re
+import sys
+import time
+import uuid
+
+"""Like batch.py, but straight into the live saves/data.json (no data.json to merge by hand).
+Lines are read a block at a time and checked on a process pool, so big inputs stay fine.
+Ids are UUID5 of the problem itself: running the same file again updates the same entries
+instead of adding copies, and play stats of entries already there are kept."""
+
+# batch.py sits beside this file, the app itself two folders up
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from batch import parse_input_line, convert_wind
+from src.utils.data_manager import DataManager
+from src.utils.validators import Validator
+
+# Fixed namespace: the same problem gets the same id on every machine
+INGEST_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "mahjourney/batch-upload")
+
+# Lines read (and held) at once, the pool gets them in chunks of CHUNKSIZE
+BLOCK = 20000
+CHUNKSIZE = 500
+
+DORA_FORMAT = re.compile(r'^([0-9]+[mpsz])+$')
+WIND_LETTERS = {"E", "S", "W", "N"}
+
+# --- Lines (module level, so the pool can pickle them) --- #
+
+def entry_id(data, players):
+    """UUID5 of what makes the problem, whatever its title or line"""
+
+    fields = [players] + [data[key] for key in ['wind', 'self_wind', 'game', 'honba', 'turn', 'dora', 'hands', 'answer_input']]
+    return str(uuid.uuid5(INGEST_NAMESPACE, "|".join(fields)))
+
+def check_line(data):
+    """Reason a parsed line cannot be a problem, "" if it is fine"""
+
+    if data['wind'].upper() not in WIND_LETTERS or data['self_wind'].upper() not in WIND_LETTERS:
+        return "wind"
+    if not (data['game'].isdigit() and data['honba'].isdigit() and data['turn'].isdigit()):
+        return "game/honba/turn"
+    if not DORA_FORMAT.match(data['dora']):
+        return "dora"
+    result = Validator.validate_hands_format(data['hands'])
+    if not result["valid"]:
+        return f"hands ({result['error_type']})"
+    if result["total_tiles"] not in [2, 5, 8, 11, 14]:
+        return "hands (not in turn)"
+    # One or more right answers ("5p6m"), a 5 matches a red 5 and the other way round
+    hand_tiles = {Validator._fivedize_zero(tile) for tile in Validator._parse_tiles_from_string(data['hands'])}
+    answer_tiles = Validator._parse_tiles_from_string(data['answer_input'])
+    if not answer_tiles or any(Validator._fivedize_zero(tile) not in hand_tiles for tile in answer_tiles):
+        return "answer not in hands"
+    return ""
+
+def build_line(item):
+    """Pool worker: (line number, line, options) -> (line number, entry or None, error)"""
+
+    line_no, line, options = item
+    try:
+        data = parse_input_line(line)
+        error = check_line(data)
+        if error:
+            return line_no, None, error
+    except Exception as e:
+        return line_no, None, str(e).strip()
+
+    create_time = options['base_time'] + datetime.timedelta(seconds=line_no - 1)
+    entry = {
+        "create_time": create_time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "title": f"{options['title']} {str(line_no).zfill(3)}",
+        "encounter": 0, "correct": 0, "accuracy": "N/A %",
+        "source": options['source'], "players": options['players'], "difficulty": 0,
+        "wind": f"info.{convert_wind(data['wind'])}", "self_wind": f"info.{convert_wind(data['self_wind'])}",
+        "game": data['game'], "honba": data['honba'], "turn": data['turn'],
+        "dora": data['dora'], "hands": data['hands'],
+        "answer_action": "answer.discard", "answer_input": data['answer_input'],
+        "intro": "/", "notes": "/",
+        "id": entry_id(data, options['players']),
+    }
+    return line_no, entry, ""
+
+def read_blocks(input_filename, options):
+    """(line number, line, options) of the non-empty lines, BLOCK of them at a time"""
+
+    with open(input_filename, 'r', encoding='utf-8') as f:
+        numbered = ((i + 1, line, options) for i, line in enumerate(f) if line.strip())
+        while True:
+            block = list(islice(numbered, BLOCK))
+            if not block:
+                return
+            yield block
+
+def ingest(input_filename, options, workers=None):
+    """Build every good line of a file, then upsert them in one write.
+    Returns: (added, updated, repeated, errors [(line number, error)])"""
+
+    workers = workers or os.cpu_count() or 1
+    entries = {}
+    errors = []
+    repeated = 0
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for block in read_blocks(input_filename, options):
+            if pool is None or len(block) < CHUNKSIZE:
+                results = [build_line(item) for item in block]
+            else:
+                results = pool.map(build_line, block, chunksize=CHUNKSIZE)
+            for line_no, entry, error in results:
+                if entry is None:
+                    errors.append((line_no, error))
+                elif entry['id'] in entries:
+                    # The same problem twice in one file, the first line wins
+                    repeated += 1
+                else:
+                    entries[entry['id']] = entry
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    result = DataManager().upsert_entries(list(entries.values()))
+    if result is None:
+        raise OSError("Could not write data.json")
+    return result[0], result[1], repeated, errors
+
+def main():
+    """Ingest a batch .txt into the app: py ingest.py <Name>.txt [workers] [--title=...] [--source=...] [--three] [--time=2025-01-01T00:00:01]"""
+
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    if not args:
+        print(main.__doc__)
+        sys.exit(1)
+    options = dict(arg[2:].split("=", 1) for arg in sys.argv[1:] if arg.startswith("--") and "=" in arg)
+
+    input_filename = args[0]
+    if not os.path.exists(input_filename):
+        print(f"File '{input_filename}' not exist")
+        sys.exit(1)
+    workers = int(args[1]) if len(args) > 1 else None
+
+    line_options = {
+        'title': options.get("title", os.path.splitext(os.path.basename(input_filename))[0]),
+        'source': options.get("source", "source.exercises"),
+        'players': "players.three" if "--three" in sys.argv else "players.four",
+        'base_time': datetime.datetime.fromisoformat(options.get("time", "2025-01-01T00:00:01")),
+    }
+
+    start = time.perf_counter()
+    try:
+        added, updated, repeated, errors = ingest(input_filename, line_options, workers)
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    for line_no, error in errors[:50]:
+        print(f"Error when Line {line_no}: {error}")
+    if len(errors) > 50:
+        print(f"... {len(errors) - 50} more")
+    print(f"Added {added}, updated {updated}, repeated {repeated}, errors {len(errors)} "
+          f"in {time.perf_counter() - start:.2f}s")
+
+if __name__ == "__main__":
+    main()
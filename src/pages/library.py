@@ -4,26 +4,28 @@ import uuid
 import shutil
 import zipfile
 from datetime import datetime
-from collections import Counter, OrderedDict
+from collections import OrderedDict
 from PyQt5.QtWidgets import (   QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-                                QLabel, QScrollArea, QFrame, QGridLayout, 
-                                QComboBox, QLineEdit, QGroupBox, QCheckBox,
-                                QApplication, QSizePolicy, QMessageBox, QFileDialog)
-from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtGui import QPixmap, QFontMetrics, QIntValidator
-
-try:
-    from pypinyin import pinyin, Style
-    HAS_PINYIN = True
-except ImportError:
-    HAS_PINYIN = False
+                                QLabel, QComboBox, QLineEdit, QGroupBox, QCheckBox,
+                                QMessageBox, QFileDialog)
+from PyQt5.QtCore import pyqtSignal, QTimer
+from PyQt5.QtGui import QIntValidator
 
 from src.utils.i18n import Dict
-from src.utils.format_applier import apply_font_to_widgets
-from src.utils.path_finder import get_resource_path
+from src.utils.format_applier import apply_font_to_widgets, get_app_font
 from src.utils.settings_manager import SettingsManager
+from src.utils.analysis_store import AnalysisStore
+from src.utils.image_hash import ImageHash, ImageHashIndex
+from src.utils.tile_index import TileIndex
+from src.utils.text_index import TextIndex, TEXT_FIELDS
+from src.utils.sort_keys import SortKeys
+from src.utils.filter_compiler import FilterCompiler
 
 from src.widgets.hint_dialog import StyledMessageBox
+from src.widgets.entry_view import EntryView
+
+# Sorts that read the precomputed analysis columns
+ANALYSIS_SORTS = ["library.shanten_asc", "library.shanten_desc", "library.ukeire_asc", "library.ukeire_desc"]
 
 class LibraryPage(QWidget):
 
@@ -35,6 +37,10 @@ class LibraryPage(QWidget):
         super().__init__()
         self.data_manager = data_manager
         # self.settings_manager = SettingsManager()
+        self.analysis_store = AnalysisStore()
+        self.tile_index = TileIndex()  # Hands search
+        self.text_index = TextIndex()  # Search box and text filters
+        self.sort_keys = SortKeys()    # Pinyin / kana keys of the titles
 
         self.current_layout = "list"
 
@@ -43,7 +49,15 @@ class LibraryPage(QWidget):
 
         self.current_search_tiles = ""  # Searching tiles
         self.is_searching = False       # If in hands searching mode
+        self.current_search_text = ""   # Search box (title, intro, notes)
         
+        # Bank as loaded, and the filtered + sorted ids of it (paging only slices them)
+        self.entries = {}
+        self.entries_version = None
+        self.analysis_version = None  # Bank version the analysis columns were last brought up to
+        self.result_key = None
+        self.result_ids = []
+
         # Pagination state
         self.current_page = 1
         self.page_size = 30
@@ -59,6 +73,8 @@ class LibraryPage(QWidget):
             'wind': [],
             'self_wind': [],
             'game': [],
+            'shanten': [],
+            'waits': [],
             'difficulty_min': 0,
             'difficulty_max': 100,
             'accuracy_min': 0,
@@ -69,6 +85,7 @@ class LibraryPage(QWidget):
             'negate': False
         }
         self.is_filtering = False       # If in filter mode
+        self.filter_predicate = FilterCompiler.compile(self.filter_state, self.analysis_store, self.text_index)
 
         self.init_ui()
         self.load_library()
@@ -118,7 +135,9 @@ class LibraryPage(QWidget):
             "library.turn_asc", "library.turn_desc",
             "library.difficulty_asc", "library.difficulty_desc",
             "library.encounter_asc", "library.encounter_desc",
-            "library.accuracy_asc", "library.accuracy_desc"
+            "library.accuracy_asc", "library.accuracy_desc",
+            "library.shanten_asc", "library.shanten_desc",
+            "library.ukeire_asc", "library.ukeire_desc"
         ]
         for option in sort_options:
             self.sort_combo.addItem(Dict.t(option), option)
@@ -132,10 +151,13 @@ class LibraryPage(QWidget):
         
         self.items_per_page_combo = QComboBox()
         self.items_per_page_combo.setStyleSheet("QComboBox{padding:8;}")
-        self.items_per_page_combo.addItems(["20", "30", "50", "80", "100", "200", "300", "500", "1000"])
+        for size in ["20", "30", "50", "80", "100", "200", "300", "500", "1000"]:
+            self.items_per_page_combo.addItem(size, int(size))
+        # 0: everything on one page (only the cards on screen are painted)
+        self.items_per_page_combo.addItem(Dict.t("library.page_all"), 0)
         self.items_per_page_combo.setCurrentText("30")
         self.items_per_page_combo.setMaximumWidth(100)
-        self.items_per_page_combo.currentTextChanged.connect(self.on_page_size_changed)
+        self.items_per_page_combo.currentIndexChanged.connect(self.on_page_size_changed)
         items_per_page_layout.addWidget(self.items_per_page_combo)
         
         # Page navigation
@@ -194,6 +216,19 @@ class LibraryPage(QWidget):
         self.hands_search_btn.clicked.connect(self.open_hands_search)
         toolbar_row2.addWidget(self.hands_search_btn)
         
+        # Search bar (live, a short pause after the last key)
+        self.search_input = QLineEdit()
+        self.search_input.setStyleSheet("QLineEdit{padding:8;}")
+        self.search_input.setPlaceholderText(Dict.t("library.search_placeholder"))
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.setMinimumWidth(200)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(200)
+        self.search_timer.timeout.connect(lambda: self.search_items(self.search_input.text()))
+        self.search_input.textChanged.connect(self.search_timer.start)
+        toolbar_row2.addWidget(self.search_input)
+        
         # Entry count display (shown/total) now placed here next to filter & hands
         self.entry_count_label = QLabel()
         self.entry_count_label.setStyleSheet("QLabel{padding:8;}")
@@ -235,22 +270,13 @@ class LibraryPage(QWidget):
         
         layout.addLayout(toolbar_row2)
         
-        # Scroll area for entry display
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setStyleSheet("""
-            QScrollArea {
-                background-color: #FFFFFF;
-                border: 1px solid #FFFFFF;
-            }
-        """)
-        self.scroll_widget = QWidget()
-        self.scroll_layout = QGridLayout(self.scroll_widget)
-        self.scroll_layout.setSpacing(12)
-        self.scroll_layout.setContentsMargins(12, 12, 12, 12)
-        self.scroll_area.setWidget(self.scroll_widget)
-        self.scroll_area.setWidgetResizable(True)
-        
-        layout.addWidget(self.scroll_area)
+        # Entry display: a model/view list, cards are painted (not built from widgets) and only when on screen
+        self.entry_view = EntryView(self.data_manager.images_dir, self.get_translated_metadata)
+        self.entry_view.set_layout(self.current_layout)
+        self.entry_view.entry_clicked.connect(self.open_entry_editor)
+        self.entry_view.entry_toggled.connect(self.toggle_entry_selection)
+        
+        layout.addWidget(self.entry_view)
         
         self.setLayout(layout)
         
@@ -382,11 +408,29 @@ class LibraryPage(QWidget):
                     if os.path.isfile(image_path):
                         imported_images[image_file] = image_path
             
+            # Images of the bank before the import, to point out near duplicate ones coming in
+            try:
+                image_hash_index = ImageHashIndex()
+                image_hash_index.build(current_data, self.data_manager.images_dir)
+            except Exception as e:
+                # print(f"Image index wrong: {e}")
+                image_hash_index = None
+
             # Merge data and handle UUID conflicts
             merged_count = 0
             image_conflict_count = 0
+            similar_image_count = 0
             
             for entry_id, entry_data in imported_data.items():
+                image_filename = entry_data.get('image_filename', '')
+                if image_hash_index and image_filename in imported_images:
+                    try:
+                        if image_hash_index.find(ImageHash.hashes(imported_images[image_filename])):
+                            similar_image_count += 1
+                    except Exception as e:
+                        # print(f"Image check wrong: {e}")
+                        pass
+
                 if entry_id not in current_data:
                     # No conflict, add directly
                     current_data[entry_id] = entry_data
@@ -428,6 +472,8 @@ class LibraryPage(QWidget):
             message = Dict.t("library.import_success_message").format(merged_count)
             if image_conflict_count > 0:
                 message += f"\n{Dict.t('library.import_conflict_message').format(image_conflict_count)}"
+            if similar_image_count > 0:
+                message += f"\n{Dict.t('library.import_similar_message').format(similar_image_count)}"
             
             # Success
             StyledMessageBox.information(self,
@@ -516,20 +562,9 @@ class LibraryPage(QWidget):
         
         if filter_dialog.exec_() == filter_dialog.Accepted:
             self.filter_state = filter_dialog.get_filter_state()
-            self.is_filtering = any([
-                self.filter_state['text_contains']['text'] and self.filter_state['text_contains']['fields'],
-                self.filter_state['text_excludes']['text'] and self.filter_state['text_excludes']['fields'],
-                self.filter_state['source'],
-                self.filter_state['players'],
-                self.filter_state['image'],
-                self.filter_state['wind'],
-                self.filter_state['self_wind'],
-                self.filter_state['game'],
-                (self.filter_state['difficulty_min'] > 0 or self.filter_state['difficulty_max'] < 100),
-                (self.filter_state['accuracy_min'] > 0 or self.filter_state['accuracy_max'] < 100),
-                self.filter_state['start_date'] is not None,
-                self.filter_state['end_date'] is not None
-            ])
+            self.is_filtering = FilterCompiler.is_active(self.filter_state)
+            # Compiled once here, then called for every entry
+            self.filter_predicate = FilterCompiler.compile(self.filter_state, self.analysis_store, self.text_index)
             
             self.reset_to_page_one()
             self.apply_filters()
@@ -545,7 +580,10 @@ class LibraryPage(QWidget):
             'players': [],
             'image': [],
             'wind': [],
+            'self_wind': [],
             'game': [],
+            'shanten': [],
+            'waits': [],
             'difficulty_min': 0,
             'difficulty_max': 100,
             'accuracy_min': 0,
@@ -556,6 +594,7 @@ class LibraryPage(QWidget):
             'negate': False
         }
         self.is_filtering = False
+        self.filter_predicate = FilterCompiler.compile(self.filter_state, self.analysis_store, self.text_index)
         
         self.reset_to_page_one()
         self.apply_filters()
@@ -683,6 +722,7 @@ class LibraryPage(QWidget):
         """Toggle batch selection mode"""
 
         self.selection_mode = not self.selection_mode
+        self.entry_view.selection_mode = self.selection_mode
         self.selected_entries.clear()
         
         if self.selection_mode:
@@ -724,6 +764,7 @@ class LibraryPage(QWidget):
 
         if self.selection_mode:
             self.selection_mode = False
+            self.entry_view.selection_mode = False
             self.selected_entries.clear()
 
             self.batch_select_btn.setText(Dict.t("library.batch_select"))
@@ -745,25 +786,9 @@ class LibraryPage(QWidget):
             return
         
         # Only select those on current page
-        '''visible_entry_ids = set()
-        for i in range(self.scroll_layout.count()):
-            item = self.scroll_layout.itemAt(i)
-            if item and item.widget():
-                widget = item.widget()
-                entry_id = getattr(widget, 'entry_id', None)
-                if entry_id is not None:
-                    visible_entry_ids.add(entry_id)
-        
-        self.selected_entries = visible_entry_ids.copy()'''
-
         self.selected_entries.clear()
-        for i in range(self.scroll_layout.count()):
-            item = self.scroll_layout.itemAt(i)
-            if item and item.widget():
-                widget = item.widget()
-                entry_id = getattr(widget, 'entry_id', None)
-                if entry_id is not None:
-                    self.selected_entries[entry_id] = True
+        for entry_id in self.entry_view.entry_model.ids:
+            self.selected_entries[entry_id] = True
         
         self.update_selection_styles()
         
@@ -775,126 +800,22 @@ class LibraryPage(QWidget):
     def update_selection_styles(self):
         """Update selection styles for all entries"""
 
-        for i in range(self.scroll_layout.count()):
-            item = self.scroll_layout.itemAt(i)
-            if item and item.widget():
-                widget = item.widget()
-
-                # Only process frames with entry_id attribute (entry frames)
-                entry_id = getattr(widget, 'entry_id', None)
-                if entry_id is not None:  # Only entry frames have entry_id
-                    if entry_id in self.selected_entries:
-                        # Only modify border: blue
-                        widget.setStyleSheet("""
-                            #main_frame {
-                                border: 1px solid #0078d4;
-                                background-color: #E0EEF9;
-                            }
-                        """)
-                    else:
-                        widget.setStyleSheet("""
-                            #main_frame {
-                                border: 1px solid #000000;
-                            }
-                            #main_frame:hover {
-                                border: 1px solid #0078d4;
-                                background-color: #f8fbff;
-                            }
-                        """)  # Restore default style with hover
+        self.entry_view.entry_model.refresh()
     
-    def toggle_entry_selection(self, entry_id, widget):
+    def toggle_entry_selection(self, entry_id):
         """Switch selected / not selected on entry"""
 
         if entry_id in self.selected_entries:
-            '''self.selected_entries.discard(entry_id)'''
             del self.selected_entries[entry_id]
-            widget.setStyleSheet("""
-                #main_frame {
-                    border: 1px solid #000000;
-                }
-                #main_frame:hover {
-                    border: 1px solid #0078d4;
-                    background-color: #f8fbff;
-                }
-            """)
         else:
-            '''self.selected_entries.add(entry_id)'''
             self.selected_entries[entry_id] = True
-            widget.setStyleSheet("""
-                #main_frame {
-                    border: 1px solid #0078d4; 
-                    background-color: #E0EEF9;
-                }
-            """)
+        self.entry_view.entry_model.refresh(entry_id)
         
         has_selection = len(self.selected_entries) > 0
         self.delete_btn.setEnabled(has_selection)
         self.export_btn.setEnabled(has_selection)
         self.reset_career_btn.setEnabled(has_selection)
 
-    # Mouse Event
-
-    def setup_drag_selection(self, frame):
-        """Drag mouse for multi select"""
-
-        def mousePressEvent(event):
-            if event.button() == Qt.LeftButton:
-                # print(f"Mouse pressed on entry: {frame.entry_id}")
-                
-                if self.selection_mode:
-                    frame.is_dragging = True
-                    # Drag start's status
-                    frame.drag_start_selected = (frame.entry_id in self.selected_entries)
-                    # Current entry's status
-                    self.toggle_entry_selection(frame.entry_id, frame)
-                else:
-                    # Normal: Call editor
-                    # print("Debug: Opening editor in normal mode")
-                    self.open_entry_editor(frame.entry_id)
-            else:
-                QFrame.mousePressEvent(frame, event)
-        
-        def mouseMoveEvent(event):
-            if self.selection_mode and frame.is_dragging and event.buttons() & Qt.LeftButton:
-                pos = frame.mapToGlobal(event.pos())
-                widget = QApplication.widgetAt(pos)
-                
-                while widget and not hasattr(widget, 'entry_id'):
-                    widget = widget.parent()
-                
-                if widget and hasattr(widget, 'entry_id'):
-                    entry_id = widget.entry_id
-                    current_selected = (entry_id in self.selected_entries)
-                    
-                    if current_selected != frame.drag_start_selected:
-                        # operated so skip
-                        pass
-                    else:
-                        # Same status, switch
-                        self.toggle_entry_selection(entry_id, widget)
-            else:
-                QFrame.mouseMoveEvent(frame, event)
-        
-        def mouseReleaseEvent(event):
-            if event.button() == Qt.LeftButton:
-                frame.is_dragging = False
-            QFrame.mouseReleaseEvent(frame, event)
-        
-        frame.mousePressEvent = mousePressEvent
-        frame.mouseMoveEvent = mouseMoveEvent
-        frame.mouseReleaseEvent = mouseReleaseEvent
-    
-    '''def on_entry_clicked(self, entry_id, widget):
-        # Handle click of entry
-        print(f"Entry clicked: {entry_id}")
-              
-        if not self.selection_mode:
-            self.open_entry_editor(entry_id)
-            return
-        
-        # In selection mode, toggle selection state
-        self.toggle_entry_selection(entry_id, widget)'''
-
     # --- Data Edit --- #
 
     def open_entry_editor(self, entry_id):
@@ -909,8 +830,20 @@ class LibraryPage(QWidget):
     
     def load_library(self):
 
+        # Nothing written since the last load: keep the bank and every index as they are
+        version = self.data_manager.data_version()
+        if version == self.entries_version:
+            self.apply_filters()
+            return
+
         # Load items from library
         self.entries = self.data_manager.load_entries()
+        self.entries_version = version
+        # Saved, edited and deleted entries are the only ones re-indexed
+        self.tile_index.refresh(self.entries)
+        self.text_index.refresh(self.entries)
+        # Keys are only made for titles never seen before
+        self.sort_keys.refresh(self.entries)
         self.apply_filters()
     
     # --- Pagination Methods --- #
@@ -923,22 +856,29 @@ class LibraryPage(QWidget):
                 self.reset_selection_mode()
             
             self.current_page = page_num
-            self.apply_filters()
-            self.update_pagination_info()
+            self.show_page()
     
     def update_pagination_info(self):
 
         if hasattr(self, 'page_info_label'):
             self.page_info_label.setText(f"{self.current_page}/{self.total_pages}")
     
-    def get_paged_entries(self, entries):
-        """Get entries on current page"""
+    def get_paged_entries(self, entry_ids):
+        """Get entries on current page, from the ordered ids"""
 
-        if not entries:
+        if not entry_ids:
+            self.total_pages = 1
+            self.current_page = 1
             return {}
         
+        # Page size 0: all on one page
+        if not self.page_size:
+            self.total_pages = 1
+            self.current_page = 1
+            return {entry_id: self.entries[entry_id] for entry_id in entry_ids}
+
         # Calculate
-        total_items = len(entries)
+        total_items = len(entry_ids)
         self.total_pages = max(1, (total_items + self.page_size - 1) // self.page_size)
         
         if self.current_page > self.total_pages:
@@ -948,18 +888,14 @@ class LibraryPage(QWidget):
         start_idx = (self.current_page - 1) * self.page_size
         end_idx = start_idx + self.page_size
         
-        # Turns into dict
-        entry_list = list(entries.items())
-        paged_entries = dict(entry_list[start_idx:end_idx])
-        
-        return paged_entries
+        # Only the ids of this page are turned into a dict
+        return {entry_id: self.entries[entry_id] for entry_id in entry_ids[start_idx:end_idx]}
     
-    def on_page_size_changed(self, new_size):
+    def on_page_size_changed(self, index):
 
-        self.page_size = int(new_size)
+        self.page_size = self.items_per_page_combo.itemData(index)
         self.reset_to_page_one()
-        self.apply_filters()
-        self.update_pagination_info()
+        self.show_page()
     
     def reset_to_page_one(self):
         
@@ -974,189 +910,92 @@ class LibraryPage(QWidget):
         except ValueError:
             self.page_jump_input.clear()
     
-    def matches_filter(self, entry_data):
-        """Check if an entry matches the current filter - very dogshit to implement."""
-
-        # Collects all filter applied
-        filter_results = []
-        
-        # Include text filter
-        if self.filter_state['text_contains']['text'] and self.filter_state['text_contains']['fields']:
-            text_contains_match = False
-            search_text = self.filter_state['text_contains']['text'].lower()
-            
-            for field in self.filter_state['text_contains']['fields']:
-                if field == 'title':
-                    if search_text in entry_data.get('title', '').lower():
-                        text_contains_match = True
-                        break
-                elif field == 'intro':
-                    if search_text in entry_data.get('intro', '').lower():
-                        text_contains_match = True
-                        break
-                elif field == 'notes':
-                    if search_text in entry_data.get('notes', '').lower():
-                        text_contains_match = True
-                        break
-            
-            filter_results.append(text_contains_match)
-        
-        # Exclude text filter
-        if self.filter_state['text_excludes']['text'] and self.filter_state['text_excludes']['fields']:
-            text_excludes_match = True  # Default not match, so not excluded
-            search_text = self.filter_state['text_excludes']['text'].lower()
-            
-            for field in self.filter_state['text_excludes']['fields']:
-                if field == 'title':
-                    if search_text in entry_data.get('title', '').lower():
-                        text_excludes_match = False
-                        break
-                elif field == 'intro':
-                    if search_text in entry_data.get('intro', '').lower():
-                        text_excludes_match = False
-                        break
-                elif field == 'notes':
-                    if search_text in entry_data.get('notes', '').lower():
-                        text_excludes_match = False
-                        break
-            
-            filter_results.append(text_excludes_match)
-        
-        # Source filter
-        if self.filter_state['source']:
-            source_match = entry_data.get('source', '') in self.filter_state['source']
-            filter_results.append(source_match)
-        
-        # Players filter
-        if self.filter_state['players']:
-            players_match = entry_data.get('players', '') in self.filter_state['players']
-            filter_results.append(players_match)
-        
-        # Image filter
-        if self.filter_state['image']:
-            has_image = bool(entry_data.get('image_filename', ''))
-            image_match = False
-            if 'common.have' in self.filter_state['image'] and has_image:
-                image_match = True
-            if 'common.noHave' in self.filter_state['image'] and not has_image:
-                image_match = True
-            filter_results.append(image_match)
-        
-        # Wind filter
-        if self.filter_state['wind']:
-            wind_match = entry_data.get('wind', '') in self.filter_state['wind']
-            filter_results.append(wind_match)
-        # Self wind filter
-        if self.filter_state['self_wind']:
-            swind_match = entry_data.get('self_wind', '') in self.filter_state['self_wind']
-            filter_results.append(swind_match)
-        
-        # Game filter
-        if self.filter_state['game']:
-            game_match = str(entry_data.get('game', '')) in self.filter_state['game']
-            filter_results.append(game_match)
-        
-        # Difficulty filter
-        if (self.filter_state['difficulty_min'] > 0 or self.filter_state['difficulty_max'] < 100):
-            difficulty = int(entry_data.get('difficulty', 0))
-            if difficulty < 0:  # Changed from == 0 to < 0, since 0 should count in filter now...
-                difficulty_match = False
-            else:
-                difficulty_match = (self.filter_state['difficulty_min'] <= difficulty <= self.filter_state['difficulty_max'])
-            filter_results.append(difficulty_match)
-        
-        # Accuracy filter
-        if (self.filter_state['accuracy_min'] > 0 or self.filter_state['accuracy_max'] < 100):
-            accuracy_str = entry_data.get('accuracy', 'N/A %')
-            if accuracy_str == 'N/A %' or not accuracy_str:  # N/A means no accuracy data, filter out
-                accuracy_match = False
-            else:
-                try:
-                    if accuracy_str.endswith('%'):
-                        accuracy_value = float(accuracy_str[:-1])
-                    else:
-                        accuracy_value = float(accuracy_str)
-                    
-                    accuracy_match = (self.filter_state['accuracy_min'] <= accuracy_value <= self.filter_state['accuracy_max']) 
-                except (ValueError, TypeError):
-                    accuracy_match = False
-            filter_results.append(accuracy_match)
-        
-        # Date filter
-        if self.filter_state['start_date'] or self.filter_state['end_date']:
-            entry_date_str = entry_data.get('create_time', '')
-            if entry_date_str:
-                try:
-                    from datetime import datetime
-                    # Parse ISO format date (e.g., "2025-10-10T19:06:41.402801")
-
-                    entry_date = datetime.fromisoformat(entry_date_str.replace('Z', '+00:00')).date()
-                    date_match = True
-                    
-                    if self.filter_state['start_date']:
-                        start_date = self.filter_state['start_date'].date() if hasattr(self.filter_state['start_date'], 'date') else self.filter_state['start_date']
-                        if entry_date < start_date:
-                            date_match = False
-                    
-                    if self.filter_state['end_date']:
-                        end_date = self.filter_state['end_date'].date() if hasattr(self.filter_state['end_date'], 'date') else self.filter_state['end_date']
-                        if entry_date > end_date:
-                            date_match = False
-                    
-                    filter_results.append(date_match)
-                except (ValueError, AttributeError):
-                    # If date parsing fails, skip this entry
-                    filter_results.append(False)
-            else:
-                filter_results.append(False)
-        
-        # Return true if all defaults
-        if not filter_results:
-            return True
-        
-        # Apply and, or
-        if self.filter_state['logic_mode'] == 'OR':
-            result = any(filter_results)
-        else:
-            result = all(filter_results)
-        
-        # Apply not
-        if self.filter_state['negate']:
-            result = not result
-        
-        return result
-
     def apply_filters(self):
-        """Apply all filter conditions"""
+        """Apply all filter conditions. The filtered and sorted ids are kept: they are only
+        made again when the bank, a filter, a search or the sort changes"""
 
         # Exit from batch selection mode prevent problems
         if self.selection_mode:
             self.reset_selection_mode()
 
+        result_key = self.get_result_key()
+        if result_key != self.result_key:
+            self.refresh_analysis()
+            self.result_ids = self.apply_sorting(self.get_filtered_entries())
+            self.result_key = result_key
+        
+        self.show_page()
+        
+        self.update_hands_search_button_style()
+        self.update_filter_button_style()
+
+    def refresh_analysis(self):
+        """Bring the analysis columns up to the bank, only once a shanten/ukeire sort or the shanten
+        or wait filter needs them, and once per bank version"""
+
+        needed = (self.sort_combo.currentData() in ANALYSIS_SORTS
+                  or (self.is_filtering and (self.filter_state.get('shanten') or self.filter_state.get('waits'))))
+        if not needed or self.analysis_version == self.entries_version:
+            return
+        # Only new/changed hands are recomputed; in process, the app itself must not spawn workers
+        self.analysis_store.refresh(self.entries, workers=1)
+        self.analysis_version = self.entries_version
+
+    def get_result_key(self):
+        """Everything the filtered and sorted ids depend on"""
+
+        filter_key = json.dumps(self.filter_state, sort_keys=True, default=str) if self.is_filtering else None
+        search_key = self.current_search_tiles if self.is_searching else ""
+        return (self.entries_version, filter_key, search_key, self.current_search_text, self.sort_combo.currentData())
+
+    def get_filtered_entries(self):
+        """Entries passing the hands search, the text search and the filter"""
+
         filtered_entries = {}
+
+        # Hands search: one posting list intersection, not a look at every hand
+        search_matches = None
+        if self.is_searching and self.current_search_tiles:
+            search_matches = self.tile_index.find(self.current_search_tiles)
+
+        # Search box: from the text index
+        text_matches = None
+        if self.current_search_text:
+            text_matches = self.text_index.matches(self.current_search_text, TEXT_FIELDS)
         
         for entry_id, entry_data in self.entries.items():
 
             # Hands search
-            if self.is_searching and self.current_search_tiles:
-                if not self.does_entry_contain_tiles(entry_data, self.current_search_tiles):
-                    continue
+            if search_matches is not None and entry_id not in search_matches:
+                continue
+
+            # Text search
+            if text_matches is not None and entry_id not in text_matches:
+                continue
 
             # Filter search
             if self.is_filtering:
-                if not self.matches_filter(entry_data):
+                if not self.filter_predicate(entry_data):
                     continue
         
             filtered_entries[entry_id] = entry_data
         
-        # Apply sorting
-        self.apply_sorting(filtered_entries)
+        return filtered_entries
+
+    def show_page(self):
+        """Show the current page of the kept ids (page flips and layout changes come here directly)"""
+
+        # Apply pagination
+        paged_entries = self.get_paged_entries(self.result_ids)
         
-        self.update_hands_search_button_style()
-        self.update_filter_button_style()
+        # Update entry count with three-part display: current page / filtered / total
+        self.update_entry_count(self.result_ids, paged_entries)
+        
+        self.display_entries(paged_entries)
+        self.update_pagination_info()
     
     def apply_sorting(self, entries):
-        """Sort!"""
+        """Sort! Returns: the ids in order"""
         
         sort_type = self.sort_combo.currentData()
         
@@ -1170,10 +1009,10 @@ class LibraryPage(QWidget):
 
         elif sort_type == "library.title_az":
             sorted_entries = dict(  sorted(entries.items(), 
-                                    key=lambda x: self.get_pinyin(x[1].get('title', ''))))
+                                    key=lambda x: self.sort_keys.key(x[1].get('title', ''))))
         elif sort_type == "library.title_za":
             sorted_entries = dict(  sorted(entries.items(), 
-                                    key=lambda x: self.get_pinyin(x[1].get('title', '')), 
+                                    key=lambda x: self.sort_keys.key(x[1].get('title', '')), 
                                     reverse=True))
             
         elif sort_type == "library.turn_asc":
@@ -1207,23 +1046,33 @@ class LibraryPage(QWidget):
             sorted_entries = dict(sorted(entries.items(), 
                                     key=lambda x: self.get_accuracy_value(x[1].get('accuracy', 'N/A %')), 
                                     reverse=True))
+
+        # Precomputed columns, illegal hands always go last
+        elif sort_type == "library.shanten_asc":
+            sorted_entries = dict(sorted(entries.items(), 
+                                    key=lambda x: self.analysis_store.value(x[0], 'shanten', 99)))
+        elif sort_type == "library.shanten_desc":
+            sorted_entries = dict(sorted(entries.items(), 
+                                    key=lambda x: self.analysis_store.value(x[0], 'shanten', -99), 
+                                    reverse=True))
+
+        elif sort_type == "library.ukeire_asc":
+            sorted_entries = dict(sorted(entries.items(), 
+                                    key=lambda x: self.analysis_store.value(x[0], 'answer_ukeire', 999)))
+        elif sort_type == "library.ukeire_desc":
+            sorted_entries = dict(sorted(entries.items(), 
+                                    key=lambda x: self.analysis_store.value(x[0], 'answer_ukeire', -1), 
+                                    reverse=True))
         else:
             sorted_entries = entries
         
-        # Apply pagination
-        paged_entries = self.get_paged_entries(sorted_entries)
-        
-        # Update entry count with three-part display: current page / filtered / total
-        self.update_entry_count(sorted_entries, paged_entries)
-        
-        self.display_entries(paged_entries)
-        self.update_pagination_info()
+        return list(sorted_entries)
     
     def update_entry_count(self, filtered_entries, current_page_entries=None):
         """Update the entry count display"""
 
         filtered_count = len(filtered_entries)
-        total_count = len(self.data_manager.load_all_data())
+        total_count = len(self.entries)
         
         if current_page_entries is not None:
             current_page_count = len(current_page_entries)
@@ -1241,104 +1090,13 @@ class LibraryPage(QWidget):
         if entries is None:
             entries = self.entries
         
-        # Clear existing content and release QPixmap resources
-        self.clear_layout_with_pixmap_cleanup()
-        
-        if self.current_layout == "grid":
-            self.display_grid_view(entries)
-        else:
-            self.display_list_view(entries)
-        
-        self.apply_font()
-    
-    def clear_layout_with_pixmap_cleanup(self):
-        """Clear layout and properly release QPixmap resources"""
-
-        for i in reversed(range(self.scroll_layout.count())): 
-            widget = self.scroll_layout.itemAt(i).widget()
-            if widget is not None:
-                # Release QPixmap resources before removing widget
-                self.release_pixmap_resources(widget)
-                # Use deleteLater() for proper Qt cleanup
-                widget.deleteLater()
-    
-    def release_pixmap_resources(self, widget):
-        """Recursively release QPixmap resources from widget and its children"""
-
-        # Find all QLabel widgets with pixmaps
-        labels = widget.findChildren(QLabel)
-        for label in labels:
-            if label.pixmap() is not None:
-                # Detach the pixmap to release memory
-                label.pixmap().detach()
-                label.clear()
-        
-        # Recursively process child widgets
-        for child in widget.findChildren(QWidget):
-            if child != widget:  # Avoid infinite recursion
-                self.release_pixmap_resources(child)
-    
-    def display_grid_view(self, entries):
-        """Grid view display - 4 entries per row"""
-
-        for c in range(self.scroll_layout.columnCount()):
-            self.scroll_layout.setColumnStretch(c, 0)
-
-        row, col = 0, 0
-        max_cols = 4
-        
-        for entry_id, entry_data in entries.items():
-            item_frame = self.create_item_frame(entry_id, entry_data)
-            self.scroll_layout.addWidget(item_frame, row, col)
-            
-            col += 1
-            if col >= max_cols:
-                col = 0
-                row += 1
-        
-        # Add flexible space
-        self.scroll_layout.setRowStretch(row + 1, 1)
-        for c in range(max_cols):
-            self.scroll_layout.setColumnStretch(c, 1)
-    
-    def display_list_view(self, entries):
-        """List view display - 2 entries per row"""
-
-        for c in range(self.scroll_layout.columnCount()):
-            self.scroll_layout.setColumnStretch(c, 0)
-        
-        row, col = 0, 0
-        max_cols = 2
-        
-        for entry_id, entry_data in entries.items():
-            item_frame = self.create_list_item_frame(entry_id, entry_data)
-
-            self.scroll_layout.addWidget(item_frame, row, col)
-            
-            col += 1
-            if col >= max_cols:
-                col = 0
-                row += 1
-
-        self.scroll_layout.setRowStretch(row + 1, 1)
-        for c in range(max_cols):
-            self.scroll_layout.setColumnStretch(c, 1)
+        # Images may have been replaced since the last time (same file name, new picture)
+        self.entry_view.delegate.forget_images()
+        self.entry_view.set_layout(self.current_layout)
+        self.entry_view.set_entries(entries, self.selected_entries)
     
     # --- Sort Assist Methods --- #
 
-    def get_pinyin(self, text):
-        """Get pinyin letter for sorting"""
-
-        if not text or not HAS_PINYIN:
-            return text.lower()
-        
-        try:
-            pinyin_list = pinyin(text, style=Style.NORMAL)
-            pinyin_key = ''.join([item[0] for item in pinyin_list if item])
-            return pinyin_key.lower()
-        except Exception:
-            return text.lower()
-
     def get_accuracy_value(self, accuracy_str):
         """Get accuracy for sorting"""
 
@@ -1354,253 +1112,6 @@ class LibraryPage(QWidget):
         except (ValueError, TypeError):
             return -1
 
-    def does_entry_contain_tiles(self, entry_data, search_tiles):
-        """Check if an entry contains all tiles in search"""
-
-        # Parse search
-        search_tile_list = self.parse_hand_tiles_for_search(search_tiles)
-        
-        # Parse entries' hands again (well, to normalize the rightmost tile)
-        entry_hand_text = entry_data['hands']
-        entry_tile_list = self.normalize_hand_tiles(entry_hand_text)
-        
-        # Count num
-        search_counter = Counter(search_tile_list)
-        entry_counter = Counter(entry_tile_list)
-        
-        # Check num
-        for tile, count in search_counter.items():
-            if entry_counter.get(tile, 0) < count:
-                return False
-        
-        return True
-
-    def normalize_hand_tiles(self, hand_text):
-        """Normalize hands (remove and insert the rightmost tile; for the above method and search use)"""
-
-        from src.utils.validators import Validator
-        return Validator.normalize_hand_tiles(hand_text)
-
-    # --- Entry Creation Methods --- #
-    
-    def create_item_frame(self, entry_id, entry_data):
-
-        if self.current_layout == "grid":
-            frame = self.create_grid_item_frame(entry_id, entry_data)
-        else:
-            frame = self.create_list_item_frame(entry_id, entry_data)
-        
-        # Mouse Track, for multi select by dragging mouse
-        frame.setMouseTracking(True)
-        frame.is_dragging = False
-        frame.entry_id = entry_id
-        
-        return frame
-    
-    def create_grid_item_frame(self, entry_id, entry_data):
-        """Create grid view item frame"""
-
-        frame = QFrame()
-        frame.setFrameStyle(QFrame.Box)
-        frame.setMinimumWidth(200)
-        frame.setMaximumWidth(500)
-        frame.setFixedHeight(360)
-        frame.entry_id = entry_id  # Store entry ID
-
-        # Format control (for multi select)
-        frame.setObjectName("main_frame")
-        
-        # Set cursor to hand shape, indicating clickable
-        frame.setCursor(Qt.PointingHandCursor)
-        
-        # Main layout
-        main_layout = QVBoxLayout()
-        main_layout.setSpacing(8)
-        main_layout.setContentsMargins(10, 10, 10, 10)
-        
-        # Image area - fixed height
-        image_container = QFrame()
-        image_container.setFixedHeight(200)
-        image_container.setStyleSheet("background-color: #f5f5f5; border: 1px solid #ddd;")
-        image_layout = QVBoxLayout()
-        image_layout.setAlignment(Qt.AlignCenter)
-        
-        image_path = self.data_manager.get_image_path(entry_id)
-        if image_path and os.path.exists(image_path):
-            image_container.setStyleSheet("background-color: #f5f5f5;")
-            pixmap = QPixmap(image_path)
-            if not pixmap.isNull():
-                image_label = QLabel()
-                scaled_pixmap = pixmap.scaled(300, 200, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                image_label.setPixmap(scaled_pixmap)
-                image_label.setAlignment(Qt.AlignCenter)
-                # Store reference for potential cleanup
-                image_label._original_pixmap = scaled_pixmap
-                image_layout.addWidget(image_label)
-        else:
-            image_container.setStyleSheet("background-color: #f5f5f5;")
-            no_image_label = QLabel(Dict.t("library.no_image"))
-            no_image_label.setAlignment(Qt.AlignCenter)
-            image_layout.addWidget(no_image_label)
-        
-        image_container.setLayout(image_layout)
-        main_layout.addWidget(image_container)
-        
-        # Title - handle long titles with ellipsis, bold
-        title_label = QLabel(entry_data['title'])
-        title_label.setWordWrap(True)
-        title_label.setToolTip(entry_data['title'])  # Show full title on hover
-        title_label.setStyleSheet("font-weight: bold;")
-        
-        # Use QFontMetrics to ensure title doesn't get too long
-        metrics = QFontMetrics(title_label.font())
-        elided_text = metrics.elidedText(entry_data['title'], Qt.ElideRight, 320)
-        title_label.setText(elided_text)
-        
-        main_layout.addWidget(title_label)
-        
-        # Metadata
-        meta_text = self.get_translated_metadata(entry_data)
-        meta_label = QLabel(meta_text)
-        meta_label.setStyleSheet("color: #666;")
-        main_layout.addWidget(meta_label)
-        
-        # Hand display
-        hands_frame = QFrame()
-        hands_layout = QHBoxLayout()
-        hands_layout.setSpacing(0)
-        hands_layout.setAlignment(Qt.AlignLeft)
-        hands_layout.setContentsMargins(0, 0, 0, 0)
-        
-        tiles = self.parse_hand_tiles(entry_data['hands'])
-        tile_size = 32
-
-        # Apply special hand display logic
-        self.display_hand_tiles(hands_layout, tiles, tile_size)
-        
-        hands_frame.setLayout(hands_layout)
-        main_layout.addWidget(hands_frame)
-        
-        # main_layout.addStretch()
-        frame.setLayout(main_layout)
-        apply_font_to_widgets(frame.findChildren(QLabel))
-
-        # Set hover effect
-        frame.setStyleSheet("""
-            #main_frame {
-                border: 1px solid #000000;
-            }
-            #main_frame:hover {
-                border: 1px solid #0078d4;
-                background-color: #f8fbff;
-            }
-        """)
-        
-        # Connect click event
-        # frame.mousePressEvent = lambda event, eid=entry_id, w=frame: self.on_entry_clicked(eid, w)
-        
-        self.setup_drag_selection(frame)
-        return frame
-    
-    def create_list_item_frame(self, entry_id, entry_data):
-        """Create list view item frame"""
-
-        frame = QFrame()
-        frame.setFrameStyle(QFrame.Box)
-        frame.setFixedHeight(108)
-        frame.entry_id = entry_id
-
-        # Format control (for multi select)
-        frame.setObjectName("main_frame")
-
-        # Set expandable
-        frame.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-        
-        # Set cursor to hand shape, indicating clickable
-        frame.setCursor(Qt.PointingHandCursor)
-        
-        # Main layout
-        main_layout = QHBoxLayout()
-        main_layout.setSpacing(8)
-        main_layout.setContentsMargins(10, 10, 10, 10)
-        
-        # Text information area
-        text_container = QWidget()
-        text_container.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
-        text_layout = QVBoxLayout()
-        text_layout.setSpacing(8)
-        text_layout.setContentsMargins(0, 0, 0, 0)
-        
-        # Title and metadata row
-        title_meta_layout = QHBoxLayout()
-        title_meta_layout.setContentsMargins(0, 0, 0, 0)
-        
-        # Title
-        title_label = QLabel(entry_data['title'])
-        title_label.setStyleSheet("font-weight: bold;")
-        title_label.setToolTip(entry_data['title'])
-        
-        metrics = QFontMetrics(title_label.font())
-        elided_text = metrics.elidedText(entry_data['title'], Qt.ElideRight, 350)
-        title_label.setText(elided_text)
-        
-        title_meta_layout.addWidget(title_label)
-        title_meta_layout.addStretch()
-        
-        # Metadata
-        meta_text = self.get_translated_metadata(entry_data)
-        meta_label = QLabel(meta_text)
-        meta_label.setStyleSheet("color: #666;")
-        title_meta_layout.addWidget(meta_label)
-        
-        text_layout.addLayout(title_meta_layout)
-        
-        # Hand display
-        hands_frame = QFrame()
-        hands_layout = QHBoxLayout()
-        hands_layout.setSpacing(1)
-        hands_layout.setAlignment(Qt.AlignLeft)
-        hands_layout.setContentsMargins(0, 0, 0, 0)
-        
-        try:
-            tiles = self.parse_hand_tiles(entry_data['hands'])
-            tile_size = 42
-            
-            # Apply special hand display logic
-            self.display_hand_tiles(hands_layout, tiles, tile_size)
-                
-        except Exception as e:
-            error_label = QLabel("Hand error")
-            hands_layout.addWidget(error_label)
-        
-        hands_frame.setLayout(hands_layout)
-        text_layout.addWidget(hands_frame)
-        
-        text_layout.addStretch()
-        text_container.setLayout(text_layout)
-        main_layout.addWidget(text_container, 1)  # Set stretch factor to 1 for adaptive text area
-        
-        frame.setLayout(main_layout)
-        apply_font_to_widgets(frame.findChildren(QLabel))
-        
-        # Set hover effect
-        frame.setStyleSheet("""
-            #main_frame {
-                border: 1px solid #000000;
-            }
-            #main_frame:hover {
-                border: 1px solid #0078d4;
-                background-color: #f8fbff;
-            }
-        """)
-
-        # Connect click event
-        # frame.mousePressEvent = lambda event, eid=entry_id, w=frame: self.on_entry_clicked(eid, w)
-        
-        self.setup_drag_selection(frame)
-
-        return frame
-    
     # --- Hand Tile Display Methods --- #
     
     def parse_hand_tiles(self, hand_text):
@@ -1609,64 +1120,6 @@ class LibraryPage(QWidget):
         from src.utils.validators import Validator
         return Validator.parse_hand_tiles_for_display(hand_text)
     
-    def parse_hand_tiles_for_search(self, hand_text):
-        """For search only"""
-
-        from src.utils.validators import Validator
-        return Validator._parse_tiles_from_string(hand_text)
-
-    def display_hand_tiles(self, hands_layout, tiles, tile_size):
-        """Display hand tiles, handle size & spacing"""
-
-        total_tiles = len(tiles)
-        
-        if total_tiles in [2, 5, 8, 11, 14] and total_tiles > 1:
-            # Special display: sorted tiles in front, last tile displayed separately (with spacing)
-            main_tiles = tiles[:-1]
-            last_tile = tiles[-1]
-            
-            # Display main tiles (already sorted by parse)
-            for tile in main_tiles:
-                tile_label = self.create_tile_label(tile, tile_size)
-                hands_layout.addWidget(tile_label)
-            
-            # Add spacing
-            spacer = QLabel()
-            spacer.setFixedWidth(20 if tile_size == 32 else 38)
-            hands_layout.addWidget(spacer)
-            
-            # Display last tile
-            last_tile_label = self.create_tile_label(last_tile, tile_size)
-            hands_layout.addWidget(last_tile_label)
-        else:
-            # Normal display of all tiles (already sorted by parse)
-            for tile in tiles:
-                tile_label = self.create_tile_label(tile, tile_size)
-                hands_layout.addWidget(tile_label)
-    
-    def create_tile_label(self, tile, tile_size):
-        """Create single tile label, handle size"""
-
-        tile_label = QLabel()
-        tile_filename = f"{tile}.png"
-        tile_path = get_resource_path(os.path.join("src", "assets", "tiles", tile_filename))
-        
-        if os.path.exists(tile_path):
-            pixmap = QPixmap(tile_path)
-            if not pixmap.isNull():
-                # Scale the pixmap and set it
-                scaled_pixmap = pixmap.scaled(tile_size-11, tile_size+5, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                tile_label.setPixmap(scaled_pixmap)
-                # Store reference for potential cleanup
-                tile_label._original_pixmap = scaled_pixmap
-        else:
-            tile_label.setText(tile)
-            tile_label.setStyleSheet("border: 1px solid #ccc; padding: 2px;")
-            tile_label.setAlignment(Qt.AlignCenter)
-        
-        tile_label.setFixedSize(tile_size-11, tile_size+5)
-        return tile_label
-    
     # --- Layout and Filter Methods --- #
     
     def change_layout(self, layout_name):
@@ -1680,12 +1133,17 @@ class LibraryPage(QWidget):
             self.current_layout = "grid"
         else:
             self.current_layout = "list"
-        self.apply_filters()
+        self.show_page()
     
     def search_items(self, search_text):
-        """Text search method removed..."""
+        """Search box: entries with the text in their title, intro or notes"""
 
-        pass
+        search_text = search_text.strip()
+        if search_text == self.current_search_text:
+            return
+        self.current_search_text = search_text
+        self.reset_to_page_one()
+        self.apply_filters()
     
     # --- UI Update Methods --- #
     
@@ -1707,6 +1165,9 @@ class LibraryPage(QWidget):
         
         apply_font_to_widgets(widgets)
 
+        # Cards are painted with the same font
+        self.entry_view.set_font(get_app_font())
+
     def get_translated_metadata(self, entry_data):
         """Get translated metadata"""
 
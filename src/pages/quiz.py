@@ -5,18 +5,25 @@ from PyQt5.QtWidgets import (   QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                                 QGraphicsOpacityEffect, QGridLayout, QButtonGroup,
                                 QSizePolicy, QSpacerItem, QRadioButton, QComboBox, QLineEdit)
 from PyQt5.QtCore import Qt, pyqtSignal, QTimer, QEvent
-from PyQt5.QtGui import QPixmap, QFont, QPainter, QPen, QColor
+from PyQt5.QtGui import QPixmap, QFont
 
 from src.utils.i18n import Dict
 from src.utils.format_applier import apply_font_to_widgets
-from src.utils.path_finder import get_resource_path
 from src.utils.data_manager import DataManager
 from src.utils.settings_manager import SettingsManager
 from src.utils.validators import Validator
+from src.utils.efficiency import Efficiency
+from src.utils.waits import Waits
+from src.utils.melds import Melds
+from src.utils.analysis_store import AnalysisStore
+from src.utils.text_index import TextIndex
+from src.utils.filter_compiler import FilterCompiler
+from src.utils.variants import Variants, IDENTITY
 
 from src.widgets.entry_filter import EntryFilterDialog
 from src.widgets.hint_dialog import StyledMessageBox
 from src.widgets.tile_selector import TileSelector
+from src.widgets.hand_view import HandView, CORRECT_COLOR, WRONG_COLOR
 
 class QuizPage(QWidget):
     """Quiz page implementation"""
@@ -29,6 +36,9 @@ class QuizPage(QWidget):
         super().__init__(parent)
         self.data_manager = data_manager
         self.settings = settings_manager
+        self.analysis_store = AnalysisStore()
+        self.text_index = TextIndex()
+        self.analysis_version = None  # Bank version the analysis columns were last brought up to
         
         # Quiz state
         self.is_quiz_active = False
@@ -36,10 +46,12 @@ class QuizPage(QWidget):
         self.total_question_count = 0    # Accumulative question number for display
         self.question_queue = []
         self.current_entry = None
+        self.current_variant = IDENTITY
         self.selected_answer = None
         self.selected_tile = None
         self.show_notes = False
         self.tiles_enabled = True  # Track if tiles are enabled
+        self.hand_view = None      # Hands box tiles (one painted widget)
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_timer)
         self.time_remaining = 25
@@ -54,6 +66,8 @@ class QuizPage(QWidget):
             'wind': [],
             'self_wind': [],
             'game': [],
+            'shanten': [],
+            'waits': [],
             'difficulty_min': 0,
             'difficulty_max': 100,
             'accuracy_min': 0,
@@ -64,6 +78,7 @@ class QuizPage(QWidget):
             'negate': False
         }
         self.is_filtering = False  # Track if filter is active
+        self.filter_predicate = FilterCompiler.compile(self.filter_state, self.analysis_store, self.text_index)
         
         self.init_ui()
         
@@ -180,6 +195,15 @@ class QuizPage(QWidget):
         self.endless_label.setStyleSheet(f"color: {endless_status_color};")
         parent_layout.addWidget(self.endless_label)
         
+        # Variants setting
+        variants_enabled = self.settings.get("variants", False)
+        variants_status_text = Dict.t('quiz.enabled' if variants_enabled else 'quiz.disabled')
+        variants_status_color = "#cccccc" if not variants_enabled else "#000000"
+        self.variants_label = QLabel(f"{Dict.t('settings.variants')} {variants_status_text}")
+        self.variants_label.setAlignment(Qt.AlignCenter)
+        self.variants_label.setStyleSheet(f"color: {variants_status_color};")
+        parent_layout.addWidget(self.variants_label)
+        
     def update_settings_status_labels(self):
         """Update the settings status labels with current settings"""
 
@@ -220,6 +244,17 @@ class QuizPage(QWidget):
         except RuntimeError:
             # Widget has been deleted
             pass
+        
+        try:
+            if hasattr(self, 'variants_label') and self.variants_label and not self.variants_label.isHidden():
+                variants_enabled = self.settings.get("variants", False)
+                variants_status_text = Dict.t('quiz.enabled' if variants_enabled else 'quiz.disabled')
+                variants_status_color = "#cccccc" if not variants_enabled else "#000000"
+                self.variants_label.setText(f"{Dict.t('settings.variants')} {variants_status_text}")
+                self.variants_label.setStyleSheet(f"color: {variants_status_color};")
+        except RuntimeError:
+            # Widget has been deleted
+            pass
     
     def create_quiz_layout(self):
         """Create the quiz layout with question display"""
@@ -264,20 +299,9 @@ class QuizPage(QWidget):
         
         if dialog.exec_() == EntryFilterDialog.Accepted:
             self.filter_state = dialog.get_filter_state()
-            self.is_filtering = any([
-                bool(self.filter_state['text_contains']['text'] and self.filter_state['text_contains']['fields']),
-                bool(self.filter_state['text_excludes']['text'] and self.filter_state['text_excludes']['fields']),
-                bool(self.filter_state['source']),
-                bool(self.filter_state['players']),
-                bool(self.filter_state['image']),
-                (self.filter_state['difficulty_min'] > 0 or self.filter_state['difficulty_max'] < 100),
-                bool(self.filter_state['wind']),
-                bool(self.filter_state['self_wind']),
-                bool(self.filter_state['game']),
-                (self.filter_state['accuracy_min'] > 0 or self.filter_state['accuracy_max'] < 100),
-                self.filter_state['start_date'] is not None,
-                self.filter_state['end_date'] is not None
-            ])
+            self.is_filtering = FilterCompiler.is_active(self.filter_state)
+            # Compiled once here, then called for every entry
+            self.filter_predicate = FilterCompiler.compile(self.filter_state, self.analysis_store, self.text_index)
             self.update_filter_button_style()
             self.update_queue_count_and_button_state()
     
@@ -317,15 +341,31 @@ class QuizPage(QWidget):
         # Update start button state
         self.start_btn.setEnabled(queue_size > 0)
     
+    def refresh_analysis(self, all_entries):
+        """Bring the analysis columns up to the bank, only when the shanten or wait filter is set
+        and the bank was written since the last time"""
+
+        if not (self.filter_state.get('shanten') or self.filter_state.get('waits')):
+            return
+        version = self.data_manager.data_version()
+        if version == self.analysis_version:
+            return
+        # In process, the app itself must not spawn workers
+        self.analysis_store.refresh(all_entries, workers=1)
+        self.analysis_version = version
+
     def calculate_queue_size(self):
         """Calculate the size of the current question queue based on filter"""
 
         all_entries = self.data_manager.load_all_data()
+        self.refresh_analysis(all_entries)
+        if self.filter_state['text_contains']['text'] or self.filter_state['text_excludes']['text']:
+            self.text_index.refresh(all_entries)
         filtered_count = 0
         first_entry_id = None
         
         for entry_id, entry_data in all_entries.items():
-            if self.matches_filter(entry_data):
+            if self.filter_predicate(entry_data):
                 if first_entry_id is None:
                     first_entry_id = entry_id  # First entry ID debug
                 filtered_count += 1
@@ -394,10 +434,13 @@ class QuizPage(QWidget):
         """Generate question queue based on current filter"""
 
         all_entries = self.data_manager.load_all_data()
+        self.refresh_analysis(all_entries)
+        if self.filter_state['text_contains']['text'] or self.filter_state['text_excludes']['text']:
+            self.text_index.refresh(all_entries)
         filtered_entries = []
         
         for entry_id, entry_data in all_entries.items():
-            if self.matches_filter(entry_data):
+            if self.filter_predicate(entry_data):
                 # Store both entry_id and entry_data to avoid object comparison later
                 filtered_entries.append({'id': entry_id, 'data': entry_data})
         
@@ -415,158 +458,6 @@ class QuizPage(QWidget):
             # Update queue count and button state
             self.update_queue_count_and_button_state()
 
-    def matches_filter(self, entry):
-        """Same as Library's"""
-
-        # Collects all filter applied
-        filter_results = []
-        
-        # Include text filter
-        if self.filter_state['text_contains']['text'] and self.filter_state['text_contains']['fields']:
-            text_contains_match = False
-            search_text = self.filter_state['text_contains']['text'].lower()
-            
-            for field in self.filter_state['text_contains']['fields']:
-                if field == 'title':
-                    if search_text in entry.get('title', '').lower():
-                        text_contains_match = True
-                        break
-                elif field == 'intro':
-                    if search_text in entry.get('intro', '').lower():
-                        text_contains_match = True
-                        break
-                elif field == 'notes':
-                    if search_text in entry.get('notes', '').lower():
-                        text_contains_match = True
-                        break
-            
-            filter_results.append(text_contains_match)
-        
-        # Exclude text filter
-        if self.filter_state['text_excludes']['text'] and self.filter_state['text_excludes']['fields']:
-            text_excludes_match = True  # Default not match, so not excluded
-            search_text = self.filter_state['text_excludes']['text'].lower()
-            
-            for field in self.filter_state['text_excludes']['fields']:
-                if field == 'title':
-                    if search_text in entry.get('title', '').lower():
-                        text_excludes_match = False
-                        break
-                elif field == 'intro':
-                    if search_text in entry.get('intro', '').lower():
-                        text_excludes_match = False
-                        break
-                elif field == 'notes':
-                    if search_text in entry.get('notes', '').lower():
-                        text_excludes_match = False
-                        break
-            
-            filter_results.append(text_excludes_match)
-        
-        # Source filter
-        if self.filter_state['source']:
-            source_match = entry.get('source', '') in self.filter_state['source']
-            filter_results.append(source_match)
-        
-        # Players filter
-        if self.filter_state['players']:
-            players_match = entry.get('players', '') in self.filter_state['players']
-            filter_results.append(players_match)
-        
-        # Image filter
-        if self.filter_state['image']:
-            has_image = bool(entry.get('image_filename'))
-            image_match = False
-            if 'common.have' in self.filter_state['image'] and has_image:
-                image_match = True
-            if 'common.noHave' in self.filter_state['image'] and not has_image:
-                image_match = True
-            filter_results.append(image_match)
-        
-        # Wind filter
-        if self.filter_state['wind']:
-            wind_match = entry.get('wind', '') in self.filter_state['wind']
-            filter_results.append(wind_match)
-        # Self wind filter
-        if self.filter_state['self_wind']:
-            swind_match = entry.get('self_wind', '') in self.filter_state['self_wind']
-            filter_results.append(swind_match)
-        
-        # Game filter
-        if self.filter_state['game']:
-            game_match = str(entry.get('game', '')) in self.filter_state['game']
-            filter_results.append(game_match)
-        
-        # Difficulty filter
-        if (self.filter_state['difficulty_min'] > 0 or self.filter_state['difficulty_max'] < 100):
-            difficulty = int(entry.get('difficulty', 0))
-            if difficulty < 0: # Changed from == 0 to < 0, since 0 should count in filter now...
-                difficulty_match = False
-            else:
-                difficulty_match = (self.filter_state['difficulty_min'] <= difficulty <= self.filter_state['difficulty_max'])
-            filter_results.append(difficulty_match)
-        
-        # Accuracy filter
-        if (self.filter_state['accuracy_min'] > 0 or self.filter_state['accuracy_max'] < 100):
-            accuracy_str = entry.get('accuracy', 'N/A %')
-            if accuracy_str == 'N/A %' or not accuracy_str:
-                accuracy_match = False
-            else:
-                try:
-                    if str(accuracy_str).endswith('%'):
-                        accuracy_value = float(str(accuracy_str)[:-1])
-                    else:
-                        accuracy_value = float(accuracy_str)
-
-                    accuracy_match = (self.filter_state['accuracy_min'] <= accuracy_value <= self.filter_state['accuracy_max'])
-                except (ValueError, TypeError):
-                    accuracy_match = False
-            filter_results.append(accuracy_match)
-        
-        # Date filter
-        if self.filter_state['start_date'] or self.filter_state['end_date']:
-            entry_date_str = entry.get('create_time', '')
-            if entry_date_str:
-                try:
-                    from datetime import datetime
-                    # Parse ISO format date (e.g., "2025-10-10T19:06:41.402801")
-
-                    entry_date = datetime.fromisoformat(entry_date_str.replace('Z', '+00:00')).date()
-                    date_match = True
-
-                    if self.filter_state['start_date']:
-                        start_date = self.filter_state['start_date'].date() if hasattr(self.filter_state['start_date'], 'date') else self.filter_state['start_date']
-                        if entry_date < start_date:
-                            date_match = False
-
-                    if self.filter_state['end_date']:
-                        end_date = self.filter_state['end_date'].date() if hasattr(self.filter_state['end_date'], 'date') else self.filter_state['end_date']
-                        if entry_date > end_date:
-                            date_match = False
-
-                    filter_results.append(date_match)
-                except (ValueError, AttributeError):
-                    # If date parsing fails, skip this entry
-                    filter_results.append(False)
-            else:
-                filter_results.append(False)
-        
-        # Return true if all defaults
-        if not filter_results:
-            return True
-        
-        # Apply and, or
-        if self.filter_state['logic_mode'] == 'OR':
-            result = any(filter_results)
-        else:
-            result = all(filter_results)
-        
-        # Apply not
-        if self.filter_state['negate']:
-            result = not result
-        
-        return result
-    
     def display_question(self):
         """Display the current question"""
 
@@ -574,8 +465,7 @@ class QuizPage(QWidget):
         self.selected_tile = None
 
         # Set tiles enabled, to be clickable
-        if hasattr(self, 'tile_labels'):
-            self.set_tiles_enabled(True)
+        self.set_tiles_enabled(True)
 
         if self.current_question_index >= len(self.question_queue):
             # End of queue, generate new one
@@ -584,13 +474,22 @@ class QuizPage(QWidget):
         
         self.current_entry = self.question_queue[self.current_question_index]
         
+        # Variants: suits permuted / numbers mirrored on a copy, the bank and the queue keep the stored problem
+        self.current_variant = IDENTITY
+        if self.settings.get("variants", False):
+            self.current_variant = Variants.random_transform(self.current_entry['data'])
+            self.current_entry = {
+                'id': self.current_entry['id'],
+                'data': Variants.apply(self.current_entry['data'], *self.current_variant)
+            }
+        
         # Reset selection state
         self.selected_answer = None
         self.selected_tile = None
+        self.meld_discards = None
         
-        # Clear tile labels reference
-        if hasattr(self, 'tile_labels'):
-            self.tile_labels.clear()
+        # Clear hand view reference
+        self.hand_view = None
         
         # Clear answer buttons reference to prevent signal conflicts
         if hasattr(self, 'answer_buttons'):
@@ -795,55 +694,10 @@ class QuizPage(QWidget):
         dora_text = self.current_entry['data'].get('dora', '') if self.current_entry else ''
         dora_tiles = self.parse_dora_tiles(dora_text)
         
-        # Display dora tiles and backs
-        for i in range(5):  # Maximum 5 dora tiles
-            if i < len(dora_tiles):
-                # Show actual dora tile
-                tile_frame = QFrame()
-                tile_frame.setFixedSize(45, 60)
-                tile_layout = QVBoxLayout(tile_frame)
-                tile_layout.setContentsMargins(0, 0, 0, 0)
-                
-                tile_label = QLabel()
-                tile_filename = f"{dora_tiles[i]}.png"
-                tile_path = get_resource_path(os.path.join("src", "assets", "tiles", tile_filename))
-                
-                if os.path.exists(tile_path):
-                    pixmap = QPixmap(tile_path)
-                    pixmap = pixmap.scaled(45, 60, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                    tile_label.setPixmap(pixmap)
-                else:
-                    # Fallback..
-                    tile_label.setText(dora_tiles[i])
-                    tile_label.setAlignment(Qt.AlignCenter)
-                    tile_label.setStyleSheet("border: 1px solid;")
-                
-                tile_label.setFixedSize(45, 60)
-                tile_layout.addWidget(tile_label)
-                dora_layout.addWidget(tile_frame)
-            else:
-                # Show tile back as placeholder
-                back_frame = QFrame()
-                back_frame.setFixedSize(45, 60)
-                back_layout = QVBoxLayout(back_frame)
-                back_layout.setContentsMargins(0, 0, 0, 0)
-                
-                back_label = QLabel()
-                back_path = get_resource_path(os.path.join("src", "assets", "tiles", "back.png"))
-                
-                if os.path.exists(back_path):
-                    pixmap = QPixmap(back_path)
-                    pixmap = pixmap.scaled(45, 60, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                    back_label.setPixmap(pixmap)
-                else:
-                    # Fallback
-                    back_label.setText("?")
-                    back_label.setAlignment(Qt.AlignCenter)
-                    back_label.setStyleSheet("border: 1px solid;")
-                
-                back_label.setFixedSize(45, 60)
-                back_layout.addWidget(back_label)
-                dora_layout.addWidget(back_frame)
+        # Display dora tiles, tile backs as placeholders up to 5 (one painted widget)
+        dora_view = HandView(45, 60, slots=5, clickable=False)
+        dora_view.set_tiles(dora_tiles[:5])
+        dora_layout.addWidget(dora_view)
         
         # Main frame layout
         frame_layout = QVBoxLayout()
@@ -1089,21 +943,23 @@ class QuizPage(QWidget):
                 should_hide = total_tiles in no_furo_counts
                 
                 # Rule 4: Additional validation for specific actions (only if not already hidden)
+                # Calls as Melds sees them (sanma: no chi), the Skip rule below uses the same
+                is_three_player = self.current_entry['data'].get('players', '') == "players.three"
                 if not should_hide and hands_validation.get("valid", False) and hands_text:
                     if key == "answer.chi":
-                        should_hide = not Validator.can_chi(hands_text)
+                        should_hide = not Melds.can_call(hands_text, "chi", is_three_player)
                     elif key == "answer.pon":
-                        should_hide = not Validator.can_pon(hands_text)
+                        should_hide = not Melds.can_call(hands_text, "pon", is_three_player)
                     elif key == "answer.kan":
-                        should_hide = not Validator.can_kan(hands_text)
+                        should_hide = not Melds.can_call(hands_text, "kan", is_three_player)
                 
                 if hands_validation.get("valid", False) and hands_text and key == "answer.skip":
                     can_chi, can_pon, can_kan = False, False, False
                     in_turn = total_tiles in [2, 5, 8, 11, 14]
                     if not in_turn:
-                        can_chi = Validator.can_chi(hands_text)
-                        can_pon = Validator.can_pon(hands_text)
-                        can_kan = Validator.can_kan(hands_text)
+                        can_chi = Melds.can_call(hands_text, "chi", is_three_player)
+                        can_pon = Melds.can_call(hands_text, "pon", is_three_player)
+                        can_kan = Melds.can_call(hands_text, "kan", is_three_player)
                     tiles = Validator._parse_tiles_from_string(hands_text)
                     hand_result = Validator.check_mahjong_hand(tiles)
                     can_agari = hand_result in [3, 1]
@@ -1191,17 +1047,14 @@ class QuizPage(QWidget):
         # Get hands data from current entry
         hands_text = self.current_entry['data'].get('hands', '') if self.current_entry else ''
         
+        # One painted widget for the whole hand, the drawn tile 50 px apart
+        self.hand_view = HandView(56, 80, spacing=5, drawn_gap=50 + 5)
+        self.hand_view.tile_clicked.connect(self.on_hand_tile_clicked)
         if hands_text:
-            # Initialize tile labels list for this hands box
-            if not hasattr(self, 'tile_labels'):
-                self.tile_labels = []
-            
             # Parse hands tiles similar to library.py list mode
-            tiles = self.parse_hand_tiles_for_display(hands_text)
-            tile_size = 80
-            
-            # Apply special hand display logic
-            self.display_hand_tiles_for_quiz(hands_layout, tiles, tile_size)
+            self.hand_view.set_tiles(self.parse_hand_tiles_for_display(hands_text))
+        self.hand_view.set_interactive(self.tiles_enabled)
+        hands_layout.addWidget(self.hand_view)
         
         # Main frame layout
         frame_layout = QVBoxLayout()
@@ -1262,25 +1115,27 @@ class QuizPage(QWidget):
 
         self.tiles_enabled = enabled 
         
-        if not hasattr(self, 'tile_labels') or not self.tile_labels:
-            return
-        
-        for tile_label in self.tile_labels[:]:
-            try:
-                if enabled:
-                    tile_label.setCursor(Qt.PointingHandCursor)
-                    effect = tile_label.graphicsEffect()
-                    if effect is not None:
-                        effect.setEnabled(False)
-                else:
-                    tile_label.setCursor(Qt.ArrowCursor)
-                    from PyQt5.QtWidgets import QGraphicsOpacityEffect
-                    opacity_effect = QGraphicsOpacityEffect()
-                    opacity_effect.setOpacity(0.4)
-                    tile_label.setGraphicsEffect(opacity_effect)
-                
-            except RuntimeError:
-                self.tile_labels.remove(tile_label)
+        hand_view = self.get_hand_view()
+        if hand_view is not None:
+            hand_view.set_interactive(enabled)
+
+    def get_hand_view(self):
+        """Hands box's HandView, None before the first question or once the box is gone"""
+
+        try:
+            if self.hand_view is not None:
+                self.hand_view.isVisible()
+        except RuntimeError:
+            self.hand_view = None
+        return self.hand_view
+
+    def tile_value_at(self, tile_index):
+        """Tile ("1m", "0p"...) at an index of the hand, None if there is none"""
+
+        hand_view = self.get_hand_view()
+        if hand_view is None or tile_index is None or not 0 <= tile_index < len(hand_view.tiles):
+            return None
+        return hand_view.tiles[tile_index]
 
     def update_answer_button_states(self):
         """Update answer button visual states based on selection"""
@@ -1324,12 +1179,43 @@ class QuizPage(QWidget):
             self.set_tiles_enabled(False)
         else:
             self.set_tiles_enabled(True)
+        self.apply_meld_tile_limits()
+
+    def apply_meld_tile_limits(self):
+        """After Chi/Pon, only tiles that can be discarded after a legal call stay clickable"""
+
+        self.meld_discards = None
+        hand_view = self.get_hand_view()
+        if hand_view is None:
+            return
+        hand_view.set_blocked([])
+
+        action = {Dict.t("answer.chi"): "chi", Dict.t("answer.pon"): "pon"}.get(self.selected_answer)
+        if not action or not self.current_entry:
+            return
+
+        data = self.current_entry['data']
+        is_three_player = data.get('players', '') == "players.three"
+        self.meld_discards = Melds.discardable_tiles(data.get('hands', ''), action, is_three_player)
+
+        blocked = [i for i, tile in enumerate(hand_view.tiles) if tile not in self.meld_discards]
+        hand_view.set_blocked(blocked)
+
+        # Drop a selection that is no longer possible
+        if self.selected_tile in blocked:
+            self.selected_tile = None
+            self.update_tile_selection_state()
     
     def on_tile_selected(self, tile_index):
         """Handle tile selection"""
         
         if not self.tiles_enabled:
             return
+
+        if getattr(self, 'meld_discards', None) is not None:
+            tile_value = self.tile_value_at(tile_index)
+            if tile_value is not None and tile_value not in self.meld_discards:
+                return
         
         self.selected_tile = tile_index
         self.check_submit_enabled()
@@ -1346,116 +1232,21 @@ class QuizPage(QWidget):
         from src.utils.validators import Validator
         return Validator.parse_hand_tiles_for_display(hand_text)
 
-    def create_clickable_tile_label(self, tile, tile_size, tile_index):
-        """Create clickable tile label with overlay border when selected"""
-
-        tile_label = QLabel()
-        tile_filename = f"{tile}.png"
-        tile_path = get_resource_path(os.path.join("src", "assets", "tiles", tile_filename))
-        
-        # Set up clickable functionality
-        tile_label.setCursor(Qt.PointingHandCursor)
-        tile_label.tile_index = tile_index
-        tile_label.tile_value = tile
-        tile_label.original_pixmap = None
-        
-        # Set up click event
-        def mousePressEvent(event):
-            if event.button() == Qt.LeftButton and self.tiles_enabled:
-                self.on_tile_selected(tile_index)
-                # Update visual state
-                self.update_tile_selection_state()
-            else:
-                event.ignore()
-        
-        tile_label.mousePressEvent = mousePressEvent
-        
-        if os.path.exists(tile_path):
-            pixmap = QPixmap(tile_path)
-            pixmap = pixmap.scaled(56, 80, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            tile_label.original_pixmap = pixmap
-            tile_label.setPixmap(pixmap)
-        else:
-            tile_label.setText(tile)
-            tile_label.setAlignment(Qt.AlignCenter)
-        
-        tile_label.setFixedSize(56, 80)
-        tile_label.setStyleSheet("border: none; background-color: transparent;")
-        
-        if not hasattr(self, 'tile_labels'):
-            self.tile_labels = []
-        self.tile_labels.append(tile_label)
-        
-        return tile_label
-
-    def update_tile_selection_state(self):
-        """Update tile selection visual state by modifying pixmap"""
+    def on_hand_tile_clicked(self, tile_index):
+        """Handle a click on a hand tile (hit-tested by the HandView)"""
 
-        if not hasattr(self, 'tile_labels'):
+        if not self.tiles_enabled:
             return
-        
-        for tile_label in self.tile_labels[:]:
-            try:
-                if hasattr(tile_label, 'tile_index') and tile_label.tile_index == self.selected_tile:
-                    # Selected tile - blue border
-                    if hasattr(tile_label, 'original_pixmap') and tile_label.original_pixmap:
-                        # New pixmap
-                        pixmap_with_border = QPixmap(tile_label.original_pixmap.size())
-                        pixmap_with_border.fill(Qt.transparent)
-
-                        painter = QPainter(pixmap_with_border)
-
-                        painter.drawPixmap(0, 0, tile_label.original_pixmap)
-
-                        pen = QPen(QColor("#0056B3"))
-                        pen.setWidth(8)
-                        painter.setPen(pen)
-                        painter.setBrush(Qt.NoBrush)
-
-                        from PyQt5.QtCore import QRectF
-                        rect = pixmap_with_border.rect()
-                        border_rect = QRectF(3, 3, rect.width() - 6, rect.height() - 6)
-                        corner_radius = 6
+        self.on_tile_selected(tile_index)
+        # Update visual state
+        self.update_tile_selection_state()
 
-                        painter.drawRoundedRect(border_rect, corner_radius, corner_radius)
-                        
-                        painter.end()
-                        tile_label.setPixmap(pixmap_with_border)
-                else:
-                    # Not selected - original
-                    if hasattr(tile_label, 'original_pixmap') and tile_label.original_pixmap:
-                        tile_label.setPixmap(tile_label.original_pixmap)
-            except RuntimeError:
-                self.tile_labels.remove(tile_label)
-
-    def display_hand_tiles_for_quiz(self, hands_layout, tiles, tile_size):
-        """Display hand tiles for quiz with clickable functionality"""
+    def update_tile_selection_state(self):
+        """Update tile selection visual state (blue border, painted by the HandView)"""
 
-        total_tiles = len(tiles)
-        
-        fixed_tile_width = 56
-        fixed_tile_height = 80
-        
-        if total_tiles in [2, 5, 8, 11, 14] and total_tiles > 1:
-            main_tiles = tiles[:-1]
-            last_tile = tiles[-1]
-            
-            # Display main tiles (already sorted by parse)
-            for i, tile in enumerate(main_tiles):
-                tile_label = self.create_clickable_tile_label(tile, fixed_tile_height, i)
-                hands_layout.addWidget(tile_label)
-
-            # Display last tile
-            spacer = QLabel()
-            spacer.setFixedWidth(50)
-            hands_layout.addWidget(spacer)
-            last_tile_label = self.create_clickable_tile_label(last_tile, fixed_tile_height, len(tiles)-1)
-            hands_layout.addWidget(last_tile_label)
-        else:
-            # Normal display
-            for i, tile in enumerate(tiles):
-                tile_label = self.create_clickable_tile_label(tile, fixed_tile_height, i)
-                hands_layout.addWidget(tile_label)            
+        hand_view = self.get_hand_view()
+        if hand_view is not None:
+            hand_view.set_selected(self.selected_tile)
 
     # --- Submit and Next --- #
 
@@ -1560,18 +1351,10 @@ class QuizPage(QWidget):
         
         # Check tile selection
         tile_correct = False
-        if self.selected_tile is not None and hasattr(self, 'tile_labels'):
-            # Get the selected tile value
-            selected_tile_label = None
-            for tile_label in self.tile_labels:
-                if hasattr(tile_label, 'tile_index') and tile_label.tile_index == self.selected_tile:
-                    selected_tile_label = tile_label
-                    break
-            
-            if selected_tile_label and hasattr(selected_tile_label, 'tile_value'):
-                selected_tile_value = selected_tile_label.tile_value
-                correct_tiles = TileSelector.parse_tiles_string(correct_input)
-                tile_correct = selected_tile_value in correct_tiles
+        selected_tile_value = self.tile_value_at(self.selected_tile)
+        if selected_tile_value is not None:
+            correct_tiles = TileSelector.parse_tiles_string(correct_input)
+            tile_correct = selected_tile_value in correct_tiles
         
         return action_correct and tile_correct
 
@@ -1684,138 +1467,32 @@ class QuizPage(QWidget):
     def update_hands_tiles_feedback(self, correct_tiles):
         """Update hands tiles with correct/incorrect feedback"""
 
-        if not hasattr(self, 'tile_labels') or not self.tile_labels:
+        hand_view = self.get_hand_view()
+        if hand_view is None or not hand_view.tiles:
             return
         
-        user_selected_tile_value = None
-        if self.selected_tile is not None:
-            for tile_label in self.tile_labels:
-                if (hasattr(tile_label, 'tile_index') and 
-                    tile_label.tile_index == self.selected_tile and
-                    hasattr(tile_label, 'tile_value')):
-                    user_selected_tile_value = tile_label.tile_value
-                    break
-
+        user_selected_tile_value = self.tile_value_at(self.selected_tile)
         user_correct = user_selected_tile_value in correct_tiles if user_selected_tile_value else False
         
-        # From left to right, find correct ones
-        correct_tile_positions = []
-        for i, tile_label in enumerate(self.tile_labels):
-            if (hasattr(tile_label, 'tile_value') and 
-                tile_label.tile_value in correct_tiles):
-                correct_tile_positions.append((i, tile_label))
-
-        correct_tile_positions.sort(key=lambda x: x[0])
-
-        tiles_to_highlight = []
-        
+        highlighted = []
+        remaining_correct_tiles = correct_tiles.copy()
         if user_correct:
             # 1a. Users' correct answer
-            for i, tile_label in enumerate(self.tile_labels):
-                if (hasattr(tile_label, 'tile_index') and 
-                    tile_label.tile_index == self.selected_tile and
-                    hasattr(tile_label, 'tile_value') and
-                    tile_label.tile_value in correct_tiles):
-                    tiles_to_highlight.append((i, tile_label, "correct"))
+            highlighted.append(self.selected_tile)
+            remaining_correct_tiles.remove(user_selected_tile_value)
+        
+        # 1b. Other correct answers' leftmost tile / 2a: User's wrong. All the correct answers' leftmost tile
+        for correct_tile in remaining_correct_tiles:
+            for i, tile in enumerate(hand_view.tiles):
+                if tile == correct_tile and i not in highlighted:
+                    highlighted.append(i)
                     break
-            
-            # 1b. Other correct answers' leftmost tile
-            remaining_correct_tiles = correct_tiles.copy()
-            if user_selected_tile_value:
-                remaining_correct_tiles.remove(user_selected_tile_value)
-            
-            for correct_tile in remaining_correct_tiles:
-                for i, tile_label in enumerate(self.tile_labels):
-                    if (hasattr(tile_label, 'tile_value') and 
-                        tile_label.tile_value == correct_tile and
-                        (i, tile_label) not in [(pos, lbl) for pos, lbl, _ in tiles_to_highlight]):
-                        tiles_to_highlight.append((i, tile_label, "correct"))
-                        break
-        
-        else:
-            # 2a: User's wrong. All the correct answers' leftmost tile
-            for correct_tile in correct_tiles:
-                for i, tile_label in enumerate(self.tile_labels):
-                    if (hasattr(tile_label, 'tile_value') and 
-                        tile_label.tile_value == correct_tile and
-                        (i, tile_label) not in [(pos, lbl) for pos, lbl, _ in tiles_to_highlight]):
-                        tiles_to_highlight.append((i, tile_label, "correct"))
-                        break
-
-        for i, tile_label in enumerate(self.tile_labels[:]):
-            try:
-                if hasattr(tile_label, 'tile_value') and hasattr(tile_label, 'original_pixmap'):
-                    is_selected_tile = (hasattr(tile_label, 'tile_index') and 
-                                    tile_label.tile_index == self.selected_tile)
-
-                    is_highlighted = False
-                    highlight_type = None
-                    for pos, lbl, h_type in tiles_to_highlight:
-                        if i == pos and tile_label == lbl:
-                            is_highlighted = True
-                            highlight_type = h_type
-                            break
-
-                    # Similar to above
-                    if is_selected_tile and is_highlighted and highlight_type == "correct":
-                        # User Correct
-                        border_color = QColor("#00ad00")
-                        opacity = 1.0
-                    elif is_selected_tile and not is_highlighted:
-                        # User Wrong
-                        border_color = QColor("#ff0000")
-                        opacity = 1.0
-                    elif is_highlighted and highlight_type == "correct":
-                        # Other correct
-                        border_color = QColor("#00ad00")
-                        opacity = 1.0
-                    else:
-                        # Others
-                        border_color = Qt.transparent
-                        opacity = 0.4
-                    
-                    opacity_effect = QGraphicsOpacityEffect()
-                    opacity_effect.setOpacity(opacity)
-                    tile_label.setGraphicsEffect(opacity_effect)
-                    
-                    if border_color != Qt.transparent:
-                        new_pixmap = self.create_tile_pixmap_with_border(
-                            tile_label.original_pixmap, 
-                            border_color
-                        )
-                        tile_label.setPixmap(new_pixmap)
-                    else:
-                        tile_label.setPixmap(tile_label.original_pixmap)
-                        
-            except RuntimeError:
-                self.tile_labels.remove(tile_label)
-
-    def create_tile_pixmap_with_border(self, original_pixmap, border_color):
-        """Create tile pixmap with appropriate border color"""
 
-        pixmap_with_border = QPixmap(original_pixmap.size())
-        pixmap_with_border.fill(Qt.transparent)
-        
-        painter = QPainter(pixmap_with_border)
-        
-        painter.drawPixmap(0, 0, original_pixmap)
-        
-        # Draw border if needed
-        if border_color != Qt.transparent:
-            pen = QPen(border_color)
-            pen.setWidth(8)
-            painter.setPen(pen)
-            painter.setBrush(Qt.NoBrush)
-            
-            from PyQt5.QtCore import QRectF
-            rect = pixmap_with_border.rect()
-            border_rect = QRectF(3, 3, rect.width() - 6, rect.height() - 6)
-            corner_radius = 6
-            
-            painter.drawRoundedRect(border_rect, corner_radius, corner_radius)
-        
-        painter.end()
-        return pixmap_with_border
+        # Correct ones green, a wrong selection red, the others dimmed
+        borders = {i: CORRECT_COLOR for i in highlighted}
+        if self.selected_tile is not None and self.selected_tile not in highlighted:
+            borders[self.selected_tile] = WRONG_COLOR
+        hand_view.set_feedback(borders)
 
     def update_career_stats(self, is_correct):
         """Update career statistics for the current entry"""
@@ -1846,7 +1523,7 @@ class QuizPage(QWidget):
             
             self.data_manager.save_data(all_entries)
             
-            self.current_entry['data'] = all_entries[entry_id]
+            self.current_entry['data'] = Variants.apply(all_entries[entry_id], *self.current_variant)
 
     def show_notes_content(self):
         """Simply update the existing labels to show notes content"""
@@ -1857,6 +1534,11 @@ class QuizPage(QWidget):
         # Get notes data
         notes_title = Dict.t("upload.notes")+"\n"
         notes_content = self.current_entry['data'].get('notes', '') if self.current_entry else ''
+
+        # Waits after the answer, as the explanation of the shape
+        waits_text = self.get_waits_text()
+        if waits_text:
+            notes_content = f"{notes_content}\n\n{waits_text}" if notes_content else waits_text
         
         # Find the content widget
         content_widget = self.quiz_content.findChild(QWidget, "introContentWidget")
@@ -1922,6 +1604,32 @@ class QuizPage(QWidget):
                 }
             """)
 
+    def get_waits_text(self):
+        """Waits of the hand after the answer (when it is tenpai), from Waits.enumerate"""
+
+        if not self.current_entry:
+            return ""
+
+        data = self.current_entry['data']
+        tiles = Validator._parse_tiles_from_string(data.get('hands', ''))
+        if len(tiles) in [2, 5, 8, 11, 14]:
+            # In turn: take the first answer tile away
+            answer_tiles = [tile for tile in self.parse_answer_input_tiles(data.get('answer_input', '')) if tile in tiles]
+            if data.get('answer_action', '') not in ["answer.discard", "answer.riichi"] or not answer_tiles:
+                return ""
+            tiles.remove(answer_tiles[0])
+        elif len(tiles) not in [1, 4, 7, 10, 13]:
+            return ""
+
+        tile_set = Efficiency.tile_set(data.get('players', ''))
+        result = Waits.enumerate(Efficiency.to_counts(tiles), Efficiency.to_counts(data.get('dora', '')), tile_set)
+        if not result["tenpai"]:
+            return ""
+
+        wait_tiles = " ".join(wait["tile"] for wait in result["waits"])
+        shapes = Dict.t("common.comma").join(Dict.t(f"wait.{shape}") for shape in result["shapes"])
+        return Dict.t("quiz.waits").format(wait_tiles, shapes, result["remaining"])
+
     def next_question(self):
         """Move to next question"""
 
@@ -2028,9 +1736,10 @@ class QuizPage(QWidget):
                 self.on_answer_selected(first_button)
         
         # Choose the last tile
-        if (hasattr(self, 'tile_labels') and self.tile_labels and 
+        hand_view = self.get_hand_view()
+        if (hand_view is not None and hand_view.tiles and 
             self.selected_answer != Dict.t("answer.skip")):
-            last_tile_index = len(self.tile_labels) - 1
+            last_tile_index = len(hand_view.tiles) - 1
             self.on_tile_selected(last_tile_index)
         
         # Auto submit
@@ -2041,8 +1750,8 @@ class QuizPage(QWidget):
                 first_button = self.answer_buttons.buttons()[0]
                 self.on_answer_selected(first_button)
                 
-                if first_button.text() != Dict.t("answer.skip") and hasattr(self, 'tile_labels') and self.tile_labels:
-                    last_tile_index = len(self.tile_labels) - 1
+                if first_button.text() != Dict.t("answer.skip") and hand_view is not None and hand_view.tiles:
+                    last_tile_index = len(hand_view.tiles) - 1
                     self.on_tile_selected(last_tile_index)
                 
                 if self.submit_btn.isEnabled():
@@ -166,6 +166,19 @@ class SettingsPage(QWidget):
         row_endless.addWidget(self.chk_endless)
         inner_layout.addLayout(row_endless)
         
+        # Variants
+        row_variants = QHBoxLayout()
+        self.lbl_variants = QLabel(Dict.t("settings.variants"))
+        self.lbl_variants.setAlignment(Qt.AlignRight)
+        self.lbl_variants.setStyleSheet("QLabel{padding:8;}")
+        self.lbl_variants.setMinimumWidth(220)
+        self.chk_variants = QCheckBox()
+        self.chk_variants.setChecked(self.settings.get("variants", False))
+        self.chk_variants.toggled.connect(self.on_variants_changed)
+        row_variants.addWidget(self.lbl_variants)
+        row_variants.addWidget(self.chk_variants)
+        inner_layout.addLayout(row_variants)
+        
         settings_container.setLayout(inner_layout)
         container_layout.addWidget(settings_container)
         container_layout.addStretch()
@@ -230,6 +243,10 @@ class SettingsPage(QWidget):
 
         self.settings.set_many({"endless": checked})
 
+    def on_variants_changed(self, checked):
+
+        self.settings.set_many({"variants": checked})
+
     def on_reset_window(self):
         """Reset window geometry and font size"""
 
@@ -268,6 +285,7 @@ class SettingsPage(QWidget):
         self.lbl_career.setText(Dict.t("settings.career_stats"))
         self.lbl_timer.setText(Dict.t("settings.timer"))
         self.lbl_endless.setText(Dict.t("settings.endless"))
+        self.lbl_variants.setText(Dict.t("settings.variants"))
         self.btn_reset_window.setText(Dict.t("settings.reset_window"))
         self.size_hint_label.setText(Dict.t("settings.size_hint"))
 
@@ -293,6 +311,7 @@ class SettingsPage(QWidget):
             self.lbl_career, self.chk_career,
             self.lbl_timer, self.chk_timer,
             self.lbl_endless, self.chk_endless,
+            self.lbl_variants, self.chk_variants,
             self.size_hint_label
         ]
         apply_font_to_widgets(widgets)
\ No newline at end of file
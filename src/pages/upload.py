@@ -13,6 +13,9 @@ from collections import Counter
 
 from src.utils.i18n import Dict
 from src.utils.validators import Validator
+from src.utils.canonical import DuplicateIndex
+from src.utils.tile_recognizer import TileRecognizer, HAS_NUMPY
+from src.utils.image_hash import ImageHash, ImageHashIndex
 from src.utils.format_applier import apply_font_to_widgets
 
 from src.widgets.tile_selector import TileSelector
@@ -40,6 +43,16 @@ class UploadPage(QWidget):
         self.is_edit_mode = False
         self.current_edit_entry_id = None
         self.original_entry_data = None
+
+        # Duplicate problem index, rebuilt only when data.json changed elsewhere
+        self.duplicate_index = None
+        self.duplicate_index_mtime = None
+        # Same for near duplicate images (the hashes themselves are kept in saves/image_hashes.json)
+        self.image_hash_index = None
+        self.image_hash_index_mtime = None
+
+        # Screenshot tile reader, templates are loaded on first use
+        self.tile_recognizer = None
         
         # Track temporary files for cleanup; register cleanup on application exit
         self.temp_files = []
@@ -479,6 +492,14 @@ class UploadPage(QWidget):
         self.btn_reset.clicked.connect(self.reset_all)
         actions_row.addWidget(self.btn_reset)
 
+        # Detect tiles button (only with numpy): fills hands and dora from the image
+        self.btn_detect_tiles = QPushButton(Dict.t("upload.detect"))
+        self.btn_detect_tiles.setStyleSheet("QPushButton{padding:8;}")
+        self.btn_detect_tiles.setVisible(HAS_NUMPY)
+        self.btn_detect_tiles.setEnabled(False)
+        self.btn_detect_tiles.clicked.connect(self.detect_tiles)
+        actions_row.addWidget(self.btn_detect_tiles)
+
         # Reset Career button (edit mode)
         self.btn_reset_career = QPushButton(Dict.t("career.edit.resetCareer"))
         self.btn_reset_career.setStyleSheet("QPushButton{padding:8;}")
@@ -795,6 +816,7 @@ class UploadPage(QWidget):
         self.current_image_path = None
         self.original_pixmap = None
         self.btn_open_folder.setVisible(False)  # Hide open folder button when clearing image
+        self.btn_detect_tiles.setEnabled(False)
         
         self.cleanup_temp_files()
         
@@ -837,6 +859,7 @@ class UploadPage(QWidget):
         
         scaled = self.original_pixmap.scaled(target_w, target_h, Qt.KeepAspectRatio, Qt.SmoothTransformation)
         self.image_label.setPixmap(scaled)
+        self.btn_detect_tiles.setEnabled(True)
         
         self._position_clear_button()
     
@@ -876,6 +899,28 @@ class UploadPage(QWidget):
             # Reposition buttons after showing/hiding
             self._position_clear_button()
     
+    def detect_tiles(self):
+        """Read hands and dora from the image (tile templates matched), then fill them in"""
+
+        if not self.original_pixmap or self.original_pixmap.isNull():
+            return
+        if self.tile_recognizer is None:
+            self.tile_recognizer = TileRecognizer()
+
+        try:
+            result = self.tile_recognizer.recognize(TileRecognizer.from_qimage(self.original_pixmap.toImage()))
+        except Exception as e:
+            # print(f"Detect tiles wrong: {e}")
+            result = {"hands": "", "dora": ""}
+
+        if not result["hands"]:
+            StyledMessageBox.warning(self, Dict.t("msg.hint"), Dict.t("msg.warn.detect")).exec_()
+            return
+
+        self.on_hands_selected(result["hands"])
+        if result["dora"]:
+            self.on_dora_selected(result["dora"])
+
     def keyPressEvent(self, event: QKeyEvent):
 
         if event.key() == Qt.Key_V and event.modifiers() == Qt.ControlModifier:
@@ -1264,6 +1309,13 @@ class UploadPage(QWidget):
                 'intro': self.intro_input.toPlainText(), 'notes': self.notes_input.toPlainText()
             }
         
+        # Same problem already in the bank (suits permuted or not)
+        if not self.confirm_not_duplicate(data):
+            return
+        # Same screenshot already in the bank (rescaled or compressed again)
+        if not self.confirm_not_similar_image():
+            return
+
         # Process image path
         image_path = None
 
@@ -1301,6 +1353,7 @@ class UploadPage(QWidget):
             # Update existing entry
             success = self.data_manager.update_entry(self.current_edit_entry_id, image_path, data)
             if success:
+                self.update_duplicate_index(self.current_edit_entry_id, data)
                 if image_path and image_path in self.temp_files:
                     self.cleanup_single_temp_file(image_path)
                 
@@ -1312,6 +1365,7 @@ class UploadPage(QWidget):
             # Create new entry
             success = self.data_manager.save_entry(image_path, data)
             if success:
+                self.update_duplicate_index(success, data)
                 if image_path and image_path in self.temp_files:
                     self.cleanup_single_temp_file(image_path)
                 
@@ -1321,6 +1375,89 @@ class UploadPage(QWidget):
             else:
                 StyledMessageBox.critical(self, Dict.t("msg.failed"), Dict.t("msg.failed.save")).exec_()
 
+    def get_duplicate_index(self):
+        """Duplicate index of the bank, built in one pass when data.json changed since the last build"""
+
+        try:
+            mtime = os.path.getmtime(self.data_manager.data_file)
+        except OSError:
+            mtime = None
+        if self.duplicate_index is None or mtime != self.duplicate_index_mtime:
+            self.duplicate_index = DuplicateIndex().build(self.data_manager.load_all_data())
+            self.duplicate_index_mtime = mtime
+        return self.duplicate_index
+
+    def update_duplicate_index(self, entry_id, data):
+        """Put a just saved entry in the index, so the next save does not rebuild it"""
+
+        if self.duplicate_index is None:
+            return
+        self.duplicate_index.add(entry_id, data)
+        try:
+            self.duplicate_index_mtime = os.path.getmtime(self.data_manager.data_file)
+        except OSError:
+            self.duplicate_index_mtime = None
+
+    def confirm_not_duplicate(self, data):
+        """Ask before saving a problem that is already in the bank. True to go on saving"""
+
+        try:
+            index = self.get_duplicate_index()
+            found = index.find(data, exclude_id=self.current_edit_entry_id if self.is_edit_mode else None)
+        except Exception as e:
+            # print(f"Duplicate check wrong: {e}")
+            return True
+
+        if not found["exact"] and not found["isomorphic"]:
+            return True
+
+        key = "msg.warn.duplicate.exact" if found["exact"] else "msg.warn.duplicate.isomorphic"
+        ids = found["exact"] or found["isomorphic"]
+        titles = "\n".join(f"· {index.titles.get(entry_id) or entry_id}" for entry_id in ids[:5])
+        if len(ids) > 5:
+            titles += "\n· ..."
+
+        reply = StyledMessageBox.question(self, Dict.t("msg.hint"), Dict.t(key).format(titles), confirm_blue=True)
+        return reply.exec_() == QMessageBox.Yes
+
+    def get_image_hash_index(self):
+        """Image hash index of the bank, built again when data.json changed since the last build"""
+
+        try:
+            mtime = os.path.getmtime(self.data_manager.data_file)
+        except OSError:
+            mtime = None
+        if self.image_hash_index is None or mtime != self.image_hash_index_mtime:
+            self.image_hash_index = ImageHashIndex()
+            self.image_hash_index.build(self.data_manager.load_all_data(), self.data_manager.images_dir)
+            self.image_hash_index_mtime = mtime
+        return self.image_hash_index
+
+    def confirm_not_similar_image(self):
+        """Ask before saving a new image that looks like one already in the bank. True to go on saving"""
+
+        # Only a newly loaded or pasted image is checked, a kept one is already in the index
+        if not self.current_image_path or not self.original_pixmap:
+            return True
+
+        try:
+            index = self.get_image_hash_index()
+            ids = index.find(ImageHash.hashes(self.original_pixmap.toImage()),
+                             exclude_id=self.current_edit_entry_id if self.is_edit_mode else None)
+        except Exception as e:
+            # print(f"Image check wrong: {e}")
+            return True
+
+        if not ids:
+            return True
+
+        titles = "\n".join(f"· {index.titles.get(entry_id) or entry_id}" for entry_id in ids[:5])
+        if len(ids) > 5:
+            titles += "\n· ..."
+
+        reply = StyledMessageBox.question(self, Dict.t("msg.hint"), Dict.t("msg.warn.similarImage").format(titles), confirm_blue=True)
+        return reply.exec_() == QMessageBox.Yes
+
     def clear_form(self):
         """Reset the form to default"""
         
@@ -1331,6 +1468,7 @@ class UploadPage(QWidget):
         self.current_image_path = None
         self.original_pixmap = None
         self.btn_clear_image.setVisible(False)
+        self.btn_detect_tiles.setEnabled(False)
         self.setFocus()
 
         self.cleanup_temp_files()
@@ -1604,7 +1742,7 @@ class UploadPage(QWidget):
     def apply_font(self):
         
         widgets = [
-        self.btn_reset, self.btn_save, self.btn_reset_career, self.btn_cancel,
+        self.btn_reset, self.btn_save, self.btn_reset_career, self.btn_cancel, self.btn_detect_tiles,
         self.title_input, self.intro_input, self.notes_input, self.image_label,
         self.btn_select_hands, self.btn_select_answer, self.btn_select_dora,
         self.hands_display, self.answer_display, self.dora_display,
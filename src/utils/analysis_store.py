@@ -0,0 +1,193 @@
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import json
+import os
+
+from src.utils.efficiency import Efficiency
+from src.utils.melds import Melds
+from src.utils.path_finder import get_saves_path
+from src.utils.validators import Validator
+from src.utils.waits import Waits
+
+# Bump when a column is added or computed differently, every entry is then recomputed once
+COLUMNS_VERSION = 1
+
+# Fields the columns are computed from, anything else can change freely
+SOURCE_FIELDS = ['hands', 'dora', 'players', 'answer_action', 'answer_input']
+
+# Shanten filter buckets: -1 agari, 0 tenpai, 1, 2, 3 (3 or more)
+SHANTEN_BUCKETS = ['-1', '0', '1', '2', '3']
+
+# Wait shapes the filter offers (see Waits)
+WAIT_FILTER_SHAPES = ['ryanmen', 'kanchan', 'penchan', 'shanpon', 'tanki']
+
+# --- Columns (module level, so the pool can pickle them) --- #
+
+def _compute_columns(data):
+    """Derived columns of one entry, None for a hand that is not a legal size"""
+
+    tiles = Validator._parse_tiles_from_string(data.get('hands', ''))
+    counts = Efficiency.to_counts(tiles)
+    n = sum(counts)
+    if n not in [1, 2, 4, 5, 7, 8, 10, 11, 13, 14]:
+        return None
+
+    visible = Efficiency.to_counts(data.get('dora', ''))
+    tile_set = Efficiency.tile_set(data.get('players', ''))
+    is_three_player = data.get('players', '') == "players.three"
+    result = Waits.analyse_hand(tiles, visible, tile_set)
+
+    in_turn = n in [2, 5, 8, 11, 14]
+    if in_turn:
+        wait_count = max((waits["remaining"] for waits in result["discards"].values()), default=0)
+        wait_shapes = sorted({shape for waits in result["discards"].values() for shape in waits["shapes"]})
+        valid_calls = 0
+    else:
+        wait_count = result["waits"]["remaining"]
+        wait_shapes = result["waits"]["shapes"]
+        valid_calls = sum(len(Melds.enumerate(data.get('hands', ''), action, is_three_player)) for action in ["chi", "pon", "kan"])
+
+    # Ukeire left by the stored answer (in turn discard/riichi only)
+    answer_ukeire = None
+    if in_turn and data.get('answer_action', '') in ["answer.discard", "answer.riichi"]:
+        answer_tiles = [tile for tile in Validator._parse_tiles_from_string(data.get('answer_input', '')) if tile in tiles]
+        if answer_tiles:
+            after = list(counts)
+            after[Validator.to_code(answer_tiles[0])] -= 1
+            _, draws = Efficiency.ukeire(after, visible, tile_set)
+            answer_ukeire = sum(draws.values())
+
+    return {
+        "shanten": Efficiency.shanten(counts),
+        "state": result["state"],
+        "wait_count": wait_count,
+        "wait_shapes": wait_shapes,
+        "answer_ukeire": answer_ukeire,
+        "valid_calls": valid_calls,
+        "honor_count": sum(counts[31:38]),
+    }
+
+def _compute_item(item):
+    """Pool worker: (id, fingerprint, data) -> (id, record)"""
+
+    entry_id, fingerprint, data = item
+    try:
+        columns = _compute_columns(data)
+    except Exception as e:
+        # print(f"Columns failed: {entry_id} {e}")
+        columns = None
+    return entry_id, {"fingerprint": fingerprint, "columns": columns}
+
+# --- Store --- #
+
+class AnalysisStore:
+    def __init__(self, store_file=None):
+        """Set store file (beside data.json), the store itself is loaded on first use"""
+
+        self.store_file = store_file or get_saves_path("analysis.json")
+        self._records = None
+
+    @staticmethod
+    def fingerprint(data):
+        """Hash of the fields the columns depend on"""
+
+        fields = [str(COLUMNS_VERSION)] + [str(data.get(key, '')) for key in SOURCE_FIELDS]
+        return hashlib.sha1('|'.join(fields).encode('utf-8')).hexdigest()
+
+    def load(self):
+        """{id: {"fingerprint", "columns"}} from the store file, empty when there is none yet"""
+
+        if self._records is None:
+            try:
+                with open(self.store_file, 'r', encoding='utf-8') as f:
+                    self._records = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._records = {}
+        return self._records
+
+    def save(self):
+        """Write the records back to the store file. Returns: if it was written"""
+
+        try:
+            os.makedirs(os.path.dirname(self.store_file), exist_ok=True)
+            with open(self.store_file, 'w', encoding='utf-8') as f:
+                json.dump(self._records, f, ensure_ascii=False, separators=(',', ':'))
+            return True
+        except Exception as e:
+            # print(f"Save analysis wrong: {e}")
+            return False
+
+    def refresh(self, entries, workers=None, chunksize=32):
+        """Bring the store in line with an {id: data} bank: stale or new entries are recomputed
+        (on a process pool when there are many), deleted ones dropped.
+        Returns: number of entries recomputed"""
+
+        records = self.load()
+        stale = []
+        for entry_id, data in entries.items():
+            fingerprint = AnalysisStore.fingerprint(data)
+            record = records.get(entry_id)
+            if record is None or record.get("fingerprint") != fingerprint:
+                stale.append((entry_id, fingerprint, data))
+
+        removed = [entry_id for entry_id in records if entry_id not in entries]
+        for entry_id in removed:
+            del records[entry_id]
+
+        if stale:
+            workers = workers or os.cpu_count() or 1
+            if workers <= 1 or len(stale) < chunksize:
+                computed = [_compute_item(item) for item in stale]
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    computed = list(pool.map(_compute_item, stale, chunksize=chunksize))
+            records.update(computed)
+
+        if stale or removed:
+            self.save()
+        return len(stale)
+
+    def get(self, entry_id):
+        """Columns of one entry, None when unknown or not a legal hand"""
+
+        record = self.load().get(entry_id)
+        return record.get("columns") if record else None
+
+    def value(self, entry_id, column, default=None):
+        """One column of one entry, for sort keys"""
+
+        columns = self.get(entry_id)
+        if not columns or columns.get(column) is None:
+            return default
+        return columns[column]
+
+    def matches_shanten(self, entry_id, buckets):
+        """If an entry falls in one of the shanten filter buckets ('3' is 3 or more)"""
+
+        shanten = self.value(entry_id, "shanten")
+        if shanten is None:
+            return False
+        return str(min(shanten, 3)) in buckets
+
+    def matches_waits(self, entry_id, shapes):
+        """If an entry waits on one of the shapes (in turn: after any discard)"""
+
+        wait_shapes = self.value(entry_id, "wait_shapes")
+        if not wait_shapes:
+            return False
+        return any(shape in shapes for shape in wait_shapes)
+
+def main():
+    """Refresh saves/analysis.json for the whole bank: py -m src.utils.analysis_store [workers]"""
+
+    import sys
+    from src.utils.data_manager import DataManager
+
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    store = AnalysisStore()
+    entries = DataManager().load_all_data()
+    computed = store.refresh(entries, workers=workers)
+    print(f"Recomputed {computed} of {len(entries)} entries -> {store.store_file}")
+
+if __name__ == "__main__":
+    main()
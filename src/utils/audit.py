@@ -0,0 +1,197 @@
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import hashlib
+import json
+import os
+
+from src.utils.efficiency import Efficiency
+from src.utils.validators import Validator
+
+# Bump when the checks change, rows checkpointed by an older audit are then run again
+AUDIT_VERSION = 1
+
+# Everything a report row is built from
+AUDIT_FIELDS = ['title', 'hands', 'dora', 'players', 'answer_action', 'answer_input']
+
+# An answer is flagged when it keeps less than this share of the best ukeire
+LOW_UKEIRE_RATIO = 0.75
+
+# Worst first in the report
+SEVERITY = {"invalid_hand": 4, "not_in_hand": 3, "shanten_loss": 2, "low_ukeire": 1}
+
+REPORT_FIELDS = [
+    "severity", "flags", "id", "title", "hands", "dora", "answer",
+    "answer_shanten", "best_shanten", "answer_ukeire", "best_ukeire", "ukeire_gap", "best_tiles",
+]
+
+# --- Audit (module level, so the pool can pickle it) --- #
+
+def _audit_entry(data):
+    """Check the stored answer of one entry against the efficiency table.
+    Returns: a report row, None when there is nothing to audit (not a discard/riichi answer)"""
+
+    if data.get('answer_action', '') not in ["answer.discard", "answer.riichi"]:
+        return None
+
+    row = {
+        "id": data.get('id', ''),
+        "title": data.get('title', ''),
+        "hands": data.get('hands', ''),
+        "dora": data.get('dora', ''),
+        "answer": data.get('answer_input', ''),
+        "answer_shanten": "", "best_shanten": "",
+        "answer_ukeire": "", "best_ukeire": "", "ukeire_gap": "", "best_tiles": "",
+    }
+    flags = []
+
+    tiles = Validator._parse_tiles_from_string(data.get('hands', ''))
+    if len(tiles) not in [2, 5, 8, 11, 14]:
+        flags.append("invalid_hand")
+    else:
+        # A plain 5 answer on a red 5 in hand (or the other way) is the same discard
+        hand_keys = [Validator._fivedize_zero(tile) for tile in tiles]
+        answer_tiles = [tile for tile in Validator._parse_tiles_from_string(data.get('answer_input', ''))
+                        if Validator._fivedize_zero(tile) in hand_keys]
+        if not answer_tiles:
+            flags.append("not_in_hand")
+
+        counts = Efficiency.to_counts(tiles)
+        table = Efficiency.discard_table(counts, Efficiency.to_counts(data.get('dora', '')),
+                                         Efficiency.tile_set(data.get('players', '')))
+        best = table[0]
+        row["best_shanten"] = best["shanten"]
+        row["best_ukeire"] = best["ukeire"]
+        row["best_tiles"] = " ".join(Efficiency.code_to_tile(r["discard"]) for r in table
+                                     if r["shanten"] == best["shanten"] and r["ukeire"] == best["ukeire"])
+
+        if answer_tiles:
+            code = Validator.to_code(Validator._fivedize_zero(answer_tiles[0]))
+            answer = next(r for r in table if r["discard"] == code)
+            row["answer_shanten"] = answer["shanten"]
+            row["answer_ukeire"] = answer["ukeire"]
+            row["ukeire_gap"] = best["ukeire"] - answer["ukeire"] if answer["shanten"] == best["shanten"] else ""
+            if answer["shanten"] > best["shanten"]:
+                flags.append("shanten_loss")
+            elif answer["ukeire"] < best["ukeire"] * LOW_UKEIRE_RATIO:
+                flags.append("low_ukeire")
+
+    row["flags"] = " ".join(flags)
+    row["severity"] = max((SEVERITY[flag] for flag in flags), default=0)
+    return row
+
+def _audit_item(item):
+    """Pool worker: (id, key, data) -> (id, key, row, ok). ok is False when the check raised"""
+
+    entry_id, key, data = item
+    try:
+        return entry_id, key, _audit_entry(data), True
+    except Exception as e:
+        # print(f"Audit failed: {entry_id} {e}")
+        return entry_id, key, None, False
+
+# --- Bank audit --- #
+
+class Audit:
+    @staticmethod
+    def key(data):
+        """Checkpoint key: the fields a row is built from, plus the audit version"""
+
+        fields = [str(AUDIT_VERSION)] + [str(data.get(key, '')) for key in AUDIT_FIELDS]
+        return hashlib.sha1('|'.join(fields).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def load_checkpoint(checkpoint_file):
+        """Finished entries of an earlier run: {id: (key, row)}. A cut off last line is ignored"""
+
+        done = {}
+        try:
+            with open(checkpoint_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    done[record["id"]] = (record["key"], record["row"])
+        except FileNotFoundError:
+            pass
+        return done
+
+    @staticmethod
+    def run(entries, checkpoint_file, workers=None, chunksize=256):
+        """Audit a whole {id: data} bank. Every finished entry is appended to the checkpoint (JSON lines)
+        at once, so a stopped run picks up where it was; entries edited since are audited again.
+        Entries whose check raised are not checkpointed and are tried again on the next run.
+        Returns: report rows (flagged or not)"""
+
+        done = Audit.load_checkpoint(checkpoint_file)
+        todo = []
+        for entry_id, data in entries.items():
+            key = Audit.key(data)
+            if done.get(entry_id, (None,))[0] != key:
+                todo.append((entry_id, key, data))
+
+        if todo:
+            os.makedirs(os.path.dirname(os.path.abspath(checkpoint_file)), exist_ok=True)
+            with open(checkpoint_file, 'a', encoding='utf-8') as f:
+                workers = workers or os.cpu_count() or 1
+                if workers <= 1 or len(todo) < chunksize:
+                    Audit._write_results(f, map(_audit_item, todo), done)
+                else:
+                    with ProcessPoolExecutor(max_workers=workers) as pool:
+                        Audit._write_results(f, pool.map(_audit_item, todo, chunksize=chunksize), done)
+
+        return [row for entry_id, (_, row) in done.items() if entry_id in entries and row]
+
+    @staticmethod
+    def _write_results(f, results, done):
+        """Append results to the open checkpoint as they come in, failed ones are left out"""
+
+        for entry_id, key, row, ok in results:
+            if not ok:
+                continue
+            done[entry_id] = (key, row)
+            f.write(json.dumps({"id": entry_id, "key": key, "row": row}, ensure_ascii=False) + "\n")
+            f.flush()
+
+    @staticmethod
+    def write_report(rows, report_file, flagged_only=True):
+        """CSV report, worst first (severity, then the ukeire gap)"""
+
+        if flagged_only:
+            rows = [row for row in rows if row["severity"]]
+        rows = sorted(rows, key=lambda row: (-row["severity"], -(row["ukeire_gap"] or 0), row["title"]))
+        with open(report_file, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        return len(rows)
+
+def main():
+    """Audit stored answers: py -m src.utils.audit [data.json] [report.csv] [workers] [--all] [--restart]
+    Default is the app's own bank, the report goes to saves/audit.csv.
+    The checkpoint (report name + .jsonl) is resumed unless --restart."""
+
+    import sys
+    from src.utils.path_finder import get_saves_path
+
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    data_file = args[0] if args else get_saves_path("data.json")
+    report_file = args[1] if len(args) > 1 else get_saves_path("audit.csv")
+    workers = int(args[2]) if len(args) > 2 else None
+    checkpoint_file = os.path.splitext(report_file)[0] + ".jsonl"
+
+    if not os.path.exists(data_file):
+        print(f"File '{data_file}' not exist")
+        sys.exit(1)
+    with open(data_file, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+
+    if "--restart" in sys.argv and os.path.exists(checkpoint_file):
+        os.remove(checkpoint_file)
+
+    rows = Audit.run(entries, checkpoint_file, workers=workers)
+    written = Audit.write_report(rows, report_file, flagged_only="--all" not in sys.argv)
+    print(f"Audited {len(rows)} of {len(entries)} entries, {written} rows -> {report_file}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+from itertools import permutations
+import hashlib
+
+from src.utils.efficiency import Efficiency
+from src.utils.validators import Validator
+
+# --- Normal form --- #
+
+def _tile_keys(text):
+    """(code, red) of every tile in a string, 0 is a red 5"""
+
+    keys = []
+    for tile in Validator._parse_tiles_from_string(text or ""):
+        code = Validator.to_code(tile)
+        if code is not None:
+            keys.append((code, tile[0] == '0'))
+    return keys
+
+def _transform(code, order, mirror):
+    """Move a code to another suit (order[suit]) and optionally flip 1-9. Honors never move"""
+
+    if code > 30:
+        return code
+    suit, rank = divmod(code, 10)
+    if mirror:
+        rank = 10 - rank
+    return order[suit] * 10 + rank
+
+class Canonical:
+    @staticmethod
+    def transforms(players="", mirror=False):
+        """Every (suit order, mirror) a problem is the same under. Sanma keeps the manzu in place"""
+
+        if players == "players.three":
+            orders = [(0, 1, 2), (0, 2, 1)]
+        else:
+            orders = list(permutations(range(3)))
+        return [(order, flip) for order in orders for flip in ([False, True] if mirror else [False])]
+
+    @staticmethod
+    def parse(data):
+        """Tiles of a problem, read once for every transform: (context, hand keys, dora codes).
+        Dora are kept as the dora tiles (not the indicators), so a mirrored problem still points at the mirrored dora"""
+
+        tile_set = Efficiency.tile_set(data.get('players', ''))
+        context = "|".join([data.get('players', ''), data.get('wind', ''), data.get('self_wind', '')])
+        hands = _tile_keys(data.get('hands', ''))
+        dora = [tile_set.dora_next.get(code, code) for code, _ in _tile_keys(data.get('dora', ''))]
+        return context, hands, dora
+
+    @staticmethod
+    def normal_form(parsed, order=(0, 1, 2), mirror=False):
+        """Parsed problem under one transform as a string"""
+
+        context, hands, dora = parsed
+        hands = sorted((_transform(code, order, mirror), red) for code, red in hands)
+        dora = sorted(_transform(code, order, mirror) for code in dora)
+        return "|".join([
+            context,
+            ",".join(f"{code}{'r' if red else ''}" for code, red in hands),
+            ",".join(str(code) for code in dora),
+        ])
+
+    @staticmethod
+    def keys(data, mirror=False):
+        """(exact, isomorphic) hashes. Exact: the problem as it is (tile order in the strings does not matter).
+        Isomorphic: the smallest normal form over all suit permutations (and 1-9 mirrors)"""
+
+        parsed = Canonical.parse(data)
+        exact = Canonical.normal_form(parsed)
+        iso = min(Canonical.normal_form(parsed, order, flip) for order, flip in Canonical.transforms(data.get('players', ''), mirror))
+        return hashlib.sha1(exact.encode('utf-8')).hexdigest(), hashlib.sha1(iso.encode('utf-8')).hexdigest()
+
+# --- Duplicate index --- #
+
+class DuplicateIndex:
+    def __init__(self, mirror=False):
+        """Hash -> ids for exact and isomorphic keys, plus the keys of each id so it can be taken out again"""
+
+        self.mirror = mirror
+        self.exact = {}
+        self.isomorphic = {}
+        self.keys = {}
+        self.titles = {}
+
+    def build(self, entries):
+        """Index a whole {id: data} bank in one pass"""
+
+        self.exact.clear()
+        self.isomorphic.clear()
+        self.keys.clear()
+        self.titles.clear()
+        for entry_id, data in entries.items():
+            self.add(entry_id, data)
+        return self
+
+    def add(self, entry_id, data):
+
+        if entry_id in self.keys:
+            self.remove(entry_id)
+        exact, iso = Canonical.keys(data, self.mirror)
+        self.exact.setdefault(exact, []).append(entry_id)
+        self.isomorphic.setdefault(iso, []).append(entry_id)
+        self.keys[entry_id] = (exact, iso)
+        self.titles[entry_id] = data.get('title', '')
+
+    def remove(self, entry_id):
+
+        if entry_id not in self.keys:
+            return
+        exact, iso = self.keys.pop(entry_id)
+        self.titles.pop(entry_id, None)
+        for table, key in ((self.exact, exact), (self.isomorphic, iso)):
+            table[key].remove(entry_id)
+            if not table[key]:
+                del table[key]
+
+    def find(self, data, exclude_id=None):
+        """Entries that are the same problem as data (two dict lookups).
+        Returns: {"exact": [ids], "isomorphic": [ids]}, isomorphic ones not repeated in exact"""
+
+        exact_key, iso_key = Canonical.keys(data, self.mirror)
+        exact = [i for i in self.exact.get(exact_key, []) if i != exclude_id]
+        iso = [i for i in self.isomorphic.get(iso_key, []) if i != exclude_id and i not in exact]
+        return {"exact": exact, "isomorphic": iso}
+
+    def groups(self):
+        """Every duplicate group of the index: [("exact"/"isomorphic", [ids])]"""
+
+        found = [("exact", ids) for ids in self.exact.values() if len(ids) > 1]
+        for ids in self.isomorphic.values():
+            # Only report permuted copies that are not all one exact group already
+            if len(ids) > 1 and len({self.keys[i][0] for i in ids}) > 1:
+                found.append(("isomorphic", ids))
+        return found
+
+def main():
+    """List duplicate problems of the bank: py -m src.utils.canonical [--mirror]"""
+
+    import sys
+    from src.utils.data_manager import DataManager
+
+    index = DuplicateIndex(mirror="--mirror" in sys.argv).build(DataManager().load_all_data())
+    groups = index.groups()
+    for kind, ids in groups:
+        print(f"[{kind}] " + " / ".join(f"{index.titles[i]} ({i})" for i in ids))
+    print(f"{len(groups)} duplicate groups in {len(index.keys)} entries")
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,21 @@
 import os
-import sys
 import json
 import shutil
 from datetime import datetime
 import uuid
 
+from src.utils.path_finder import get_saves_path
+
 class DataManager:
+
+    # Writes of data.json by this process (any instance), see data_version
+    _writes = 0
+
     def __init__(self, base_dir=None):
         """Set save folder/file"""
-        # Determine base directory for saves.
-        # When frozen by PyInstaller, put saves next to the executable so
-        # the folder sits beside the .exe. During development, keep saves
-        # under the project root.
-        if getattr(sys, 'frozen', False):
-            # sys.executable points to the running exe; use its directory.
-            base = os.path.dirname(sys.executable)
-        else:
-            # project root: two levels up from this utils folder
-            base = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-
-        saves_dir = os.path.join(base, "saves")
+        # Saves sit beside the .exe when frozen by PyInstaller, and under the
+        # project root during development (see path_finder.get_saves_path).
+        saves_dir = get_saves_path()
         os.makedirs(saves_dir, exist_ok=True)
         self.images_dir = os.path.join(saves_dir, "images")
         os.makedirs(self.images_dir, exist_ok=True)
@@ -55,13 +51,63 @@ class DataManager:
             # Add to data
             all_data[entry_id] = entry_data
             
-            # Save
-            return self.save_data(all_data)
+            # Save; the new id on success (still truthy for callers checking the result)
+            return entry_id if self.save_data(all_data) else False
             
         except Exception as e:
             # print(f"Save wrong: {e}")
             return False
     
+    def save_entries(self, entries):
+        """Save many new entries (no images) with one read and one write of data.json.
+        Returns: list of the new ids, [] when saving failed"""
+
+        try:
+            all_data = self.load_all_data()
+
+            entry_ids = []
+            for data in entries:
+                entry_id = str(uuid.uuid4())
+                entry_data = data.copy()
+                entry_data['image_filename'] = ""
+                entry_data['id'] = entry_id
+                all_data[entry_id] = entry_data
+                entry_ids.append(entry_id)
+
+            return entry_ids if self.save_data(all_data) else []
+
+        except Exception as e:
+            # print(f"Save wrong: {e}")
+            return []
+
+    def upsert_entries(self, entries):
+        """Add or replace many entries by their own 'id' with one read and one write of data.json.
+        Entries already there keep their play stats and image. Returns: (added, updated), None when saving failed"""
+
+        try:
+            all_data = self.load_all_data()
+
+            added = updated = 0
+            for data in entries:
+                entry_id = data['id']
+                entry_data = data.copy()
+                old_data = all_data.get(entry_id)
+                if old_data is None:
+                    entry_data['image_filename'] = entry_data.get('image_filename', "")
+                    added += 1
+                else:
+                    for key in ['encounter', 'correct', 'accuracy', 'career_stats', 'image_filename']:
+                        if key in old_data:
+                            entry_data[key] = old_data[key]
+                    updated += 1
+                all_data[entry_id] = entry_data
+
+            return (added, updated) if self.save_data(all_data) else None
+
+        except Exception as e:
+            # print(f"Upsert wrong: {e}")
+            return None
+
     def load_entries(self):
 
         return self.load_all_data()
@@ -74,11 +120,11 @@ class DataManager:
         except (FileNotFoundError, json.JSONDecodeError):
             return {}
     
-    def save_data(self, data):
-        """Save data for an entry with certain format"""
+    def save_data(self, data, data_file=None):
+        """Save data for an entry with certain format. data_file: write another file in the same format"""
 
         try:
-            with open(self.data_file, 'w', encoding='utf-8') as f:
+            with open(data_file or self.data_file, 'w', encoding='utf-8') as f:
                 f.write('{\n')
                 entries = []
                 for entry_id, entry_data in data.items():
@@ -107,11 +153,22 @@ class DataManager:
                 
                 f.write(',\n'.join(entries))
                 f.write('\n}')
+            DataManager._writes += 1
             return True
         except Exception as e:
             # print(f"{e}")
             return False
     
+    def data_version(self):
+        """Changes whenever data.json is written, by this process or any other:
+        cached views of the bank compare it instead of reading the file again"""
+
+        try:
+            stat = os.stat(self.data_file)
+            return (DataManager._writes, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return (DataManager._writes, None, None)
+    
     def get_image_path(self, entry_id):
         """Get the image path from files"""
 
@@ -0,0 +1,192 @@
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import json
+import os
+
+from src.utils.efficiency import Efficiency
+from src.utils.path_finder import get_saves_path
+from src.utils.validators import Validator
+
+# Bump when the scoring changes, old cache keys are then simply never hit again
+ENGINE_VERSION = 2
+
+WIND_CODES = {"info.east": 31, "info.south": 32, "info.west": 33, "info.north": 34}
+DRAGON_CODES = [35, 36, 37]
+
+# Score weights. Shanten dominates, value terms fade out as the turn goes on
+SHANTEN_WEIGHT = 100
+DORA_VALUE = 4
+YAKUHAI_VALUE = 3
+LAST_TURN = 18
+
+class DiscardEngine:
+    def __init__(self, cache_file=None):
+        """Set cache file, the cache itself is loaded on first use"""
+
+        self.cache_file = cache_file or get_saves_path(os.path.join("cache", "discards.json"))
+        self._cache = None
+        self._dirty = False
+
+    # --- Evaluation --- #
+
+    @staticmethod
+    def dora_from_indicator(code, tile_set=None):
+        """Next tile of an indicator: 9 -> 1, north -> east, chun -> haku (sanma: 1m -> 9m)"""
+
+        return (tile_set or Efficiency.tile_set("")).dora_next.get(code, code)
+
+    @staticmethod
+    def yakuhai_codes(data):
+        """Yakuhai of this problem, round and seat wind may be the same (double wind)"""
+
+        codes = list(DRAGON_CODES)
+        for key in ['wind', 'self_wind']:
+            if data.get(key) in WIND_CODES:
+                codes.append(WIND_CODES[data.get(key)])
+        return codes
+
+    @staticmethod
+    def value_weight(data):
+        """How much dora/yakuhai matter at this turn (1 at the start, 0.25 at the end)"""
+
+        try:
+            turn = int(data.get('turn', ''))
+        except ValueError:
+            return 1.0
+        return max(0.25, 1 - max(0, turn - 1) / (LAST_TURN - 1))
+
+    @staticmethod
+    def evaluate(data):
+        """Ranked discards of one entry (in turn hands only).
+        Returns: [{"tile", "score", "shanten", "ukeire", "tiles", "dora_kept", "yakuhai_pairs"}]"""
+
+        tiles = Validator._parse_tiles_from_string(data.get('hands', ''))
+        if len(tiles) not in [2, 5, 8, 11, 14]:
+            return []
+
+        counts = Efficiency.to_counts(tiles)
+        tile_set = Efficiency.tile_set(data.get('players', ''))
+        indicator_counts = Efficiency.to_counts(data.get('dora', ''))
+        dora_codes = []
+        for code, count in enumerate(indicator_counts):
+            dora_codes.extend([DiscardEngine.dora_from_indicator(code, tile_set)] * count)
+
+        yakuhai = DiscardEngine.yakuhai_codes(data)
+        weight = DiscardEngine.value_weight(data)
+        reds = sum(1 for tile in tiles if tile[0] == '0')
+
+        results = []
+        for row in Efficiency.discard_table(counts, indicator_counts, tile_set):
+            code = row["discard"]
+            after = list(counts)
+            after[code] -= 1
+
+            # Throw a plain 5 before a red one
+            tile = Efficiency.code_to_tile(code)
+            red_lost = code % 10 == 5 and code < 30 and tile not in tiles
+            if red_lost:
+                tile = '0' + tile[1]
+
+            dora_kept = sum(after[dora] for dora in dora_codes) + reds - (1 if red_lost else 0)
+            if tile_set.nuki:
+                # Sanma: a kept north is pulled out as nuki dora
+                dora_kept += after[tile_set.nuki]
+            yakuhai_pairs = sum(1 for yaku in yakuhai if after[yaku] >= 2)
+
+            score = row["ukeire"] - SHANTEN_WEIGHT * row["shanten"] + \
+                weight * (DORA_VALUE * dora_kept + YAKUHAI_VALUE * yakuhai_pairs)
+            results.append({
+                "tile": tile,
+                "score": round(score, 2),
+                "shanten": row["shanten"],
+                "ukeire": row["ukeire"],
+                "tiles": [Efficiency.code_to_tile(c) for c in sorted(row["tiles"])],
+                "dora_kept": dora_kept,
+                "yakuhai_pairs": yakuhai_pairs,
+            })
+
+        results.sort(key=lambda result: (-result["score"], result["shanten"]))
+        return results
+
+    @staticmethod
+    def problem_key(data):
+        """Cache key: everything the evaluation reads, plus the engine version"""
+
+        fields = [str(ENGINE_VERSION)] + [str(data.get(key, '')) for key in ['hands', 'dora', 'wind', 'self_wind', 'turn', 'players']]
+        return hashlib.sha1('|'.join(fields).encode('utf-8')).hexdigest()
+
+    # --- Cache --- #
+
+    def _load_cache(self):
+        if self._cache is None:
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    self._cache = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._cache = {}
+        return self._cache
+
+    def save_cache(self):
+        """Write the cache if anything new was computed"""
+
+        if not self._dirty:
+            return True
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(self._cache, f, ensure_ascii=False, separators=(',', ':'))
+            self._dirty = False
+            return True
+        except Exception as e:
+            # print(f"Save cache wrong: {e}")
+            return False
+
+    def recommend(self, data, save=True):
+        """Ranked discards of one entry, computed once per problem"""
+
+        cache = self._load_cache()
+        key = DiscardEngine.problem_key(data)
+        if key not in cache:
+            cache[key] = DiscardEngine.evaluate(data)
+            self._dirty = True
+            if save:
+                self.save_cache()
+        return cache[key]
+
+    def recommend_bank(self, entries, workers=None, chunksize=32):
+        """Ranked discards for a whole {id: data} bank. Only cache misses are computed, on a process pool"""
+
+        cache = self._load_cache()
+        keys = {entry_id: DiscardEngine.problem_key(data) for entry_id, data in entries.items()}
+
+        missing = {}
+        for entry_id, key in keys.items():
+            if key not in cache and key not in missing:
+                missing[key] = entries[entry_id]
+
+        if missing:
+            workers = workers or os.cpu_count() or 1
+            if workers <= 1 or len(missing) < chunksize:
+                computed = [DiscardEngine.evaluate(data) for data in missing.values()]
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    computed = list(pool.map(DiscardEngine.evaluate, missing.values(), chunksize=chunksize))
+            cache.update(zip(missing.keys(), computed))
+            self._dirty = True
+            self.save_cache()
+
+        return {entry_id: cache[key] for entry_id, key in keys.items()}
+
+def main():
+    """Fill the cache for the whole bank: py -m src.utils.discard_engine [workers]"""
+
+    import sys
+    from src.utils.data_manager import DataManager
+
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    engine = DiscardEngine()
+    results = engine.recommend_bank(DataManager().load_all_data(), workers=workers)
+    print(f"Ranked discards for {len(results)} entries -> {engine.cache_file}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,526 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import product
+import os
+
+from src.utils.validators import Validator
+
+# Codes follow Validator.to_code: m 1-9, p 11-19, s 21-29, z 31-37
+ALL_CODES = (
+    list(range(1, 10)) +
+    list(range(11, 20)) +
+    list(range(21, 30)) +
+    list(range(31, 38))
+)
+TERMINAL_CODES = [1, 9, 11, 19, 21, 29, 31, 32, 33, 34, 35, 36, 37]
+SUIT_STARTS = [1, 11, 21]
+COUNTS_SIZE = 38
+
+# --- Suit pattern tables --- #
+
+@lru_cache(maxsize=1 << 16)
+def _block_splits(counts, is_honor):
+    """Every (mentsu, taatsu, pair) split of a pattern, memoised on what is left of it
+    (the same tails come up again and again, so long one-suit hands stay cheap)"""
+
+    i = 0
+    while i < len(counts) and counts[i] == 0:
+        i += 1
+    if i >= len(counts):
+        return frozenset([(0, 0, 0)])
+    counts = list(counts[i:])
+
+    found = set()
+
+    def take(removed, m, t, head=False):
+        for index in removed:
+            counts[index] -= 1
+        for m2, t2, p2 in _block_splits(tuple(counts), is_honor):
+            if head:
+                if p2 == 0:
+                    found.add((m + m2, t + t2, 1))
+            else:
+                found.add((m + m2, t + t2, p2))
+        for index in removed:
+            counts[index] += 1
+
+    # Triplet
+    if counts[0] >= 3:
+        take((0, 0, 0), 1, 0)
+
+    # Straight
+    if not is_honor and len(counts) > 2 and counts[1] and counts[2]:
+        take((0, 1, 2), 1, 0)
+
+    # Pair, as the head or as a taatsu
+    if counts[0] >= 2:
+        take((0, 0), 0, 0, head=True)
+        take((0, 0), 0, 1)
+
+    # Ryanmen/penchan and kanchan
+    if not is_honor:
+        for gap in (1, 2):
+            if gap < len(counts) and counts[gap]:
+                take((0, gap), 0, 1)
+
+    # Leave it floating
+    take((0,), 0, 0)
+    return frozenset(found)
+
+@lru_cache(maxsize=None)
+def _pattern_options(pattern, is_honor):
+    """Best taatsu count for each (mentsu, pair) of one trimmed pattern"""
+
+    options = {}
+    for m, t, p in _block_splits(tuple(pattern), is_honor):
+        if options.get((m, p), -1) < t:
+            options[(m, p)] = t
+    return tuple(options.items())
+
+def _merge_options(left, right):
+    """Combine two option tables, keeping at most one pair"""
+
+    merged = {}
+    for (m1, p1), t1 in left:
+        for (m2, p2), t2 in right:
+            if p1 + p2 > 1:
+                continue
+            key = (m1 + m2, p1 + p2)
+            if merged.get(key, -1) < t1 + t2:
+                merged[key] = t1 + t2
+    return tuple(merged.items())
+
+def _split_patterns(suit_counts):
+    """Split a suit into independent trimmed patterns (two empty ranks cut every shape)"""
+
+    patterns = []
+    current = []
+    gap = 0
+    for count in suit_counts:
+        if count:
+            if gap >= 2 and current:
+                patterns.append(tuple(current))
+                current = []
+            elif current:
+                current.extend([0] * gap)
+            current.append(count)
+            gap = 0
+        else:
+            gap += 1
+    if current:
+        patterns.append(tuple(current))
+    return patterns
+
+@lru_cache(maxsize=None)
+def _suit_options(suit_counts):
+    """Options of one whole suit. Canonical patterns are shared by m/p/s and across hands"""
+
+    options = (((0, 0), 0),)
+    for pattern in _split_patterns(suit_counts):
+        options = _merge_options(options, _pattern_options(pattern, False))
+    return options
+
+@lru_cache(maxsize=None)
+def _honor_options(honor_counts):
+    """Options of the honors, each honor tile on its own"""
+
+    options = (((0, 0), 0),)
+    for count in sorted(honor_counts):
+        if count:
+            options = _merge_options(options, _pattern_options((count,), True))
+    return options
+
+@lru_cache(maxsize=None)
+def _regular_shanten(counts):
+    """Shanten of the 4 mentsu + 1 pair form (works for hands with calls removed too)"""
+
+    total = sum(counts)
+    required = total // 3
+
+    options = _honor_options(counts[31:38])
+    for start in SUIT_STARTS:
+        options = _merge_options(options, _suit_options(counts[start:start + 9]))
+
+    best = 2 * required
+    for (m, p), t in options:
+        m = min(m, required)
+        t = min(t, required - m)
+        best = min(best, 2 * required - 2 * m - t - p)
+    return best
+
+def _chiitoi_shanten(counts):
+    """Shanten of seven pairs"""
+
+    pairs = sum(1 for c in counts if c >= 2)
+    kinds = sum(1 for c in counts if c)
+    return 6 - pairs + max(0, 7 - kinds)
+
+def _kokushi_shanten(counts):
+    """Shanten of 13 orphans"""
+
+    kinds = sum(1 for code in TERMINAL_CODES if counts[code])
+    has_pair = any(counts[code] >= 2 for code in TERMINAL_CODES)
+    return 13 - kinds - (1 if has_pair else 0)
+
+@lru_cache(maxsize=1 << 18)
+def _shanten(counts):
+    """Best shanten among all forms. -1 means agari"""
+
+    result = _regular_shanten(counts)
+    if sum(counts) >= 13:
+        result = min(result, _chiitoi_shanten(counts), _kokushi_shanten(counts))
+    return result
+
+# --- Tile sets --- #
+
+class TileSet:
+    """Tiles in the wall for one kind of game. Sanma has no 2m-8m and pulls north out as nuki dora"""
+
+    def __init__(self, codes, nuki=None):
+        self.codes = list(codes)
+        self.wall = tuple(4 if code in self.codes else 0 for code in range(COUNTS_SIZE))
+        self.nuki = nuki
+
+        # Dora after each indicator, cycling inside the suit (sanma: 1m -> 9m -> 1m)
+        self.dora_next = {}
+        groups = [[code for code in self.codes if start <= code < start + 9] for start in SUIT_STARTS]
+        groups += [[31, 32, 33, 34], [35, 36, 37]]
+        for group in groups:
+            for i, code in enumerate(group):
+                self.dora_next[code] = group[(i + 1) % len(group)]
+
+        # A reduced suit can only hold a few patterns, so build its tables right away
+        for start in SUIT_STARTS:
+            ranks = [code - start for code in self.codes if start <= code < start + 9]
+            if len(ranks) < 9:
+                for counts in product(range(5), repeat=len(ranks)):
+                    suit = [0] * 9
+                    for rank, count in zip(ranks, counts):
+                        suit[rank] = count
+                    _suit_options(tuple(suit))
+
+FOUR_PLAYERS = TileSet(ALL_CODES)
+THREE_PLAYERS = TileSet([code for code in ALL_CODES if not 2 <= code <= 8], nuki=34)
+
+# --- Efficiency --- #
+
+class Efficiency:
+    @staticmethod
+    def to_counts(tiles):
+        """Turn tiles (string, tile list or code list) into a count tuple indexed by code"""
+
+        if isinstance(tiles, str):
+            tiles = Validator._parse_tiles_from_string(tiles)
+
+        counts = [0] * COUNTS_SIZE
+        for tile in tiles:
+            code = tile if isinstance(tile, int) else Validator.to_code(tile)
+            if code is None:
+                continue
+            counts[code] += 1
+        return tuple(counts)
+
+    @staticmethod
+    def code_to_tile(code):
+        """Turn a code back into a tile string (5 for red fives)"""
+
+        return f"{code % 10}{'mpsz'[code // 10]}"
+
+    @staticmethod
+    def tile_set(players):
+        """Tile set of the players field ("players.three" is sanma, everything else yonma)"""
+
+        return THREE_PLAYERS if players == "players.three" else FOUR_PLAYERS
+
+    @staticmethod
+    def shanten(counts):
+        """Shanten number of a count tuple. -1 agari, 0 tenpai"""
+
+        return _shanten(tuple(counts))
+
+    @staticmethod
+    def remaining(counts, visible=None, tile_set=None):
+        """How many of each tile are still unseen"""
+
+        wall = (tile_set or FOUR_PLAYERS).wall
+        left = [0] * COUNTS_SIZE
+        for code in ALL_CODES:
+            left[code] = wall[code] - counts[code] - (visible[code] if visible else 0)
+            left[code] = max(0, left[code])
+        return left
+
+    @staticmethod
+    def candidate_draws(counts, tile_set=None):
+        """Tiles that can possibly lower the shanten: neighbours, honors held and orphans"""
+
+        codes = (tile_set or FOUR_PLAYERS).codes
+        if sum(counts) >= 13 and _kokushi_shanten(counts) <= _regular_shanten(counts):
+            return codes
+
+        candidates = set()
+        for code in ALL_CODES:
+            if not counts[code]:
+                continue
+            if code > 30:
+                candidates.add(code)
+                continue
+            for near in range(code - 2, code + 3):
+                if near // 10 == code // 10 and near % 10 != 0:
+                    candidates.add(near)
+
+        if sum(counts) >= 13:
+            # Chiitoi can still use any new single once pairs are full
+            if _chiitoi_shanten(counts) <= _regular_shanten(counts):
+                return codes
+        wall = (tile_set or FOUR_PLAYERS).wall
+        return sorted(code for code in candidates if wall[code])
+
+    @staticmethod
+    def ukeire(counts, visible=None, tile_set=None):
+        """Effective draws of an out of turn hand.
+        Returns: (shanten, {code: remaining})"""
+
+        counts = tuple(counts)
+        current = _shanten(counts)
+        left = Efficiency.remaining(counts, visible, tile_set)
+
+        tiles = {}
+        draw_counts = list(counts)
+        for code in Efficiency.candidate_draws(counts, tile_set):
+            if left[code] <= 0:
+                continue
+            draw_counts[code] += 1
+            if _shanten(tuple(draw_counts)) < current:
+                tiles[code] = left[code]
+            draw_counts[code] -= 1
+
+        return current, tiles
+
+    @staticmethod
+    def discard_table(counts, visible=None, tile_set=None):
+        """Shanten and ukeire after each different discard of an in turn hand"""
+
+        counts = tuple(counts)
+        table = []
+        for code in ALL_CODES:
+            if not counts[code]:
+                continue
+            after = list(counts)
+            after[code] -= 1
+            shanten, tiles = Efficiency.ukeire(after, visible, tile_set)
+            table.append({
+                "discard": code,
+                "shanten": shanten,
+                "tiles": tiles,
+                "ukeire": sum(tiles.values()),
+            })
+
+        table.sort(key=lambda row: (row["shanten"], -row["ukeire"], row["discard"]))
+        return table
+
+    @staticmethod
+    def best_discards(counts, visible=None, tile_set=None):
+        """Top rows of the discard table only: (shanten, ukeire, [codes tied for best]).
+        Discards that go backwards are never counted, so this is far cheaper than the whole table"""
+
+        counts = tuple(counts)
+        after_shanten = {}
+        for code in ALL_CODES:
+            if counts[code]:
+                after = list(counts)
+                after[code] -= 1
+                after_shanten[code] = _shanten(tuple(after))
+        if not after_shanten:
+            return None
+
+        best_shanten = min(after_shanten.values())
+        best_ukeire = -1
+        best_codes = []
+        for code, shanten in after_shanten.items():
+            if shanten != best_shanten:
+                continue
+            after = list(counts)
+            after[code] -= 1
+            _, tiles = Efficiency.ukeire(after, visible, tile_set)
+            ukeire = sum(tiles.values())
+            if ukeire > best_ukeire:
+                best_ukeire, best_codes = ukeire, [code]
+            elif ukeire == best_ukeire:
+                best_codes.append(code)
+        return best_shanten, best_ukeire, best_codes
+
+    @staticmethod
+    def _best_after_draw(counts, visible, tile_set=None):
+        """Best (shanten, ukeire) reachable by keeping 13 tiles of a 14 tile hand"""
+
+        best = None
+        for code in ALL_CODES:
+            if not counts[code]:
+                continue
+            after = list(counts)
+            after[code] -= 1
+            shanten = _shanten(tuple(after))
+            if best is not None and shanten > best[0]:
+                continue
+            _, tiles = Efficiency.ukeire(after, visible, tile_set)
+            key = (shanten, sum(tiles.values()))
+            if best is None or key[0] < best[0] or (key[0] == best[0] and key[1] > best[1]):
+                best = key
+        return best
+
+    @staticmethod
+    def improvement(counts, visible=None, tile_set=None):
+        """Second order look at an out of turn hand.
+        Effective draws are weighted by the ukeire (the wait, for 1-shanten) they lead to;
+        non-effective draws that widen the ukeire are the improvement tiles."""
+
+        counts = tuple(counts)
+        current, tiles = Efficiency.ukeire(counts, visible, tile_set)
+        base = sum(tiles.values())
+        left = Efficiency.remaining(counts, visible, tile_set)
+
+        next_ukeire = {}
+        improving = {}
+        draw_counts = list(counts)
+        for code in ALL_CODES:
+            if left[code] <= 0:
+                continue
+            draw_counts[code] += 1
+            drawn = tuple(draw_counts)
+            draw_counts[code] -= 1
+
+            if code in tiles:
+                # Agari does not go any further
+                if current > 0:
+                    next_ukeire[code] = Efficiency._best_after_draw(drawn, visible, tile_set)[1]
+                continue
+
+            best = Efficiency._best_after_draw(drawn, visible, tile_set)
+            if best[0] == current and best[1] > base:
+                improving[code] = best[1] - base
+
+        weighted = sum(left[code] * value for code, value in next_ukeire.items())
+        improve_weighted = sum(left[code] * gain for code, gain in improving.items())
+        return {
+            "shanten": current,
+            "tiles": tiles,
+            "ukeire": base,
+            "next_ukeire": next_ukeire,
+            "weighted_next": weighted,
+            "improving": improving,
+            "improvement_count": sum(left[code] for code in improving),
+            "weighted_improvement": improve_weighted,
+        }
+
+    @staticmethod
+    def rank_discards(counts, visible=None, tile_set=None):
+        """Rank the discards of an in turn hand with the second order analysis.
+        Discards that go backwards are kept, just not analysed in depth."""
+
+        counts = tuple(counts)
+        table = Efficiency.discard_table(counts, visible, tile_set)
+        if not table:
+            return []
+
+        best_shanten = table[0]["shanten"]
+        ranked = []
+        for row in table:
+            if row["shanten"] == best_shanten:
+                after = list(counts)
+                after[row["discard"]] -= 1
+                row.update(Efficiency.improvement(after, visible, tile_set))
+            ranked.append(row)
+
+        def rank_key(row):
+            if row["shanten"] != best_shanten:
+                return (row["shanten"], 0, -row["ukeire"], 0)
+            # Tenpai: the wait itself first; otherwise what the next step looks like
+            primary = row["ukeire"] if best_shanten <= 0 else row["weighted_next"]
+            return (row["shanten"], -primary, -row["ukeire"], -row["weighted_improvement"])
+
+        ranked.sort(key=rank_key)
+        return ranked
+
+    @staticmethod
+    def analyse_entry(data):
+        """Second order analysis of one entry dict (data.json format)"""
+
+        hands = data.get('hands', '')
+        counts = Efficiency.to_counts(hands)
+        visible = Efficiency.to_counts(data.get('dora', ''))
+        tile_set = Efficiency.tile_set(data.get('players', ''))
+        total = sum(counts)
+
+        if total in [2, 5, 8, 11, 14]:
+            ranked = Efficiency.rank_discards(counts, visible, tile_set)
+            return {
+                "in_turn": True,
+                "discards": [
+                    {
+                        "tile": Efficiency.code_to_tile(row["discard"]),
+                        "shanten": row["shanten"],
+                        "ukeire": row["ukeire"],
+                        "weighted_next": row.get("weighted_next", 0),
+                        "improvement_count": row.get("improvement_count", 0),
+                    }
+                    for row in ranked
+                ],
+            }
+        elif total in [1, 4, 7, 10, 13]:
+            result = Efficiency.improvement(counts, visible, tile_set)
+            return {
+                "in_turn": False,
+                "shanten": result["shanten"],
+                "ukeire": result["ukeire"],
+                "weighted_next": result["weighted_next"],
+                "improvement_count": result["improvement_count"],
+            }
+        return None
+
+    @staticmethod
+    def analyse_bank(entries, workers=None, chunksize=16):
+        """Precompute analyse_entry for a whole {id: data} bank on a process pool"""
+
+        items = list(entries.items())
+        if not items:
+            return {}
+
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1 or len(items) < chunksize:
+            return {entry_id: Efficiency.analyse_entry(data) for entry_id, data in items}
+
+        results = {}
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for entry_id, result in pool.map(_analyse_item, items, chunksize=chunksize):
+                results[entry_id] = result
+        return results
+
+def _analyse_item(item):
+    """Pool worker (must live at module level to be picklable)"""
+
+    entry_id, data = item
+    try:
+        return entry_id, Efficiency.analyse_entry(data)
+    except Exception as e:
+        # print(f"Analyse failed: {entry_id} {e}")
+        return entry_id, None
+
+def main():
+    """Precompute the whole bank into saves/efficiency.json:
+    py -m src.utils.efficiency [workers]"""
+
+    import json
+    import sys
+    from src.utils.data_manager import DataManager
+
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    data_manager = DataManager()
+    results = Efficiency.analyse_bank(data_manager.load_all_data(), workers=workers)
+
+    output_file = os.path.join(os.path.dirname(data_manager.data_file), "efficiency.json")
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False)
+    print(f"Analysed {len(results)} entries -> {output_file}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import re
+from datetime import datetime
+
+# create_time as the app writes it ("2025-10-10T19:06:41" / "2025-10-10T19:06:41.402801"): the date is its first 10 characters
+PLAIN_ISO_TIME = re.compile(r'^\d{4}-\d{2}-\d{2}(T\d{2}:\d{2}:\d{2}(\.\d{1,6})?)?$')
+
+class FilterCompiler:
+    """EntryFilterDialog state -> one predicate(entry data) -> bool, shared by Library and Quiz.
+    Texts are lowered, value lists made sets and dates turned into strings once per filter, not once per entry"""
+
+    @staticmethod
+    def is_active(filter_state):
+        """If any condition of the state is set"""
+
+        state = filter_state
+        return any([
+            bool(state.get('text_contains', {}).get('text') and state.get('text_contains', {}).get('fields')),
+            bool(state.get('text_excludes', {}).get('text') and state.get('text_excludes', {}).get('fields')),
+            bool(state.get('source')),
+            bool(state.get('players')),
+            bool(state.get('image')),
+            bool(state.get('wind')),
+            bool(state.get('self_wind')),
+            bool(state.get('game')),
+            bool(state.get('shanten')),
+            bool(state.get('waits')),
+            (state.get('difficulty_min', 0) > 0 or state.get('difficulty_max', 100) < 100),
+            (state.get('accuracy_min', 0) > 0 or state.get('accuracy_max', 100) < 100),
+            state.get('start_date') is not None,
+            state.get('end_date') is not None
+        ])
+
+    @staticmethod
+    def compile(filter_state, analysis_store=None, text_index=None):
+        """Predicate of a filter state. analysis_store: for shanten; text_index: for the text
+        conditions (a plain substring scan without it)"""
+
+        state = filter_state
+        checks = []
+
+        # Include / exclude text
+        contains = state.get('text_contains') or {}
+        if contains.get('text') and contains.get('fields'):
+            matches = FilterCompiler.text_check(contains['text'], contains['fields'], text_index)
+            checks.append(matches)
+        excludes = state.get('text_excludes') or {}
+        if excludes.get('text') and excludes.get('fields'):
+            matches = FilterCompiler.text_check(excludes['text'], excludes['fields'], text_index)
+            checks.append(lambda entry, matches=matches: not matches(entry))
+
+        # Values that must be one of a list
+        for key in ['source', 'players', 'wind', 'self_wind']:
+            values = frozenset(state.get(key) or [])
+            if values:
+                checks.append(lambda entry, key=key, values=values: entry.get(key, '') in values)
+        games = frozenset(state.get('game') or [])
+        if games:
+            checks.append(lambda entry: str(entry.get('game', '')) in games)
+
+        # Image
+        if state.get('image'):
+            want_image = 'common.have' in state['image']
+            want_no_image = 'common.noHave' in state['image']
+            checks.append(lambda entry: want_image if entry.get('image_filename') else want_no_image)
+
+        # Shanten and wait shapes (precomputed columns)
+        if state.get('shanten') and analysis_store is not None:
+            buckets = list(state['shanten'])
+            checks.append(lambda entry: analysis_store.matches_shanten(entry.get('id', ''), buckets))
+        if state.get('waits') and analysis_store is not None:
+            shapes = frozenset(state['waits'])
+            checks.append(lambda entry: analysis_store.matches_waits(entry.get('id', ''), shapes))
+
+        # Difficulty (negative never matches, 0 does)
+        difficulty_min, difficulty_max = state.get('difficulty_min', 0), state.get('difficulty_max', 100)
+        if difficulty_min > 0 or difficulty_max < 100:
+            def difficulty_check(entry):
+                difficulty = int(entry.get('difficulty', 0))
+                return difficulty >= 0 and difficulty_min <= difficulty <= difficulty_max
+            checks.append(difficulty_check)
+
+        # Accuracy (N/A never matches), few distinct strings so each is parsed once
+        accuracy_min, accuracy_max = state.get('accuracy_min', 0), state.get('accuracy_max', 100)
+        if accuracy_min > 0 or accuracy_max < 100:
+            parsed = {}
+            def accuracy_check(entry):
+                accuracy_str = entry.get('accuracy', 'N/A %')
+                if accuracy_str not in parsed:
+                    parsed[accuracy_str] = FilterCompiler.parse_accuracy(accuracy_str)
+                value = parsed[accuracy_str]
+                return value is not None and accuracy_min <= value <= accuracy_max
+            checks.append(accuracy_check)
+
+        # Date: ISO dates compare as strings
+        if state.get('start_date') or state.get('end_date'):
+            start = FilterCompiler.date_string(state.get('start_date'))
+            end = FilterCompiler.date_string(state.get('end_date'))
+            def date_check(entry):
+                day = FilterCompiler.entry_day(entry.get('create_time', ''))
+                if day is None:
+                    return False
+                return (start is None or day >= start) and (end is None or day <= end)
+            checks.append(date_check)
+
+        # Nothing set: everything matches (NOT included)
+        if not checks:
+            return lambda entry: True
+
+        combine = any if state.get('logic_mode', 'OR') == 'OR' else all
+        negate = bool(state.get('negate'))
+        if len(checks) == 1:
+            check = checks[0]
+            return (lambda entry: not check(entry)) if negate else check
+        if negate:
+            return lambda entry: not combine(check(entry) for check in checks)
+        return lambda entry: combine(check(entry) for check in checks)
+
+    # --- Parts --- #
+
+    @staticmethod
+    def text_check(text, fields, text_index=None):
+        """Predicate: text (case ignored) in any of the fields"""
+
+        fields = list(fields)
+        if text_index is not None:
+            # The index memoises the ids per text, this is one set lookup
+            return lambda entry: entry.get('id', '') in text_index.matches(text, fields)
+        search_text = text.lower()
+        return lambda entry: any(search_text in str(entry.get(field, '')).lower() for field in fields)
+
+    @staticmethod
+    def parse_accuracy(accuracy_str):
+        """"66.7%" -> 66.7, None for N/A or anything else"""
+
+        if accuracy_str == 'N/A %' or not accuracy_str:
+            return None
+        try:
+            if str(accuracy_str).endswith('%'):
+                return float(str(accuracy_str)[:-1])
+            return float(accuracy_str)
+        except (ValueError, TypeError):
+            return None
+
+    @staticmethod
+    def date_string(value):
+        """"YYYY-MM-DD" of a filter date (datetime or date), None when not set"""
+
+        if not value:
+            return None
+        if hasattr(value, 'date'):
+            value = value.date()
+        return value.isoformat()
+
+    @staticmethod
+    def entry_day(create_time):
+        """"YYYY-MM-DD" of a create_time, None when it is not a date"""
+
+        if not create_time:
+            return None
+        if PLAIN_ISO_TIME.match(create_time):
+            return create_time[:10]
+        try:
+            return datetime.fromisoformat(create_time.replace('Z', '+00:00')).date().isoformat()
+        except (ValueError, AttributeError):
+            return None
@@ -0,0 +1,291 @@
+from datetime import datetime, timedelta
+import random
+import time
+
+from src.utils.efficiency import Efficiency, _shanten, COUNTS_SIZE, SUIT_STARTS
+
+HONOR_CODES = list(range(31, 38))
+WINDS = ["info.east", "info.south", "info.west", "info.north"]
+
+# A regular in turn hand is 4 blocks and a pair, 14 tiles can be at most 6 shanten (chiitoi)
+MAX_SHANTEN = 6
+MAX_WALK = 40
+MAX_TRIES = 2000
+
+# Lowest and highest shanten a 14 tile hand can have, by number of suits and then by honor count (0-14).
+# Found by an exhaustive search over every suit and honor pattern. None: no hand fits at all
+SHANTEN_RANGES = {
+    "players.four": {
+        None: [(-1, 4), (0, 5), (-1, 5), (-1, 6), (-1, 6), (-1, 6), (-1, 6), (-1, 6), (-1, 5), (-1, 5), (-1, 5), (-1, 4), (-1, 4), (0, 4), (-1, 3)],
+        1: [(-1, 1), (0, 2), (-1, 2), (-1, 3), (-1, 3), (-1, 4), (-1, 4), (0, 5), (-1, 4), (-1, 4), (-1, 5), (-1, 4), (-1, 4), (0, 4), None],
+        2: [(-1, 3), (0, 3), (-1, 4), (-1, 4), (-1, 5), (-1, 5), (-1, 6), (0, 6), (-1, 5), (-1, 5), (-1, 5), (0, 4), (0, 4), None, None],
+        3: [(-1, 4), (0, 5), (-1, 5), (-1, 6), (-1, 6), (-1, 6), (-1, 6), (-1, 6), (-1, 5), (0, 5), (0, 5), (1, 4), None, None, None],
+    },
+    "players.three": {
+        None: [(-1, 4), (0, 4), (-1, 5), (-1, 5), (-1, 6), (-1, 6), (-1, 6), (0, 5), (-1, 5), (-1, 5), (-1, 4), (-1, 4), (-1, 4), (0, 3), (-1, 2)],
+        1: [(-1, 1), (0, 2), (-1, 2), (-1, 3), (-1, 3), (-1, 4), (-1, 4), (0, 4), (-1, 4), (-1, 4), (-1, 4), (-1, 4), (-1, 4), (0, 3), None],
+        2: [(-1, 3), (0, 3), (-1, 4), (-1, 4), (-1, 5), (-1, 5), (-1, 6), (0, 5), (-1, 5), (-1, 5), (-1, 4), (0, 4), (0, 4), None, None],
+        3: [(-1, 4), (0, 4), (-1, 5), (-1, 5), (-1, 6), (-1, 6), (-1, 6), (0, 5), (-1, 5), (0, 5), (0, 4), (1, 4), None, None, None],
+    },
+}
+
+# --- Generator --- #
+
+class Generator:
+    def __init__(self, seed=None, players="players.four"):
+        """Same seed, same players and same calls give the same hands"""
+
+        self.rng = random.Random(seed)
+        self.players = players
+        self.tile_set = Efficiency.tile_set(players)
+        self.honor_codes = [code for code in HONOR_CODES if code in self.tile_set.codes and code != self.tile_set.nuki]
+
+    # --- Hands --- #
+
+    def shanten_range(self, suits=None, honors=None):
+        """(lowest, highest) shanten of the hands these constraints allow, None when no hand fits them"""
+
+        row = SHANTEN_RANGES["players.three" if self.players == "players.three" else "players.four"][suits]
+        ranges = [reach for reach in (row if honors is None else [row[honors]]) if reach]
+        if not ranges:
+            return None
+        return min(low for low, _ in ranges), max(high for _, high in ranges)
+
+    def _pick_suits(self, suits):
+        """Suit starts the number tiles may come from (all of them when suits is None)"""
+
+        if suits is None:
+            return list(SUIT_STARTS)
+        return self.rng.sample(SUIT_STARTS, suits)
+
+    def _add_block(self, counts, kind, codes):
+        """Put one random koutsu/shuntsu/pair made of codes into counts, False if it does not fit"""
+
+        code = self.rng.choice(codes)
+        if kind == "shuntsu":
+            # Shuntsu only where the whole run exists (not in the sanma manzu, not through honors)
+            if code > 30 or code % 10 > 7 or code + 1 not in codes or code + 2 not in codes:
+                return False
+            if any(counts[code + i] >= 4 for i in range(3)):
+                return False
+            for i in range(3):
+                counts[code + i] += 1
+            return True
+        size = 3 if kind == "koutsu" else 2
+        if counts[code] + size > 4:
+            return False
+        counts[code] += size
+        return True
+
+    def _complete_hand(self, number_codes, honors):
+        """Random agari shape (4 blocks + pair) with as many honors as fit under the honor count.
+        Returns: (counts, honor tiles still missing)"""
+
+        if honors is None:
+            honor_blocks = self.rng.choice([0, 0, 0, 1, 1, 2])
+            honor_pair = self.rng.random() < 0.25
+        else:
+            honor_blocks = min(4, honors // 3)
+            honor_pair = honors - honor_blocks * 3 >= 2
+        if not number_codes:
+            honor_blocks, honor_pair = 4, True
+
+        counts = [0] * COUNTS_SIZE
+        kinds = [("koutsu", True)] * honor_blocks + [(None, False)] * (4 - honor_blocks) + [("pair", honor_pair)]
+        for kind, is_honor in kinds:
+            codes = self.honor_codes if is_honor else number_codes
+            for _ in range(20):
+                block = kind or self.rng.choice(["shuntsu", "shuntsu", "shuntsu", "koutsu"])
+                if self._add_block(counts, block, codes):
+                    break
+            else:
+                return None, 0
+
+        placed = sum(counts[code] for code in self.honor_codes)
+        return counts, (honors - placed if honors is not None else 0)
+
+    def _replace(self, counts, codes_from, codes_to, loose=False):
+        """Swap one random tile of codes_from for a different random tile of codes_to.
+        Returns: (old, new), None if nothing fits
+        loose: only take tiles that touch nothing in hand (raises the shanten far more often)"""
+
+        held = [code for code in codes_from for _ in range(counts[code])]
+        room = [code for code in codes_to if counts[code] < 4]
+        if loose:
+            room = [code for code in room if not any(
+                counts[near] for near in ([code] if code > 30 else range(code - 2, code + 3))
+                if near // 10 == code // 10)] or room
+        if not held or not room:
+            return None
+        old = self.rng.choice(held)
+        new = self.rng.choice(room)
+        if new == old:
+            return None
+        counts[old] -= 1
+        counts[new] += 1
+        return old, new
+
+    def hand(self, shanten, suits=None, honors=None):
+        """Count list of one in turn hand at exactly this shanten.
+        Built directly: start from an agari shape and swap single tiles (each swap moves the shanten
+        by at most one, so the walk cannot jump over the target), restarting the rare failed walks.
+        suits: how many number suits the hand uses, honors: exact number of honor tiles"""
+
+        if not -1 <= shanten <= MAX_SHANTEN:
+            raise ValueError(f"Shanten must be -1 to {MAX_SHANTEN}")
+        if suits is not None and not 1 <= suits <= len(SUIT_STARTS):
+            raise ValueError(f"Suits must be 1 to {len(SUIT_STARTS)}")
+        if honors is not None and not 0 <= honors <= 14:
+            raise ValueError("Honors must be 0 to 14")
+
+        # Impossible targets are turned down here, sampling for them would only run out of tries
+        reach = self.shanten_range(suits, honors)
+        if reach is None:
+            raise ValueError(f"No hand has {suits} suits and {honors} honors")
+        if not reach[0] <= shanten <= reach[1]:
+            raise ValueError(f"Shanten must be {reach[0]} to {reach[1]} with these suits and honors")
+
+        for _ in range(MAX_TRIES):
+            starts = self._pick_suits(suits)
+            number_codes = [code for code in self.tile_set.codes if code < 30 and code // 10 * 10 + 1 in starts]
+            if honors == 14:
+                number_codes = []
+            counts, missing = self._complete_hand(number_codes, honors)
+            if counts is None:
+                continue
+
+            # Bring the honor count to the exact target first, then walk with tiles of the same kind
+            if not all(self._replace(counts, number_codes, self.honor_codes) for _ in range(missing)):
+                continue
+
+            current = _shanten(tuple(counts))
+            for _ in range(MAX_WALK):
+                if current == shanten:
+                    break
+                loose = current < shanten
+                if number_codes and (honors == 0 or self.rng.random() < 0.8):
+                    moved = self._replace(counts, number_codes, number_codes, loose)
+                else:
+                    moved = self._replace(counts, self.honor_codes, self.honor_codes, loose)
+                if not moved:
+                    continue
+                # Keep swaps that move towards the target or stay level, undo the others
+                after = _shanten(tuple(counts))
+                if abs(after - shanten) > abs(current - shanten):
+                    counts[moved[0]] += 1
+                    counts[moved[1]] -= 1
+                else:
+                    current = after
+
+            if current != shanten:
+                continue
+            # Every picked suit has to show up, otherwise it is a hand of fewer suits
+            if suits is not None and any(not any(counts[start:start + 9]) for start in starts):
+                continue
+            return counts
+
+        raise ValueError("No hand found for these constraints")
+
+    @staticmethod
+    def hand_text(counts, drawn):
+        """Tiles as "123m456p789s11z" with the drawn tile taken out and put last"""
+
+        counts = list(counts)
+        counts[drawn] -= 1
+        text = ""
+        for suit, start in zip("mpsz", [1, 11, 21, 31]):
+            ranks = "".join(str(code % 10) * counts[code] for code in range(start, min(start + 9, COUNTS_SIZE)))
+            if ranks:
+                text += ranks + suit
+        return text + Efficiency.code_to_tile(drawn)
+
+    # --- Entries --- #
+
+    def context(self, counts):
+        """Random round info and a dora indicator that is still in the wall"""
+
+        winds = [wind for wind in WINDS if self.players != "players.three" or wind != "info.north"]
+        left = Efficiency.remaining(counts, None, self.tile_set)
+        indicator = self.rng.choice([code for code in self.tile_set.codes for _ in range(left[code])])
+        return {
+            'wind': self.rng.choice(winds[:2]),
+            'self_wind': self.rng.choice(winds),
+            'game': str(self.rng.randint(1, 3 if self.players == "players.three" else 4)),
+            'honba': str(self.rng.choice([0, 0, 0, 1, 1, 2])),
+            'turn': str(self.rng.randint(1, 12)),
+            'dora': Efficiency.code_to_tile(indicator),
+        }
+
+    def entry(self, shanten, suits=None, honors=None, title="", create_time=None):
+        """One full entry, answered with the best discard of the efficiency table"""
+
+        counts = self.hand(shanten, suits, honors)
+        held = [code for code in self.tile_set.codes for _ in range(counts[code])]
+        drawn = self.rng.choice(held)
+        context = self.context(counts)
+
+        # Only the best discards are needed, not the whole table
+        _, ukeire, codes = Efficiency.best_discards(counts, Efficiency.to_counts(context['dora']), self.tile_set)
+        best_tiles = [Efficiency.code_to_tile(code) for code in codes]
+
+        data = {
+            'create_time': (create_time or datetime.now()).isoformat(timespec='seconds'), 'title': title,
+            'encounter': 0, 'correct': 0, 'accuracy': "N/A %",
+            'source': "source.exercises", 'players': self.players, 'difficulty': 0,
+            'dora': context.pop('dora'), 'hands': Generator.hand_text(counts, drawn),
+            'answer_action': "answer.discard", 'answer_input': best_tiles[0],
+            'intro': "/", 'notes': f"{' '.join(best_tiles)} ({ukeire})",
+        }
+        data.update(context)
+        return data
+
+    def entries(self, count, shanten, suits=None, honors=None, title="Random"):
+        """A list of entries, titled "<title> <n>/<count>" one second apart (so they sort in order)"""
+
+        base_time = datetime.now().replace(microsecond=0)
+        width = len(str(count))
+        return [
+            self.entry(shanten, suits, honors,
+                       title=f"{title} {str(i + 1).zfill(width)}/{count}",
+                       create_time=base_time + timedelta(seconds=i))
+            for i in range(count)
+        ]
+
+def main():
+    """Generate problems: py -m src.utils.generator <count> <shanten> [seed] [--suits=N] [--honors=N] [--three] [--save]
+    Without --save the hands are only printed"""
+
+    import sys
+    from src.utils.data_manager import DataManager
+
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    if len(args) < 2:
+        print(main.__doc__)
+        sys.exit(1)
+    options = dict(arg[2:].split("=", 1) for arg in sys.argv[1:] if arg.startswith("--") and "=" in arg)
+
+    count, shanten = int(args[0]), int(args[1])
+    seed = int(args[2]) if len(args) > 2 else None
+    suits = int(options["suits"]) if "suits" in options else None
+    honors = int(options["honors"]) if "honors" in options else None
+    players = "players.three" if "--three" in sys.argv else "players.four"
+
+    start = time.perf_counter()
+    try:
+        entries = Generator(seed, players).entries(count, shanten, suits, honors)
+    except ValueError as e:
+        # Out of range or impossible constraints (shanten 2 in one suit without honors)
+        print(f"Cannot generate: {e}")
+        sys.exit(1)
+    seconds = time.perf_counter() - start
+
+    if "--save" in sys.argv:
+        ids = DataManager().save_entries(entries)
+        print(f"Saved {len(ids)} entries in {seconds:.2f}s")
+        return
+    for data in entries:
+        print(f"{data['hands']}  dora {data['dora']}  -> {data['answer_input']}  {data['notes']}")
+    print(f"{count} hands in {seconds:.2f}s")
+
+if __name__ == "__main__":
+    main()
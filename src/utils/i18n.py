@@ -282,7 +282,36 @@ class Dict(QObject):
 				"quiz.notes": "讲解",
 				"quiz.no_questions": "没有符合筛选条件的何切，无法生成题目序列！",
 				"quiz.finish": "全部何切已完成！\n共作答 {} 道何切、答对 {} 道；\n正确率为 {}%。",
-				"quiz.finish_title": "何切完成"
+				"quiz.finish_title": "何切完成",
+				"quiz.waits": "听牌：{}（{}），余 {} 枚",
+				"common.comma": "、",
+				"wait.ryanmen": "两面",
+				"wait.kanchan": "嵌张",
+				"wait.penchan": "边张",
+				"wait.shanpon": "双碰",
+				"wait.tanki": "单骑",
+				"wait.nobetan": "延单",
+				"wait.kokushi": "国士单骑",
+				"wait.kokushi13": "国士十三面",
+				"filter.shanten": "向听数",
+				"shanten.agari": "和了",
+				"shanten.tenpai": "听牌",
+				"shanten.one": "一向听",
+				"shanten.two": "两向听",
+				"shanten.more": "三向听以上",
+				"filter.waits": "听牌形",
+				"library.shanten_asc": "向听数升序",
+				"library.shanten_desc": "向听数降序",
+				"library.ukeire_asc": "答案进张升序",
+				"library.ukeire_desc": "答案进张降序",
+				"msg.warn.duplicate.exact": "题库中已有完全相同的题目：\n{}\n\n仍要保存吗？",
+				"msg.warn.duplicate.isomorphic": "题库中已有换花色（同构）后相同的题目：\n{}\n\n仍要保存吗？",
+				"settings.variants": "变体题目（换花色/镜像）",
+				"upload.detect": "识别牌面",
+				"msg.warn.detect": "没能从图片中识别出手牌！",
+				"msg.warn.similarImage": "题库中已有看起来相同的图片：\n{}\n\n仍要保存吗？",
+				"library.import_similar_message": "{} 个导入条目的图片与题库中已有的图片相似。",
+				"library.page_all": "全部"
 			},
 
 			"zh_Hant": {
@@ -557,7 +586,36 @@ class Dict(QObject):
 				"quiz.notes": "講解",
 				"quiz.no_questions": "沒有符合篩選條件的何切，無法生成題目序列！",
 				"quiz.finish": "全部何切已完成！\n共作答 {} 道何切、答對 {} 道；\n正確率為 {}%。",
-				"quiz.finish_title": "何切完成"
+				"quiz.finish_title": "何切完成",
+				"quiz.waits": "聽牌：{}（{}），餘 {} 枚",
+				"common.comma": "、",
+				"wait.ryanmen": "兩面",
+				"wait.kanchan": "嵌張",
+				"wait.penchan": "邊張",
+				"wait.shanpon": "雙碰",
+				"wait.tanki": "單騎",
+				"wait.nobetan": "延單",
+				"wait.kokushi": "國士單騎",
+				"wait.kokushi13": "國士十三面",
+				"filter.shanten": "向聽數",
+				"shanten.agari": "和了",
+				"shanten.tenpai": "聽牌",
+				"shanten.one": "一向聽",
+				"shanten.two": "兩向聽",
+				"shanten.more": "三向聽以上",
+				"filter.waits": "聽牌形",
+				"library.shanten_asc": "向聽數升序",
+				"library.shanten_desc": "向聽數降序",
+				"library.ukeire_asc": "答案進張升序",
+				"library.ukeire_desc": "答案進張降序",
+				"msg.warn.duplicate.exact": "題庫中已有完全相同的題目：\n{}\n\n仍要儲存嗎？",
+				"msg.warn.duplicate.isomorphic": "題庫中已有換花色（同構）後相同的題目：\n{}\n\n仍要儲存嗎？",
+				"settings.variants": "變體題目（換花色/鏡像）",
+				"upload.detect": "辨識牌面",
+				"msg.warn.detect": "未能從圖片中辨識出手牌！",
+				"msg.warn.similarImage": "題庫中已有看起來相同的圖片：\n{}\n\n仍要儲存嗎？",
+				"library.import_similar_message": "{} 個匯入條目的圖片與題庫中已有的圖片相似。",
+				"library.page_all": "全部"
 			},
 
 			"jp": {
@@ -832,7 +890,36 @@ class Dict(QObject):
 				"quiz.notes": "解説",
 				"quiz.no_questions": "フィルター条件に合う何切がありません。問題シーケンスを生成できません！",
 				"quiz.finish": "全ての何切が完了しました！\n合計 {} 問解答、正解 {} 問、\n正答率は {}% です。",
-				"quiz.finish_title": "何切完了"
+				"quiz.finish_title": "何切完了",
+				"quiz.waits": "待ち：{}（{}）、残り {} 枚",
+				"common.comma": "・",
+				"wait.ryanmen": "両面",
+				"wait.kanchan": "嵌張",
+				"wait.penchan": "辺張",
+				"wait.shanpon": "シャンポン",
+				"wait.tanki": "単騎",
+				"wait.nobetan": "延べ単",
+				"wait.kokushi": "国士単騎",
+				"wait.kokushi13": "国士十三面",
+				"filter.shanten": "シャンテン数",
+				"shanten.agari": "和了",
+				"shanten.tenpai": "聴牌",
+				"shanten.one": "一向聴",
+				"shanten.two": "二向聴",
+				"shanten.more": "三向聴以上",
+				"filter.waits": "待ちの形",
+				"library.shanten_asc": "シャンテン数昇順",
+				"library.shanten_desc": "シャンテン数降順",
+				"library.ukeire_asc": "正解の受け入れ昇順",
+				"library.ukeire_desc": "正解の受け入れ降順",
+				"msg.warn.duplicate.exact": "全く同じ問題が既に登録されています：\n{}\n\nそれでも保存しますか？",
+				"msg.warn.duplicate.isomorphic": "色を入れ替えると同じになる問題が既に登録されています：\n{}\n\nそれでも保存しますか？",
+				"settings.variants": "バリエーション（色替え・反転）",
+				"upload.detect": "牌を認識",
+				"msg.warn.detect": "画像から手牌を認識できませんでした！",
+				"msg.warn.similarImage": "よく似た画像の問題が既に登録されています：\n{}\n\nそれでも保存しますか？",
+				"library.import_similar_message": "{} 個のインポート項目の画像が、既存の画像とよく似ています。",
+				"library.page_all": "すべて"
 			},
 
 			"en": {
@@ -1107,7 +1194,36 @@ class Dict(QObject):
 				"quiz.notes": "Explanation",
 				"quiz.no_questions": "No quizzes match the filter conditions. Cannot generate question sequence!",
 				"quiz.finish": "All quizzes completed!\nTotal {} questions attempted, {} correct;\naccuracy rate is {}%.",
-				"quiz.finish_title": "Quiz Completed"
+				"quiz.finish_title": "Quiz Completed",
+				"quiz.waits": "Waits: {} ({}), {} left",
+				"common.comma": ", ",
+				"wait.ryanmen": "Ryanmen",
+				"wait.kanchan": "Kanchan",
+				"wait.penchan": "Penchan",
+				"wait.shanpon": "Shanpon",
+				"wait.tanki": "Tanki",
+				"wait.nobetan": "Nobetan",
+				"wait.kokushi": "Kokushi",
+				"wait.kokushi13": "13-sided kokushi",
+				"filter.shanten": "Shanten",
+				"shanten.agari": "Agari",
+				"shanten.tenpai": "Tenpai",
+				"shanten.one": "1-Shanten",
+				"shanten.two": "2-Shanten",
+				"shanten.more": "3+ Shanten",
+				"filter.waits": "Wait shape",
+				"library.shanten_asc": "Shanten Asc",
+				"library.shanten_desc": "Shanten Desc",
+				"library.ukeire_asc": "Answer Ukeire Asc",
+				"library.ukeire_desc": "Answer Ukeire Desc",
+				"msg.warn.duplicate.exact": "The same problem is already in the bank:\n{}\n\nSave anyway?",
+				"msg.warn.duplicate.isomorphic": "The same problem with suits swapped is already in the bank:\n{}\n\nSave anyway?",
+				"settings.variants": "Variants (Suit Swap/Mirror)",
+				"upload.detect": "Detect Tiles",
+				"msg.warn.detect": "No hand could be found in the image!",
+				"msg.warn.similarImage": "A problem with a near-identical image is already in the bank:\n{}\n\nSave anyway?",
+				"library.import_similar_message": "{} imported items have images similar to ones already in the bank.",
+				"library.page_all": "All"
 			}
 		}
 
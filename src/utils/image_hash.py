@@ -0,0 +1,398 @@
+import base64
+import json
+import math
+import os
+
+from src.utils.path_finder import get_saves_path
+
+# pHash: DCT of a 32 x 32 grey image, the 8 x 8 lowest frequencies against their median (DC left out of it)
+PHASH_SIZE = 32
+PHASH_LOW = 8
+# dHash: 9 x 8 grey image, one bit per pair of neighbours
+DHASH_W, DHASH_H = 9, 8
+# Detail: 64 x 64 grey image with a 3 x 3 blur, fine enough to see one tile of a hand.
+# Compared in standard deviations of each image's grey (so brightness and contrast do not count),
+# by the largest difference of any pixel: recompression and resizing move every pixel a little,
+# another tile moves a few pixels a lot
+DETAIL_SIZE = 64
+# Means of 4 x 4 blocks of it: a block mean never differs more than its pixels, so they can only
+# turn a pair away early (most pairs of one layout differ somewhere by more than a whole block does)
+DETAIL_BLOCK = 4
+
+# Near duplicates: pHash and dHash only pick the candidates (screenshots of one client share their
+# layout, which is all the 64-bit hashes see), the detail decides
+MAX_PHASH_DISTANCE = 10
+MAX_DHASH_DISTANCE = 10
+MAX_DETAIL_DIFFERENCE = 0.14
+
+# Re-captures --check tries on every image: (JPEG quality, scale)
+RECAPTURES = [(85, 1.0), (75, 1.0), (60, 1.0), (85, 0.5), (75, 0.66), (70, 0.75), (75, 1.5)]
+
+# Bump when a hash is computed differently, every image is then hashed again once
+HASH_VERSION = 3
+
+# --- Hashes --- #
+
+def hamming(a, b):
+    """Number of differing bits of two hashes"""
+
+    return bin(a ^ b).count("1")
+
+def _dct_matrix(n):
+    """Rows of the DCT-II basis, only the first PHASH_LOW are ever needed"""
+
+    return [[math.cos(math.pi * (2 * x + 1) * u / (2 * n)) for x in range(n)] for u in range(PHASH_LOW)]
+
+DCT = _dct_matrix(PHASH_SIZE)
+
+class ImageHash:
+    @staticmethod
+    def load_gray(image, width, height):
+        """Grey values (rows of ints) of an image scaled to width x height, None if it cannot be read.
+        image: a file path or a QImage"""
+
+        from PyQt5.QtCore import Qt
+        from PyQt5.QtGui import QImage
+
+        if not isinstance(image, QImage):
+            image = QImage(image)
+        if image.isNull():
+            return None
+        if image.hasAlphaChannel():
+            # Flattened on black, as saving it to a JPEG does
+            image = image.convertToFormat(QImage.Format_RGB32)
+        image = image.scaled(width, height, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        image = image.convertToFormat(QImage.Format_Grayscale8)
+        rows = []
+        for y in range(height):
+            line = image.constScanLine(y)
+            line.setsize(width)
+            rows.append(list(bytes(line)))
+        return rows
+
+    @staticmethod
+    def dhash(rows):
+        """64-bit difference hash of 9 x 8 grey rows: is each pixel brighter than its right neighbour"""
+
+        value = 0
+        for row in rows:
+            for x in range(DHASH_W - 1):
+                value = (value << 1) | (row[x] > row[x + 1])
+        return value
+
+    @staticmethod
+    def phash(rows):
+        """64-bit perceptual hash of 32 x 32 grey rows"""
+
+        # Separable DCT, only the low frequencies: columns of every row first, then down the columns
+        partial = [[sum(basis[x] * row[x] for x in range(PHASH_SIZE)) for basis in DCT] for row in rows]
+        low = [[sum(basis[y] * partial[y][u] for y in range(PHASH_SIZE)) for u in range(PHASH_LOW)] for basis in DCT]
+
+        values = [low[v][u] for v in range(PHASH_LOW) for u in range(PHASH_LOW)][1:]
+        median = sorted(values)[len(values) // 2]
+        value = 0
+        for coefficient in [low[0][0]] + values:
+            value = (value << 1) | (coefficient > median)
+        return value
+
+    @staticmethod
+    def hashes(image):
+        """(phash, dhash, detail bytes) of a file path or QImage, None if it cannot be read"""
+
+        big = ImageHash.load_gray(image, PHASH_SIZE, PHASH_SIZE)
+        small = ImageHash.load_gray(image, DHASH_W, DHASH_H)
+        detail = ImageHash.load_gray(image, DETAIL_SIZE, DETAIL_SIZE)
+        if big is None or small is None or detail is None:
+            return None
+        return ImageHash.phash(big), ImageHash.dhash(small), ImageHash.detail(detail)
+
+    @staticmethod
+    def detail(rows):
+        """Grey rows after a 3 x 3 box blur (edges repeated), as bytes row after row"""
+
+        h, w = len(rows), len(rows[0])
+        values = []
+        for y in range(h):
+            near_rows = [rows[max(0, min(h - 1, y + dy))] for dy in (-1, 0, 1)]
+            for x in range(w):
+                xs = (max(0, x - 1), x, min(w - 1, x + 1))
+                values.append(round(sum(row[nx] for row in near_rows for nx in xs) / 9))
+        return bytes(values)
+
+    @staticmethod
+    def normalise(detail):
+        """Detail bytes in standard deviations from their mean"""
+
+        mean = sum(detail) / len(detail)
+        std = math.sqrt(sum((value - mean) ** 2 for value in detail) / len(detail)) or 1.0
+        return [(value - mean) / std for value in detail]
+
+    @staticmethod
+    def block_means(values):
+        """Means of the DETAIL_BLOCK x DETAIL_BLOCK blocks of normalised detail values"""
+
+        size = DETAIL_SIZE // DETAIL_BLOCK
+        sums = [0.0] * (size * size)
+        for i, value in enumerate(values):
+            y, x = divmod(i, DETAIL_SIZE)
+            sums[(y // DETAIL_BLOCK) * size + x // DETAIL_BLOCK] += value
+        return [total / (DETAIL_BLOCK * DETAIL_BLOCK) for total in sums]
+
+    @staticmethod
+    def comparable(hashes):
+        """(phash, dhash, detail bytes) -> (phash, dhash, normalised detail, its block means), for is_near"""
+
+        values = ImageHash.normalise(hashes[2])
+        return hashes[0], hashes[1], values, ImageHash.block_means(values)
+
+    @staticmethod
+    def is_near(hashes, other):
+        """If two comparable hashes are near duplicates"""
+
+        if hamming(hashes[0], other[0]) > MAX_PHASH_DISTANCE or hamming(hashes[1], other[1]) > MAX_DHASH_DISTANCE:
+            return False
+        if any(abs(a - b) > MAX_DETAIL_DIFFERENCE for a, b in zip(hashes[3], other[3])):
+            return False
+        return all(abs(a - b) <= MAX_DETAIL_DIFFERENCE for a, b in zip(hashes[2], other[2]))
+
+    @staticmethod
+    def recapture(image, quality, scale):
+        """QImage saved again as a JPEG of some quality, scaled first (as a re-captured screenshot)"""
+
+        from PyQt5.QtCore import Qt, QBuffer, QByteArray, QIODevice
+        from PyQt5.QtGui import QImage
+
+        if scale != 1:
+            image = image.scaled(round(image.width() * scale), round(image.height() * scale),
+                                 Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.WriteOnly)
+        image.save(buffer, "JPG", quality)
+        buffer.close()
+        result = QImage()
+        result.loadFromData(data)
+        return result
+
+    @staticmethod
+    def check_folder(folder):
+        """Every image of a folder must match its own re-captures and no other image of the folder
+        (put screenshots of different hands in one layout there). Returns: (missed, confused),
+        missed: [(file, quality, scale)], confused: [(file, file)]"""
+
+        from PyQt5.QtGui import QImage
+
+        images = {}
+        for name in sorted(os.listdir(folder)):
+            image = QImage(os.path.join(folder, name))
+            if not image.isNull():
+                images[name] = image
+
+        index = ImageHashIndex(store_file=os.devnull)
+        for name, image in images.items():
+            index.add(name, ImageHash.hashes(image))
+
+        missed = []
+        confused = []
+        for name, image in images.items():
+            for quality, scale in RECAPTURES:
+                if name not in index.find(ImageHash.hashes(ImageHash.recapture(image, quality, scale))):
+                    missed.append((name, quality, scale))
+            confused.extend((name, other) for other in index.find_near(index.hashes[name], exclude_id=name)
+                            if name < other)
+        return missed, confused
+
+# --- BK-tree --- #
+
+class BKTree:
+    def __init__(self, distance=hamming):
+        """Metric tree: a node's children are keyed by their distance to it, so a lookup within d
+        only walks the children whose key is within d of the distance to the node"""
+
+        self.distance = distance
+        self.root = None
+        self.size = 0
+
+    def add(self, key, item):
+
+        self.size += 1
+        if self.root is None:
+            self.root = [key, [item], {}]
+            return
+        node = self.root
+        while True:
+            d = self.distance(key, node[0])
+            if d == 0:
+                node[1].append(item)
+                return
+            if d not in node[2]:
+                node[2][d] = [key, [item], {}]
+                return
+            node = node[2][d]
+
+    def find(self, key, max_distance):
+        """Items within max_distance of key: [(distance, item)], closest first"""
+
+        found = []
+        nodes = [self.root] if self.root is not None else []
+        while nodes:
+            node = nodes.pop()
+            d = self.distance(key, node[0])
+            if d <= max_distance:
+                found.extend((d, item) for item in node[1])
+            for child_d, child in node[2].items():
+                if d - max_distance <= child_d <= d + max_distance:
+                    nodes.append(child)
+        found.sort(key=lambda pair: pair[0])
+        return found
+
+# --- Index --- #
+
+class ImageHashIndex:
+    def __init__(self, store_file=None):
+        """Set hash store file (beside data.json), the store itself is loaded on first use"""
+
+        self.store_file = store_file or get_saves_path("image_hashes.json")
+        self._records = None
+        self.tree = BKTree()
+        self.hashes = {}
+        self.titles = {}
+
+    @staticmethod
+    def fingerprint(image_path):
+        """Size and time of an image file, it is hashed again when either changes"""
+
+        stat = os.stat(image_path)
+        return f"{HASH_VERSION}:{stat.st_size}:{int(stat.st_mtime)}"
+
+    def load(self):
+
+        if self._records is None:
+            try:
+                with open(self.store_file, 'r', encoding='utf-8') as f:
+                    self._records = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._records = {}
+        return self._records
+
+    def save(self):
+
+        try:
+            os.makedirs(os.path.dirname(self.store_file), exist_ok=True)
+            with open(self.store_file, 'w', encoding='utf-8') as f:
+                json.dump(self._records, f, ensure_ascii=False, separators=(',', ':'))
+            return True
+        except Exception as e:
+            # print(f"Save image hashes wrong: {e}")
+            return False
+
+    def build(self, entries, images_dir):
+        """Index the images of an {id: data} bank. Only new or changed images are hashed,
+        the others come from the store file. Returns: number of images hashed"""
+
+        records = self.load()
+        self.tree = BKTree()
+        self.hashes.clear()
+        self.titles.clear()
+
+        hashed = 0
+        used = set()
+        for entry_id, data in entries.items():
+            image_filename = data.get('image_filename', '')
+            image_path = os.path.join(images_dir, image_filename) if image_filename else ""
+            if not image_path or not os.path.exists(image_path):
+                continue
+            used.add(image_filename)
+
+            fingerprint = ImageHashIndex.fingerprint(image_path)
+            record = records.get(image_filename)
+            if record is None or record.get("fingerprint") != fingerprint:
+                hashes = ImageHash.hashes(image_path)
+                if hashes is None:
+                    continue
+                record = {"fingerprint": fingerprint, "phash": f"{hashes[0]:016x}", "dhash": f"{hashes[1]:016x}",
+                          "detail": base64.b64encode(hashes[2]).decode('ascii')}
+                records[image_filename] = record
+                hashed += 1
+
+            hashes = (int(record["phash"], 16), int(record["dhash"], 16), base64.b64decode(record["detail"]))
+            self.add(entry_id, hashes, data.get('title', ''))
+
+        removed = [image_filename for image_filename in records if image_filename not in used]
+        for image_filename in removed:
+            del records[image_filename]
+        if hashed or removed:
+            self.save()
+        return hashed
+
+    def add(self, entry_id, hashes, title=""):
+        """hashes: as ImageHash.hashes gives them, they are kept comparable"""
+
+        self.tree.add(hashes[0], entry_id)
+        self.hashes[entry_id] = ImageHash.comparable(hashes)
+        self.titles[entry_id] = title
+
+    def find(self, hashes, exclude_id=None):
+        """Entries whose image is a near duplicate of one with these hashes (from ImageHash.hashes):
+        [ids], closest first"""
+
+        if hashes is None:
+            return []
+        return self.find_near(ImageHash.comparable(hashes), exclude_id)
+
+    def find_near(self, hashes, exclude_id=None):
+        """Same as find, for hashes already made comparable"""
+
+        found = []
+        for _, entry_id in self.tree.find(hashes[0], MAX_PHASH_DISTANCE):
+            # An entry added again with a new image can still sit in the tree under its old hash
+            if entry_id == exclude_id or entry_id in found or entry_id not in self.hashes:
+                continue
+            if ImageHash.is_near(hashes, self.hashes[entry_id]):
+                found.append(entry_id)
+        return found
+
+    def groups(self):
+        """Every group of near duplicate images in the index: [[ids]]"""
+
+        groups = []
+        seen = set()
+        for entry_id, hashes in self.hashes.items():
+            if entry_id in seen:
+                continue
+            group = [entry_id] + [other for other in self.find_near(hashes, exclude_id=entry_id) if other not in seen]
+            if len(group) > 1:
+                groups.append(group)
+                seen.update(group)
+        return groups
+
+def main():
+    """List near duplicate images of the bank, or check the matching on a folder of images:
+    py -m src.utils.image_hash
+    py -m src.utils.image_hash --check <folder>"""
+
+    import sys
+    from src.utils.data_manager import DataManager
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--check":
+        if len(sys.argv) < 3 or not os.path.isdir(sys.argv[2]):
+            print(main.__doc__)
+            sys.exit(1)
+        missed, confused = ImageHash.check_folder(sys.argv[2])
+        for name, quality, scale in missed:
+            print(f"{name}: not found again as JPEG {quality} at {scale}x")
+        for name, other in confused:
+            print(f"{name} / {other}: taken as the same image")
+        print(f"{len(missed)} missed, {len(confused)} confused")
+        sys.exit(1 if missed or confused else 0)
+
+    data_manager = DataManager()
+    index = ImageHashIndex()
+    hashed = index.build(data_manager.load_all_data(), data_manager.images_dir)
+    groups = index.groups()
+    for ids in groups:
+        print(" / ".join(f"{index.titles[i]} ({i})" for i in ids))
+    print(f"{len(groups)} groups of similar images in {len(index.hashes)} images ({hashed} hashed)")
+
+if __name__ == "__main__":
+    main()
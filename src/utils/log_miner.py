@@ -0,0 +1,392 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import gzip
+import hashlib
+import json
+import os
+import uuid
+
+from src.utils.efficiency import Efficiency
+
+LOG_EXTENSIONS = (".json", ".jsonl", ".mjson", ".log")
+
+# Decision points worth a problem: shanten in range, and the second discard keeps
+# at least this share of the best discard's ukeire
+DEFAULT_CRITERIA = {"min_shanten": 0, "max_shanten": 2, "close_ratio": 0.9, "min_turn": 1}
+
+WIND_KEYS = ["info.east", "info.south", "info.west", "info.north"]
+WIND_LETTERS = "ESWN"
+
+# mjai honors: winds, then haku/hatsu/chun
+MJAI_HONORS = {"E": "1z", "S": "2z", "W": "3z", "N": "4z", "P": "5z", "F": "6z", "C": "7z"}
+
+# --- Tiles --- #
+
+def _tenhou_tile(tile):
+    """tenhou.net/6 tile number: 11-19 m, 21-29 p, 31-39 s, 41-47 z, 51-53 red fives"""
+
+    if tile in (51, 52, 53):
+        return f"0{'mps'[tile - 51]}"
+    return f"{tile % 10}{'mpsz'[tile // 10 - 1]}"
+
+def _mjai_tile(tile):
+    """mjai tile: "1m", "5pr" (red), "E".."C"; None for a hidden "?" """
+
+    if tile in MJAI_HONORS:
+        return MJAI_HONORS[tile]
+    if len(tile) >= 2 and tile[0] in "123456789" and tile[1] in "mps":
+        return ("0" if tile.endswith("r") else tile[0]) + tile[1]
+    return None
+
+def _sort_key(tile):
+
+    return ("mpsz".index(tile[1]), 5 if tile[0] == "0" else int(tile[0]), tile[0] != "0")
+
+def _hand_text(tiles, drawn):
+    """Hand as "123m456p11z" with the drawn tile last, red fives kept"""
+
+    rest = list(tiles)
+    rest.remove(drawn)
+    rest.sort(key=_sort_key)
+    text = ""
+    for suit in "mpsz":
+        ranks = "".join(tile[0] for tile in rest if tile[1] == suit)
+        if ranks:
+            text += ranks + suit
+    return text + drawn
+
+# --- Decision points --- #
+
+def _judge(point, criteria):
+    """Entry for one decision point, None when it does not meet the criteria"""
+
+    if point["turn"] < criteria["min_turn"]:
+        return None
+
+    tile_set = Efficiency.tile_set(point["players"])
+    dora = "".join(point["dora"])
+    table = Efficiency.discard_table(Efficiency.to_counts(point["tiles"]), Efficiency.to_counts(dora), tile_set)
+    if len(table) < 2:
+        return None
+    best, second = table[0], table[1]
+    if not criteria["min_shanten"] <= best["shanten"] <= criteria["max_shanten"]:
+        return None
+    if second["shanten"] != best["shanten"] or not best["ukeire"]:
+        return None
+    if second["ukeire"] < best["ukeire"] * criteria["close_ratio"]:
+        return None
+
+    best_tiles = [Efficiency.code_to_tile(row["discard"]) for row in table
+                  if row["shanten"] == best["shanten"] and row["ukeire"] == best["ukeire"]]
+    notes = " / ".join(f"{Efficiency.code_to_tile(row['discard'])} ({row['ukeire']})"
+                       for row in table[:3] if row["shanten"] == best["shanten"])
+    # Answer with the tile as held, so a red five stays a red five
+    answer = next((tile for tile in sorted(point["tiles"], key=_sort_key, reverse=True)
+                   if tile[1] == best_tiles[0][1] and (tile[0] if tile[0] != "0" else "5") == best_tiles[0][0]), best_tiles[0])
+    source_key = f"{point['file']}|{point['game']}|{point['round']}|{point['seat']}|{point['turn']}"
+
+    return {
+        'create_time': datetime.now().isoformat(timespec='seconds'),
+        'title': f"{os.path.splitext(os.path.basename(point['file']))[0]} {point['round']} #{point['turn']}",
+        'encounter': 0, 'correct': 0, 'accuracy': "N/A %",
+        'source': point["source"], 'players': point["players"], 'difficulty': 0,
+        'wind': point["wind"], 'self_wind': point["self_wind"], 'game': point["kyoku"],
+        'honba': point["honba"], 'turn': str(point["turn"]),
+        'dora': dora, 'hands': _hand_text(point["tiles"], point["drawn"]),
+        'answer_action': "answer.discard", 'answer_input': answer,
+        'intro': "/", 'notes': f"{notes} | {point['played']}",
+        'image_filename': "",
+        # Same log position, same id: mining again never doubles an entry
+        'id': str(uuid.uuid5(uuid.NAMESPACE_URL, source_key)),
+    }
+
+def _tenhou_points(game, file, game_index):
+    """Closed in turn hands of a tenhou.net/6 game ({"log": [...]}).
+    Rounds with a kan are skipped, as the log does not tell when the kan dora was shown"""
+
+    for rnd in game.get("log", []):
+        # Sanma logs may keep an empty fourth seat
+        players = sum(1 for seat in range((len(rnd) - 5) // 3) if rnd[4 + 3 * seat])
+        kyoku, honba = rnd[0][0], rnd[0][1]
+        discards_all = [rnd[4 + 3 * seat + 2] for seat in range(players)]
+        if any(isinstance(d, str) and ("a" in d or "k" in d) for river in discards_all for d in river):
+            continue
+        if any(isinstance(t, str) and "m" in t for seat in range(players) for t in rnd[4 + 3 * seat + 1]):
+            continue
+
+        round_name = f"{WIND_LETTERS[kyoku // 4]}{kyoku % 4 + 1}-{rnd[0][1]}"
+        for seat in range(players):
+            hand = [_tenhou_tile(tile) for tile in rnd[4 + 3 * seat]]
+            takes, discards = rnd[4 + 3 * seat + 1], rnd[4 + 3 * seat + 2]
+            for turn, (take, discard) in enumerate(zip(takes, discards), start=1):
+                # A call opens the hand, a riichi fixes it: nothing left to ask after that
+                if isinstance(take, str):
+                    break
+                drawn = _tenhou_tile(take)
+                hand.append(drawn)
+
+                if isinstance(discard, str) and discard.startswith("f"):
+                    # Sanma nuki: the north goes out, the replacement comes with the next take
+                    hand.remove(_tenhou_tile(int(discard[1:])))
+                    continue
+                riichi = isinstance(discard, str) and discard.startswith("r")
+                value = int(discard[1:]) if riichi else discard
+                # 60 is a tsumogiri
+                played = drawn if value == 60 else _tenhou_tile(value)
+
+                yield {
+                    "file": file, "game": game_index, "round": round_name, "seat": seat, "turn": turn,
+                    "source": "source.tenhou", "players": "players.three" if players == 3 else "players.four",
+                    "wind": WIND_KEYS[kyoku // 4], "self_wind": WIND_KEYS[(seat - kyoku % 4) % players],
+                    "kyoku": str(kyoku % 4 + 1), "honba": str(honba),
+                    "dora": [_tenhou_tile(rnd[2][0])], "tiles": list(hand), "drawn": drawn, "played": played,
+                }
+
+                hand.remove(played)
+                if riichi:
+                    break
+
+def _mjai_points(events, file, game_index):
+    """Closed in turn hands of one mjai event stream"""
+
+    hands, state, dora = {}, {}, []
+    kyoku, honba, bakaze, oya, players, round_name = 1, 0, "E", 0, 4, ""
+    turns, drawn = {}, {}
+
+    for event in events:
+        kind = event.get("type")
+        actor = event.get("actor")
+
+        if kind == "start_kyoku":
+            tehais = [tehai for tehai in event.get("tehais", []) if tehai]
+            players = len(tehais)
+            hands = {seat: [_mjai_tile(tile) for tile in tehai] for seat, tehai in enumerate(tehais)}
+            # Hidden hands ("?") cannot be followed
+            state = {seat: "closed" if None not in hand else "hidden" for seat, hand in hands.items()}
+            turns = {seat: 0 for seat in hands}
+            drawn = {}
+            dora = [_mjai_tile(event.get("dora_marker", ""))]
+            bakaze, kyoku, honba, oya = event.get("bakaze", "E"), event.get("kyoku", 1), event.get("honba", 0), event.get("oya", 0)
+            round_name = f"{bakaze}{kyoku}-{honba}"
+
+        elif kind == "dora":
+            dora.append(_mjai_tile(event.get("dora_marker", "")))
+
+        elif actor not in hands:
+            continue
+
+        elif kind == "tsumo":
+            tile = _mjai_tile(event.get("pai", "?"))
+            turns[actor] += 1
+            if tile is None:
+                state[actor] = "hidden"
+                continue
+            hands[actor].append(tile)
+            drawn[actor] = tile
+
+        elif kind == "dahai":
+            tile = _mjai_tile(event.get("pai", "?"))
+            if state[actor] in ["closed", "reach"] and actor in drawn and tile in hands[actor]:
+                yield {
+                    "file": file, "game": game_index, "round": round_name, "seat": actor, "turn": turns[actor],
+                    "source": "source.others", "players": "players.three" if players == 3 else "players.four",
+                    "wind": WIND_KEYS["ESWN".index(bakaze)], "self_wind": WIND_KEYS[(actor - oya) % players],
+                    "kyoku": str(kyoku), "honba": str(honba),
+                    "dora": list(dora), "tiles": list(hands[actor]), "drawn": drawn[actor], "played": tile,
+                }
+            if tile in hands[actor]:
+                hands[actor].remove(tile)
+            drawn.pop(actor, None)
+            if state[actor] == "reach":
+                state[actor] = "riichi"
+
+        elif kind == "reach":
+            if state[actor] == "closed":
+                state[actor] = "reach"
+
+        elif kind == "nukidora":
+            tile = _mjai_tile(event.get("pai", "N"))
+            if tile in hands[actor]:
+                hands[actor].remove(tile)
+
+        elif kind in ["chi", "pon", "daiminkan", "ankan", "kakan"]:
+            state[actor] = "open"
+
+def _read_events(path):
+    """Yield the JSON objects of a log file: one per line (mjai, tenhou jsonl) or one for the whole file"""
+
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        first = f.readline()
+        try:
+            json.loads(first)
+            yield json.loads(first)
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        except json.JSONDecodeError:
+            # A pretty printed tenhou log spans many lines
+            yield json.loads(first + f.read())
+
+def _mine_file(task):
+    """Pool worker: (path, rel, key, criteria) -> (rel, key, entries, error)"""
+
+    path, rel, key, criteria = task
+    entries = []
+    try:
+        events = []
+        game_index = 0
+        for obj in _read_events(path):
+            if "log" in obj:
+                points = _tenhou_points(obj, rel, game_index)
+                game_index += 1
+            else:
+                events.append(obj)
+                if obj.get("type") != "end_game":
+                    continue
+                points = _mjai_points(events, rel, game_index)
+                events = []
+                game_index += 1
+            entries.extend(entry for entry in (_judge(point, criteria) for point in points) if entry)
+        if events:
+            entries.extend(entry for entry in (_judge(point, criteria) for point in _mjai_points(events, rel, game_index)) if entry)
+        return rel, key, entries, ""
+    except Exception as e:
+        return rel, key, entries, str(e)
+
+# --- Pipeline --- #
+
+class LogMiner:
+    @staticmethod
+    def find_logs(root):
+        """Every log file under a folder (gzip ones too), in a stable order"""
+
+        found = []
+        for folder, _, files in os.walk(root):
+            for name in files:
+                if name.endswith(".gz"):
+                    name_check = name[:-3]
+                else:
+                    name_check = name
+                if name_check.endswith(LOG_EXTENSIONS):
+                    found.append(os.path.join(folder, name))
+        return sorted(found)
+
+    @staticmethod
+    def file_key(path, criteria):
+        """A file is mined again when it changed or the criteria did"""
+
+        stat = os.stat(path)
+        criteria_text = json.dumps(criteria, sort_keys=True)
+        return f"{stat.st_size}-{int(stat.st_mtime)}-{hashlib.sha1(criteria_text.encode('utf-8')).hexdigest()[:8]}"
+
+    @staticmethod
+    def load_manifest(manifest_file):
+        """Finished files of an earlier run: {rel: (key, entries)}. A cut off last line is ignored"""
+
+        done = {}
+        try:
+            with open(manifest_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    done[record["file"]] = (record["key"], record["entries"])
+        except FileNotFoundError:
+            pass
+        return done
+
+    @staticmethod
+    def run(root, manifest_file, criteria=None, workers=None, chunksize=8):
+        """Mine every log under root. Each finished file is appended to the manifest (JSON lines)
+        at once, so a stopped run goes on from there; changed files are mined again.
+        Returns: ({id: entry}, [(file, error)])"""
+
+        criteria = dict(DEFAULT_CRITERIA, **(criteria or {}))
+        done = LogMiner.load_manifest(manifest_file)
+
+        files = {}
+        todo = []
+        for path in LogMiner.find_logs(root):
+            rel = os.path.relpath(path, root).replace(os.sep, "/")
+            key = LogMiner.file_key(path, criteria)
+            files[rel] = key
+            if done.get(rel, (None,))[0] != key:
+                todo.append((path, rel, key, criteria))
+
+        errors = []
+        if todo:
+            os.makedirs(os.path.dirname(os.path.abspath(manifest_file)), exist_ok=True)
+            with open(manifest_file, 'a', encoding='utf-8') as f:
+                workers = workers or os.cpu_count() or 1
+                if workers <= 1 or len(todo) < chunksize:
+                    errors = LogMiner._write_results(f, map(_mine_file, todo), done)
+                else:
+                    with ProcessPoolExecutor(max_workers=workers) as pool:
+                        errors = LogMiner._write_results(f, pool.map(_mine_file, todo, chunksize=chunksize), done)
+
+        entries = {}
+        for rel, (key, mined) in done.items():
+            if files.get(rel) == key:
+                for entry in mined:
+                    entries[entry["id"]] = entry
+        return entries, errors
+
+    @staticmethod
+    def _write_results(f, results, done):
+        """Append results to the open manifest as they come in, failed files are left to retry"""
+
+        errors = []
+        for rel, key, entries, error in results:
+            if error:
+                errors.append((rel, error))
+                continue
+            done[rel] = (key, entries)
+            f.write(json.dumps({"file": rel, "key": key, "entries": entries}, ensure_ascii=False) + "\n")
+            f.flush()
+        return errors
+
+def main():
+    """Mine how-to-cut problems from game logs:
+    py -m src.utils.log_miner <log folder> [output.json] [workers] [--restart]
+    [--min-shanten=N] [--max-shanten=N] [--close-ratio=R] [--min-turn=N]
+    The output is in the data.json format, saves/mined.json by default.
+    The manifest (output name + .jsonl) is resumed unless --restart."""
+
+    import sys
+    from src.utils.data_manager import DataManager
+    from src.utils.path_finder import get_saves_path
+
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    if not args:
+        print(main.__doc__)
+        sys.exit(1)
+    options = dict(arg[2:].split("=", 1) for arg in sys.argv[1:] if arg.startswith("--") and "=" in arg)
+
+    root = args[0]
+    output_file = args[1] if len(args) > 1 else get_saves_path("mined.json")
+    workers = int(args[2]) if len(args) > 2 else None
+    manifest_file = os.path.splitext(output_file)[0] + ".jsonl"
+
+    if not os.path.isdir(root):
+        print(f"Folder '{root}' not exist")
+        sys.exit(1)
+
+    criteria = {}
+    for key, cast in [("min_shanten", int), ("max_shanten", int), ("close_ratio", float), ("min_turn", int)]:
+        option = key.replace("_", "-")
+        if option in options:
+            criteria[key] = cast(options[option])
+
+    if "--restart" in sys.argv and os.path.exists(manifest_file):
+        os.remove(manifest_file)
+
+    entries, errors = LogMiner.run(root, manifest_file, criteria, workers=workers)
+    for rel, error in errors:
+        print(f"Error in {rel}: {error}")
+    DataManager().save_data(entries, output_file)
+    print(f"Mined {len(entries)} problems -> {output_file}")
+
+if __name__ == "__main__":
+    main()
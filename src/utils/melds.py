@@ -0,0 +1,113 @@
+from functools import lru_cache
+
+from src.utils.validators import Validator
+
+# --- Enumeration --- #
+
+def _variants(tiles, number, suit):
+    """Concrete tiles in hand for a number (a 5 may be a plain or a red one)"""
+
+    found = []
+    for tile in set(tiles):
+        if tile[1] == suit and Validator._fivedize_zero(tile)[0] == str(number):
+            found.append(tile)
+    return sorted(found)
+
+def _without(tiles, used):
+    """Hand after taking the used tiles out"""
+
+    rest = list(tiles)
+    for tile in used:
+        rest.remove(tile)
+    return rest
+
+def _follow_ups(rest, forbidden):
+    """Legal discards after a call, kuikae (forbidden numbers) taken out"""
+
+    return sorted({tile for tile in rest if Validator._fivedize_zero(tile) not in forbidden})
+
+@lru_cache(maxsize=4096)
+def _enumerate(tiles, action, is_three_player):
+    """Every concrete call of one action on a sorted tile tuple"""
+
+    options = []
+    counts = {}
+    for tile in tiles:
+        key = Validator._fivedize_zero(tile)
+        counts[key] = counts.get(key, 0) + 1
+
+    if action == "chi":
+        if is_three_player:
+            return ()
+        for suit in 'mps':
+            for called in range(1, 10):
+                for first, second in ((called - 2, called - 1), (called - 1, called + 1), (called + 1, called + 2)):
+                    if first < 1 or second > 9:
+                        continue
+                    for tile_a in _variants(tiles, first, suit):
+                        for tile_b in _variants(tiles, second, suit):
+                            # Kuikae: the called tile, and the other end of a ryanmen
+                            forbidden = {f"{called}{suit}"}
+                            if first == called + 1 and called + 3 <= 9:
+                                forbidden.add(f"{called + 3}{suit}")
+                            elif second == called - 1 and called - 3 >= 1:
+                                forbidden.add(f"{called - 3}{suit}")
+
+                            rest = _without(tiles, [tile_a, tile_b])
+                            discards = _follow_ups(rest, forbidden)
+                            if discards:
+                                options.append((f"{called}{suit}", (tile_a, tile_b), tuple(discards)))
+
+    elif action in ["pon", "kan"]:
+        need = 2 if action == "pon" else 3
+        for key, count in sorted(counts.items()):
+            # The called tile is one more copy, so 4 in hand cannot be called
+            if not need <= count <= 3:
+                continue
+            same = [tile for tile in tiles if Validator._fivedize_zero(tile) == key]
+            # Red five variants: which copies are used
+            used_options = {tuple(sorted(same[:need]))}
+            if need < len(same):
+                for i in range(len(same)):
+                    used = same[:i] + same[i + 1:]
+                    used_options.add(tuple(sorted(used[:need])))
+
+            for used in sorted(used_options):
+                rest = _without(tiles, used)
+                # Daiminkan draws a replacement first, no kuikae after it
+                forbidden = {key} if action == "pon" else set()
+                discards = _follow_ups(rest, forbidden)
+                if discards or (action == "kan" and not rest):
+                    options.append((key, used, tuple(discards)))
+
+    return tuple(options)
+
+class Melds:
+    @staticmethod
+    def enumerate(hands_text, action, is_three_player=False):
+        """Every concrete chi/pon/kan on an out of turn hand, with the legal discards after it.
+        Returns: [{"action", "called", "used", "discards"}]"""
+
+        tiles = tuple(sorted(Validator._parse_tiles_from_string(hands_text or "")))
+        if len(tiles) not in [1, 4, 7, 10, 13]:
+            return []
+
+        return [
+            {"action": action, "called": called, "used": list(used), "discards": list(discards)}
+            for called, used, discards in _enumerate(tiles, action, is_three_player)
+        ]
+
+    @staticmethod
+    def can_call(hands_text, action, is_three_player=False):
+        """Any legal call of this action at all"""
+
+        return bool(Melds.enumerate(hands_text, action, is_three_player))
+
+    @staticmethod
+    def discardable_tiles(hands_text, action, is_three_player=False):
+        """Tiles that can be discarded after at least one call of this action (the answer tile choices)"""
+
+        tiles = set()
+        for option in Melds.enumerate(hands_text, action, is_three_player):
+            tiles.update(option["discards"])
+        return tiles
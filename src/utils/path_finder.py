@@ -9,4 +9,13 @@ def get_resource_path(relative_path):
     except Exception:
         base_path = os.path.abspath(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
     
-    return os.path.join(base_path, relative_path)
\ No newline at end of file
+    return os.path.join(base_path, relative_path)
+
+def get_saves_path(relative_path=""):
+    """Get absolute path inside the saves folder (next to the exe when frozen, project root in dev)"""
+    if getattr(sys, 'frozen', False):
+        base_path = os.path.dirname(sys.executable)
+    else:
+        base_path = os.path.abspath(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+    return os.path.join(base_path, "saves", relative_path)
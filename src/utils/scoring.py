@@ -0,0 +1,418 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import math
+import os
+
+from src.utils.efficiency import Efficiency, TERMINAL_CODES
+from src.utils.validators import Validator
+from src.utils.waits import Waits, _is_chiitoi, _is_kokushi, _block_shape
+
+# Closed hands only: entries do not record melds, so every block is concealed
+WIND_CODES = {"info.east": 31, "info.south": 32, "info.west": 33, "info.north": 34}
+DRAGON_CODES = [35, 36, 37]
+DRAGON_NAMES = {35: "haku", 36: "hatsu", 37: "chun"}
+GREEN_CODES = [22, 23, 24, 26, 28, 36]
+
+# Base points of the limit hands, by han
+LIMITS = [(13, "yakuman", 8000), (11, "sanbaiman", 6000), (8, "baiman", 4000), (6, "haneman", 3000), (5, "mangan", 2000)]
+
+# --- Yaku (module level, cached per hand shape) --- #
+
+def _is_terminal_or_honor(code):
+    return code in TERMINAL_CODES
+
+def _block_codes(kind, code):
+    return [code, code + 1, code + 2] if kind == "shuntsu" else [code]
+
+def _chuuren(counts):
+    """Nine gates: one suit, 1112345678999 plus any tile of it"""
+
+    for start in (1, 11, 21):
+        suit = counts[start:start + 9]
+        if sum(suit) != 14:
+            continue
+        need = [3, 1, 1, 1, 1, 1, 1, 1, 3]
+        return all(have >= want for have, want in zip(suit, need))
+    return False
+
+def _yakuman(counts, blocks, win, tsumo, shape):
+    """Yakuman of one reading as [(name, multiple)], empty when there is none"""
+
+    found = []
+    tiles = [code for code in range(len(counts)) for _ in range(counts[code])]
+    honors = [code for code in tiles if code > 30]
+
+    if blocks is not None:
+        koutsu = [code for kind, code in blocks if kind == "koutsu"]
+        pair = [code for kind, code in blocks if kind == "pair"][0]
+        # A koutsu finished by ron is not concealed
+        concealed = [code for code in koutsu if tsumo or code != win or shape != "shanpon"]
+        if len(concealed) == 4:
+            found.append(("suuankou_tanki", 2) if shape == "tanki" else ("suuankou", 1))
+        if all(code in koutsu for code in DRAGON_CODES):
+            found.append(("daisangen", 1))
+        winds = [code for code in koutsu if 31 <= code <= 34]
+        if len(winds) == 4:
+            found.append(("daisuushi", 2))
+        elif len(winds) == 3 and 31 <= pair <= 34:
+            found.append(("shousuushi", 1))
+
+    if len(honors) == len(tiles):
+        found.append(("tsuuiisou", 1))
+    if not honors and all(_is_terminal_or_honor(code) for code in tiles):
+        found.append(("chinroutou", 1))
+    if all(code in GREEN_CODES for code in tiles):
+        found.append(("ryuuiisou", 1))
+    if _chuuren(counts):
+        before = list(counts)
+        before[win] -= 1
+        start = win - (win - 1) % 10
+        pure = before[start:start + 9] == [3, 1, 1, 1, 1, 1, 1, 1, 3]
+        found.append(("junsei_chuuren", 2) if pure else ("chuuren", 1))
+    return found
+
+def _regular_yaku(counts, blocks, win, tsumo, shape, round_wind, seat_wind, riichi):
+    """Yaku and fu of one mentsu + pair reading. Returns: ([(name, han)], fu)"""
+
+    yaku = []
+    shuntsu = sorted(code for kind, code in blocks if kind == "shuntsu")
+    koutsu = sorted(code for kind, code in blocks if kind == "koutsu")
+    pair = [code for kind, code in blocks if kind == "pair"][0]
+    tiles = [code for code in range(len(counts)) for _ in range(counts[code])]
+    yakuhai_pair = pair in DRAGON_CODES or pair in (round_wind, seat_wind)
+
+    if riichi:
+        yaku.append(("riichi", 1))
+    if tsumo:
+        yaku.append(("menzen_tsumo", 1))
+
+    is_pinfu = len(shuntsu) == 4 and not yakuhai_pair and shape == "ryanmen"
+    if is_pinfu:
+        yaku.append(("pinfu", 1))
+    if all(not _is_terminal_or_honor(code) for code in tiles):
+        yaku.append(("tanyao", 1))
+
+    # Iipeikou / ryanpeikou
+    peikou = 0
+    remaining = list(shuntsu)
+    for code in sorted(set(shuntsu)):
+        while remaining.count(code) >= 2:
+            peikou += 1
+            remaining.remove(code)
+            remaining.remove(code)
+    if peikou == 2:
+        yaku.append(("ryanpeikou", 3))
+    elif peikou == 1:
+        yaku.append(("iipeikou", 1))
+
+    # Yakuhai
+    for code in koutsu:
+        if code in DRAGON_CODES:
+            yaku.append((DRAGON_NAMES[code], 1))
+        if code == round_wind:
+            yaku.append(("round_wind", 1))
+        if code == seat_wind:
+            yaku.append(("seat_wind", 1))
+
+    # Sanshoku / ittsu
+    if any(all(code + offset in shuntsu for offset in (0, 10, 20)) for code in range(1, 8)):
+        yaku.append(("sanshoku", 2))
+    if any(all(code + offset in koutsu for offset in (0, 10, 20)) for code in range(1, 10)):
+        yaku.append(("sanshoku_doukou", 2))
+    if any(all(start + offset in shuntsu for offset in (0, 3, 6)) for start in (1, 11, 21)):
+        yaku.append(("ittsu", 2))
+
+    # Chanta / junchan / honroutou
+    all_outside = all(any(_is_terminal_or_honor(c) for c in _block_codes(kind, code)) for kind, code in blocks)
+    has_honor = any(code > 30 for code in tiles)
+    if all_outside and shuntsu:
+        yaku.append(("chanta", 2) if has_honor else ("junchan", 3))
+    if not shuntsu and all(_is_terminal_or_honor(code) for code in tiles):
+        yaku.append(("honroutou", 2))
+
+    # Flushes
+    suits = {code // 10 for code in tiles if code < 30}
+    if len(suits) == 1:
+        yaku.append(("honitsu", 3) if has_honor else ("chinitsu", 6))
+
+    # Triplets
+    concealed = [code for code in koutsu if tsumo or code != win or shape != "shanpon"]
+    if len(koutsu) == 4:
+        yaku.append(("toitoi", 2))
+    if len(concealed) == 3:
+        yaku.append(("sanankou", 2))
+    if sum(1 for code in koutsu if code in DRAGON_CODES) == 2 and pair in DRAGON_CODES:
+        yaku.append(("shousangen", 2))
+
+    # Fu
+    if is_pinfu:
+        fu = 20 if tsumo else 30
+    else:
+        fu = 20 + (2 if tsumo else 10)
+        if pair in DRAGON_CODES:
+            fu += 2
+        if pair == round_wind:
+            fu += 2
+        if pair == seat_wind:
+            fu += 2
+        if shape in ["kanchan", "penchan", "tanki"]:
+            fu += 2
+        for code in koutsu:
+            value = 2
+            if _is_terminal_or_honor(code):
+                value *= 2
+            if code in concealed:
+                value *= 2
+            fu += value
+        fu = int(math.ceil(fu / 10.0)) * 10
+
+    return yaku, fu
+
+def _chiitoi_yaku(counts, tsumo, riichi):
+    """Yaku of a seven pairs hand (fu is always 25)"""
+
+    yaku = []
+    tiles = [code for code in range(len(counts)) for _ in range(counts[code])]
+    if riichi:
+        yaku.append(("riichi", 1))
+    if tsumo:
+        yaku.append(("menzen_tsumo", 1))
+    yaku.append(("chiitoitsu", 2))
+    if all(not _is_terminal_or_honor(code) for code in tiles):
+        yaku.append(("tanyao", 1))
+    if all(_is_terminal_or_honor(code) for code in tiles):
+        yaku.append(("honroutou", 2))
+    suits = {code // 10 for code in tiles if code < 30}
+    if len(suits) == 1:
+        yaku.append(("honitsu", 3) if any(code > 30 for code in tiles) else ("chinitsu", 6))
+    return yaku
+
+def _reading_key(reading):
+    """Best reading first: yakuman multiple, han, then fu"""
+
+    yaku, fu, yakuman = reading
+    return (yakuman, sum(han for _, han in yaku), fu)
+
+@lru_cache(maxsize=1 << 16)
+def _score_shape(counts, win, tsumo, round_wind, seat_wind, riichi):
+    """Best reading of a complete closed hand, dora not included.
+    Returns: (yaku tuple, fu, yakuman multiple), or None when it is not agari"""
+
+    readings = []
+    for blocks in Waits.decompositions(counts):
+        # The winning tile may finish any block holding it, each is its own reading
+        shapes = set()
+        for kind, code in blocks:
+            if (kind == "shuntsu" and code <= win <= code + 2) or (kind != "shuntsu" and code == win):
+                shapes.add(_block_shape(kind, code, win))
+        for shape in shapes:
+            yakuman = _yakuman(counts, blocks, win, tsumo, shape)
+            if yakuman:
+                readings.append((tuple(yakuman), 0, sum(multiple for _, multiple in yakuman)))
+                continue
+            yaku, fu = _regular_yaku(counts, blocks, win, tsumo, shape, round_wind, seat_wind, riichi)
+            readings.append((tuple(yaku), fu, 0))
+
+    if _is_chiitoi(counts):
+        yakuman = _yakuman(counts, None, win, tsumo, "tanki")
+        if yakuman:
+            readings.append((tuple(yakuman), 0, sum(multiple for _, multiple in yakuman)))
+        else:
+            readings.append((tuple(_chiitoi_yaku(counts, tsumo, riichi)), 25, 0))
+
+    if _is_kokushi(counts):
+        before = list(counts)
+        before[win] -= 1
+        readings.append(((("kokushi13", 2),) if before[win] == 1 else (("kokushi", 1),), 0,
+                         2 if before[win] == 1 else 1))
+
+    if not readings:
+        return None
+    return max(readings, key=_reading_key)
+
+# --- Scoring --- #
+
+class Scoring:
+    @staticmethod
+    def base_points(han, fu, yakuman=0):
+        """Base points and limit name ("" below mangan)"""
+
+        if yakuman:
+            return 8000 * yakuman, "yakuman"
+        for least, name, base in LIMITS:
+            if han >= least:
+                return base, name
+        base = fu * 2 ** (han + 2)
+        if base >= 2000:
+            return 2000, "mangan"
+        return base, ""
+
+    @staticmethod
+    def payment(base, dealer, tsumo, honba=0, players=4):
+        """Points paid for one base value. Tsumo in sanma: the missing player's share is simply not paid.
+        Returns: {"ron"} or {"dealer", "others"} (tsumo, per player), plus "total" with honba"""
+
+        def round_up(points):
+            return int(math.ceil(points / 100.0)) * 100
+
+        if not tsumo:
+            ron = round_up(base * (6 if dealer else 4)) + 300 * honba
+            return {"ron": ron, "total": ron}
+
+        others = round_up(base * (2 if dealer else 1)) + 100 * honba
+        dealer_pays = 0 if dealer else round_up(base * 2) + 100 * honba
+        payers = players - 1 - (0 if dealer else 1)
+        return {"dealer": dealer_pays, "others": others, "total": dealer_pays + others * payers}
+
+    @staticmethod
+    def dora_count(tiles, dora="", tile_set=None):
+        """Dora from the indicators, plus red fives"""
+
+        dora_next = (tile_set or Efficiency.tile_set("")).dora_next
+        counts = Efficiency.to_counts(tiles)
+        count = 0
+        for code, indicators in enumerate(Efficiency.to_counts(dora)):
+            if indicators:
+                count += indicators * counts[dora_next.get(code, code)]
+        return count, sum(1 for tile in tiles if tile[0] == '0')
+
+    @staticmethod
+    def score(tiles, win_tile=None, tsumo=True, wind="info.east", self_wind="info.east",
+              honba=0, dora="", riichi=False, players="players.four"):
+        """Score a closed agari hand (string or tile list, the winning tile last unless given).
+        Returns: {"yaku": [(name, han)], "han", "fu", "yakuman", "dora", "aka", "limit", "base", "payment"},
+        None when the hand is not agari or has no yaku"""
+
+        if isinstance(tiles, str):
+            tiles = Validator._parse_tiles_from_string(tiles)
+        if len(tiles) != 14:
+            return None
+
+        win_tile = win_tile or tiles[-1]
+        counts = Efficiency.to_counts(tiles)
+        win = Validator.to_code(Validator._fivedize_zero(win_tile))
+        result = _score_shape(counts, win, bool(tsumo), WIND_CODES.get(wind, 31),
+                              WIND_CODES.get(self_wind, 31), bool(riichi))
+        if result is None:
+            return None
+
+        yaku, fu, yakuman = result
+        if not yaku:
+            return None
+
+        yaku = list(yaku)
+        han = 0 if yakuman else sum(value for _, value in yaku)
+        dora_han, aka_han = 0, 0
+        if not yakuman:
+            dora_han, aka_han = Scoring.dora_count(tiles, dora, Efficiency.tile_set(players))
+            han += dora_han + aka_han
+
+        try:
+            honba = int(honba)
+        except (TypeError, ValueError):
+            honba = 0
+
+        base, limit = Scoring.base_points(han, fu, yakuman)
+        dealer = WIND_CODES.get(self_wind, 31) == 31
+        return {
+            "yaku": yaku,
+            "han": han,
+            "fu": fu,
+            "yakuman": yakuman,
+            "dora": dora_han,
+            "aka": aka_han,
+            "limit": limit,
+            "base": base,
+            "payment": Scoring.payment(base, dealer, tsumo, honba, 3 if players == "players.three" else 4),
+        }
+
+    @staticmethod
+    def score_entry(data, tsumo=True, riichi=False):
+        """Score an entry dict (data.json format): its hand with the drawn tile as the winning tile"""
+
+        return Scoring.score(
+            data.get('hands', ''), tsumo=tsumo,
+            wind=data.get('wind', 'info.east'), self_wind=data.get('self_wind', 'info.east'),
+            honba=data.get('honba', 0), dora=data.get('dora', ''), riichi=riichi,
+            players=data.get('players', 'players.four'),
+        )
+
+    @staticmethod
+    def score_bank(entries, tsumo=True, workers=None, chunksize=64):
+        """Score every agari hand of an {id: data} bank (others are None), on a process pool when large"""
+
+        items = list(entries.values())
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1 or len(items) < chunksize:
+            results = [Scoring.score_entry(data, tsumo) for data in items]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(Scoring.score_entry, items, [tsumo] * len(items), chunksize=chunksize))
+        return dict(zip(entries.keys(), results))
+
+    @staticmethod
+    def check_corpus(corpus_file):
+        """Score every case of a JSON corpus and compare han/fu/payment total.
+        Returns: [(case, result)] of the cases that do not match"""
+
+        import json
+
+        with open(corpus_file, 'r', encoding='utf-8') as f:
+            cases = json.load(f)
+
+        failed = []
+        for case in cases:
+            result = Scoring.score(
+                case["hands"], case.get("win"), case.get("tsumo", True),
+                case.get("wind", "info.east"), case.get("self_wind", "info.east"),
+                case.get("honba", 0), case.get("dora", ""), case.get("riichi", False),
+                case.get("players", "players.four"),
+            )
+            expect = case["expect"]
+            if expect is None:
+                if result is not None:
+                    failed.append((case, result))
+                continue
+            if result is None or any(result[key] != expect[key] for key in ["han", "fu"] if key in expect) or \
+                    ("total" in expect and result["payment"]["total"] != expect["total"]) or \
+                    ("yaku" in expect and sorted(name for name, _ in result["yaku"]) != sorted(expect["yaku"])):
+                failed.append((case, result))
+        return failed
+
+def main():
+    """Score one entry, or check the corpus:
+    py -m src.utils.scoring <entry id> [ron]
+    py -m src.utils.scoring --check [corpus.json]"""
+
+    import sys
+
+    if len(sys.argv) < 2:
+        print(main.__doc__)
+        sys.exit(1)
+
+    if sys.argv[1] == "--check":
+        default = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                               "others", "scoring", "corpus.json")
+        corpus_file = sys.argv[2] if len(sys.argv) > 2 else default
+        failed = Scoring.check_corpus(corpus_file)
+        for case, result in failed:
+            print(f"{case.get('name', case['hands'])}: expect {case['expect']}, got {result}")
+        print(f"{len(failed)} failed")
+        sys.exit(1 if failed else 0)
+
+    from src.utils.data_manager import DataManager
+
+    data = DataManager().load_entry(sys.argv[1])
+    if not data:
+        print(f"Entry '{sys.argv[1]}' not exist")
+        sys.exit(1)
+
+    result = Scoring.score_entry(data, tsumo=not (len(sys.argv) > 2 and sys.argv[2] == "ron"))
+    if result is None:
+        print("Not agari, or no yaku")
+        return
+    print(", ".join(f"{name} {han}" for name, han in result["yaku"]))
+    print(f"{result['han']} han {result['fu']} fu {result['limit']} (dora {result['dora']}, aka {result['aka']}) -> {result['payment']}")
+
+if __name__ == "__main__":
+    main()
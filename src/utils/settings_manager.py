@@ -25,7 +25,8 @@ class SettingsManager(QObject):
             "font_size": 12,
 			"career_stats": True,
 			"timer": False,
-			"endless": False
+			"endless": False,
+			"variants": False
         }
 		self.load()
 
@@ -0,0 +1,228 @@
+from concurrent.futures import ProcessPoolExecutor
+import math
+import os
+import random
+import time
+
+from src.utils.efficiency import Efficiency, ALL_CODES, _shanten
+from src.utils.waits import Waits
+
+LAST_TURN = 18
+CHUNK_TRIALS = 250
+Z_95 = 1.96
+
+# --- Trials (module level, so the pool can pickle them) --- #
+
+def _keep_value(counts, code):
+    """How connected a tile is, the least connected goes first when shanten ties"""
+
+    if code > 30:
+        return counts[code] * 3
+    value = 0
+    for near, weight in ((code - 2, 1), (code - 1, 2), (code, 3), (code + 1, 2), (code + 2, 1)):
+        if near // 10 == code // 10 and near % 10 != 0:
+            value += counts[near] * weight
+    # Terminals are a bit worse than middle tiles
+    return value + (0 if code % 10 in (1, 9) else 1)
+
+def _choose_discard(counts):
+    """Greedy policy: lowest shanten, then the least connected tile"""
+
+    best = None
+    for code in ALL_CODES:
+        if not counts[code]:
+            continue
+        counts[code] -= 1
+        shanten = _shanten(tuple(counts))
+        counts[code] += 1
+        key = (shanten, _keep_value(counts, code))
+        if best is None or key < best[0]:
+            best = (key, code)
+    return best[1], best[0][0]
+
+def _run_chunk(task):
+    """Play one chunk of trials for one candidate.
+    Returns: (tenpai_by_turn, win_by_turn), counts of trials that reached it at each turn"""
+
+    hand, wall_counts, turns, trials, seed, nuki = task
+    rng = random.Random(seed)
+    wall = [code for code in ALL_CODES for _ in range(wall_counts[code])]
+    # Every nuki brings one replacement draw
+    extra = wall_counts[nuki] if nuki else 0
+    tenpai_by_turn = [0] * turns
+    win_by_turn = [0] * turns
+
+    start_tenpai = _shanten(hand) <= 0
+    for _ in range(trials):
+        counts = list(hand)
+        draws = iter(rng.sample(wall, min(turns + extra, len(wall))))
+        tenpai_at = 0 if start_tenpai else None
+        win_at = None
+
+        for turn in range(turns):
+            code = next(draws, None)
+            while nuki and code == nuki:
+                code = next(draws, None)
+            if code is None:
+                break
+            counts[code] += 1
+            if Waits.is_agari(counts):
+                win_at = turn
+                if tenpai_at is None:
+                    tenpai_at = turn
+                break
+            discard, shanten = _choose_discard(counts)
+            counts[discard] -= 1
+            if tenpai_at is None and shanten <= 0:
+                tenpai_at = turn
+
+        if tenpai_at is not None:
+            for turn in range(tenpai_at, turns):
+                tenpai_by_turn[turn] += 1
+        if win_at is not None:
+            for turn in range(win_at, turns):
+                win_by_turn[turn] += 1
+
+    return tenpai_by_turn, win_by_turn
+
+# --- Simulator --- #
+
+class Simulator:
+    @staticmethod
+    def wilson(successes, trials):
+        """95% Wilson interval of a rate"""
+
+        if trials <= 0:
+            return (0.0, 0.0)
+        rate = successes / trials
+        denominator = 1 + Z_95 ** 2 / trials
+        centre = (rate + Z_95 ** 2 / (2 * trials)) / denominator
+        margin = Z_95 * math.sqrt(rate * (1 - rate) / trials + Z_95 ** 2 / (4 * trials ** 2)) / denominator
+        return (max(0.0, centre - margin), min(1.0, centre + margin))
+
+    @staticmethod
+    def turns_left(data):
+        """Draws left from the entry's turn (at least one)"""
+
+        try:
+            turn = int(data.get('turn', ''))
+        except ValueError:
+            turn = 1
+        return max(1, LAST_TURN - turn + 1)
+
+    @staticmethod
+    def candidates(counts, visible=None, all_discards=False, tile_set=None):
+        """Discards worth simulating: the ones keeping the best shanten, unless all_discards"""
+
+        table = Efficiency.discard_table(counts, visible, tile_set)
+        if all_discards or not table:
+            return [row["discard"] for row in table]
+        best = table[0]["shanten"]
+        return [row["discard"] for row in table if row["shanten"] == best]
+
+    @staticmethod
+    def simulate(data, trials=1000, turns=None, seed=0, workers=None, all_discards=False):
+        """Play out random draws from the unseen wall after each discard candidate (self draws only).
+        Returns: [{"tile", "trials", "turns": [{"turn", "tenpai", "tenpai_ci", "win", "win_ci"}]}]"""
+
+        counts = Efficiency.to_counts(data.get('hands', ''))
+        if sum(counts) not in [2, 5, 8, 11, 14]:
+            return []
+
+        visible = Efficiency.to_counts(data.get('dora', ''))
+        tile_set = Efficiency.tile_set(data.get('players', ''))
+        turns = turns or Simulator.turns_left(data)
+
+        tasks = []
+        for code in Simulator.candidates(counts, visible, all_discards, tile_set):
+            after = list(counts)
+            after[code] -= 1
+            after = tuple(after)
+            # The discarded tile is seen as well
+            wall_counts = Efficiency.remaining(after, visible, tile_set)
+            wall_counts[code] = max(0, wall_counts[code] - 1)
+
+            # Seeds depend on candidate and chunk only, so results do not depend on the worker count
+            for chunk, start in enumerate(range(0, trials, CHUNK_TRIALS)):
+                size = min(CHUNK_TRIALS, trials - start)
+                tasks.append((code, (after, wall_counts, turns, size, f"{seed}-{code}-{chunk}", tile_set.nuki)))
+
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1 or len(tasks) <= 1:
+            outputs = [_run_chunk(task) for _, task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                outputs = list(pool.map(_run_chunk, [task for _, task in tasks]))
+
+        totals = {}
+        for (code, task), (tenpai, win) in zip(tasks, outputs):
+            total = totals.setdefault(code, {"trials": 0, "tenpai": [0] * turns, "win": [0] * turns})
+            total["trials"] += task[3]
+            for turn in range(turns):
+                total["tenpai"][turn] += tenpai[turn]
+                total["win"][turn] += win[turn]
+
+        results = []
+        for code, total in totals.items():
+            n = total["trials"]
+            results.append({
+                "tile": Efficiency.code_to_tile(code),
+                "trials": n,
+                "turns": [
+                    {
+                        "turn": turn + 1,
+                        "tenpai": total["tenpai"][turn] / n,
+                        "tenpai_ci": Simulator.wilson(total["tenpai"][turn], n),
+                        "win": total["win"][turn] / n,
+                        "win_ci": Simulator.wilson(total["win"][turn], n),
+                    }
+                    for turn in range(turns)
+                ],
+            })
+
+        results.sort(key=lambda result: (-result["turns"][-1]["win"], -result["turns"][-1]["tenpai"]))
+        return results
+
+    @staticmethod
+    def benchmark(data, trials=1000, seed=0, workers=None):
+        """Time one simulation. Returns: (seconds, trials per second over all candidates)"""
+
+        start = time.perf_counter()
+        results = Simulator.simulate(data, trials=trials, seed=seed, workers=workers)
+        seconds = time.perf_counter() - start
+        played = sum(result["trials"] for result in results)
+        return seconds, (played / seconds if seconds else 0.0)
+
+def main():
+    """Simulate one entry: py -m src.utils.simulator <entry id> [trials] [seed] [workers] [--bench]"""
+
+    import sys
+    from src.utils.data_manager import DataManager
+
+    args = [arg for arg in sys.argv[1:] if arg != "--bench"]
+    if not args:
+        print(main.__doc__)
+        sys.exit(1)
+
+    data = DataManager().load_entry(args[0])
+    if not data:
+        print(f"Entry '{args[0]}' not exist")
+        sys.exit(1)
+
+    trials = int(args[1]) if len(args) > 1 else 1000
+    seed = int(args[2]) if len(args) > 2 else 0
+    workers = int(args[3]) if len(args) > 3 else None
+
+    if "--bench" in sys.argv:
+        seconds, speed = Simulator.benchmark(data, trials=trials, seed=seed, workers=workers)
+        print(f"{seconds:.2f}s, {speed:.0f} trials/s")
+        return
+
+    for result in Simulator.simulate(data, trials=trials, seed=seed, workers=workers):
+        last = result["turns"][-1]
+        print(f"{result['tile']}: tenpai {last['tenpai']:.1%} "
+              f"({last['tenpai_ci'][0]:.1%}-{last['tenpai_ci'][1]:.1%}), "
+              f"win {last['win']:.1%} ({last['win_ci'][0]:.1%}-{last['win_ci'][1]:.1%})")
+
+if __name__ == "__main__":
+    main()
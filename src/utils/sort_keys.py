@@ -0,0 +1,93 @@
+import json
+import os
+
+try:
+    from pypinyin import pinyin, Style
+    HAS_PINYIN = True
+except ImportError:
+    HAS_PINYIN = False
+
+from src.utils.path_finder import get_saves_path
+
+# Bump when keys are made differently, every title then gets its key again once
+KEYS_VERSION = 1
+
+# Katakana -> hiragana, so both kana sort together in gojuon order
+KATAKANA_TO_HIRAGANA = {code: code - 0x60 for code in range(0x30a1, 0x30f6 + 1)}
+
+def make_key(text):
+    """Sort key of a title: hanzi as pinyin, katakana as hiragana, lowercase"""
+
+    if not text:
+        return ""
+    text = text.translate(KATAKANA_TO_HIRAGANA)
+    if not HAS_PINYIN:
+        return text.lower()
+    try:
+        pinyin_list = pinyin(text, style=Style.NORMAL)
+        return ''.join([item[0] for item in pinyin_list if item]).lower()
+    except Exception:
+        return text.lower()
+
+class SortKeys:
+    def __init__(self, store_file=None):
+        """Set sort key store file (beside data.json), the store itself is loaded on first use"""
+
+        self.store_file = store_file or get_saves_path("sort_keys.json")
+        self._keys = None
+
+    def load(self):
+        """{title: key}. Keys made by another version, or with / without pypinyin, are dropped"""
+
+        if self._keys is None:
+            try:
+                with open(self.store_file, 'r', encoding='utf-8') as f:
+                    stored = json.load(f)
+                if stored.get("version") == KEYS_VERSION and stored.get("pinyin") == HAS_PINYIN:
+                    self._keys = stored.get("keys", {})
+                else:
+                    self._keys = {}
+            except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+                self._keys = {}
+        return self._keys
+
+    def save(self):
+
+        try:
+            os.makedirs(os.path.dirname(self.store_file), exist_ok=True)
+            with open(self.store_file, 'w', encoding='utf-8') as f:
+                json.dump({"version": KEYS_VERSION, "pinyin": HAS_PINYIN, "keys": self._keys},
+                          f, ensure_ascii=False, separators=(',', ':'))
+            return True
+        except Exception as e:
+            # print(f"Save sort keys wrong: {e}")
+            return False
+
+    def refresh(self, entries):
+        """Keys for the titles of an {id: data} bank: only titles never seen get one made,
+        titles no entry has any more are dropped. Returns: number of keys made"""
+
+        keys = self.load()
+        titles = {data.get('title', '') for data in entries.values()}
+
+        made = 0
+        for title in titles:
+            if title not in keys:
+                keys[title] = make_key(title)
+                made += 1
+
+        removed = [title for title in keys if title not in titles]
+        for title in removed:
+            del keys[title]
+
+        if made or removed:
+            self.save()
+        return made
+
+    def key(self, title):
+        """Sort key of a title (made on the spot for a title refresh has not seen)"""
+
+        keys = self.load()
+        if title not in keys:
+            keys[title] = make_key(title)
+        return keys[title]
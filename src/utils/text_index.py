@@ -0,0 +1,242 @@
+import hashlib
+import json
+import os
+
+from src.utils.path_finder import get_saves_path
+
+# Bump when terms are cut differently, every entry is then indexed again once
+TERMS_VERSION = 1
+
+# Text fields the filter and the library search box look in
+TEXT_FIELDS = ['title', 'intro', 'notes']
+
+# Han, kana and hangul: no spaces between words, so they are cut in bigrams
+CJK_RANGES = [
+    ('\u3040', '\u30ff'),  # Hiragana, Katakana
+    ('\u3400', '\u4dbf'),  # CJK Extension A
+    ('\u4e00', '\u9fff'),  # CJK Unified
+    ('\uac00', '\ud7af'),  # Hangul
+    ('\uf900', '\ufaff'),  # CJK Compatibility
+]
+
+# --- Terms --- #
+
+def is_cjk(char):
+
+    return any(low <= char <= high for low, high in CJK_RANGES)
+
+def split_runs(text):
+    """Lowercased runs of a text: [("word", "abc1"), ("cjk", "東一局")], anything else splits them"""
+
+    runs = []
+    kind = None
+    current = ""
+    for char in text.lower():
+        char_kind = "cjk" if is_cjk(char) else "word" if char.isalnum() else None
+        if char_kind != kind and current:
+            runs.append((kind, current))
+            current = ""
+        kind = char_kind
+        if char_kind:
+            current += char
+    if current:
+        runs.append((kind, current))
+    return runs
+
+def terms_of(text):
+    """Index terms of a text: Latin words whole, CJK runs as bigrams (a lone CJK character as itself)"""
+
+    terms = set()
+    for kind, run in split_runs(text):
+        if kind == "word" or len(run) == 1:
+            terms.add(run)
+        else:
+            terms.update(run[i:i + 2] for i in range(len(run) - 1))
+    return terms
+
+def query_terms(text):
+    """What a text found as a substring must hold: (terms present as they are, pieces of some term).
+    A Latin word or lone CJK character of the query can be cut off at its ends, so it is only part of a term"""
+
+    exact = set()
+    partial = set()
+    for kind, run in split_runs(text):
+        if kind == "word" or len(run) == 1:
+            partial.add(run)
+        else:
+            exact.update(run[i:i + 2] for i in range(len(run) - 1))
+    return exact, partial
+
+# --- Index --- #
+
+class TextIndex:
+    def __init__(self, store_file=None):
+        """Set terms store file (beside data.json), the store itself is loaded on first use"""
+
+        self.store_file = store_file or get_saves_path("text_index.json")
+        self._records = None
+        self.postings = {field: {} for field in TEXT_FIELDS}  # field -> term -> ids
+        self.indexed = {}   # id -> fingerprint its postings were added with
+        self.entries = {}
+        self._matches = {}  # (text, fields) -> ids, until the index changes
+
+    @staticmethod
+    def fingerprint(data):
+        """Hash of the text fields"""
+
+        fields = [str(TERMS_VERSION)] + [str(data.get(field, '')) for field in TEXT_FIELDS]
+        return hashlib.sha1('\x1f'.join(fields).encode('utf-8')).hexdigest()
+
+    def load(self):
+
+        if self._records is None:
+            try:
+                with open(self.store_file, 'r', encoding='utf-8') as f:
+                    self._records = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._records = {}
+        return self._records
+
+    def save(self):
+
+        try:
+            os.makedirs(os.path.dirname(self.store_file), exist_ok=True)
+            with open(self.store_file, 'w', encoding='utf-8') as f:
+                json.dump(self._records, f, ensure_ascii=False, separators=(',', ':'))
+            return True
+        except Exception as e:
+            # print(f"Save text index wrong: {e}")
+            return False
+
+    def refresh(self, entries):
+        """Bring the index in line with an {id: data} bank: only new or edited entries are cut into terms
+        (the others come from the store file), deleted ones dropped. Returns: number of entries cut"""
+
+        records = self.load()
+        self.entries = entries
+
+        removed = [entry_id for entry_id in self.indexed if entry_id not in entries]
+        for entry_id in removed:
+            self.remove_postings(entry_id)
+        dropped = [entry_id for entry_id in records if entry_id not in entries]
+        for entry_id in dropped:
+            del records[entry_id]
+
+        cut = 0
+        for entry_id, data in entries.items():
+            fingerprint = TextIndex.fingerprint(data)
+            if self.indexed.get(entry_id) == fingerprint:
+                continue
+            # Out with the terms it was indexed with, before its record is replaced
+            self.remove_postings(entry_id)
+            record = records.get(entry_id)
+            if record is None or record.get("fingerprint") != fingerprint:
+                record = {"fingerprint": fingerprint,
+                          "terms": {field: sorted(terms_of(str(data.get(field, '')))) for field in TEXT_FIELDS}}
+                records[entry_id] = record
+                cut += 1
+            self.add_postings(entry_id, record)
+
+        if cut or dropped:
+            self.save()
+        return cut
+
+    def add_postings(self, entry_id, record):
+
+        for field in TEXT_FIELDS:
+            postings = self.postings[field]
+            for term in record["terms"].get(field, []):
+                postings.setdefault(term, set()).add(entry_id)
+        self.indexed[entry_id] = record["fingerprint"]
+        self._matches.clear()
+
+    def remove_postings(self, entry_id):
+
+        if self.indexed.pop(entry_id, None) is None:
+            return
+        record = self.load().get(entry_id)
+        if record is not None:
+            for field in TEXT_FIELDS:
+                postings = self.postings[field]
+                for term in record["terms"].get(field, []):
+                    ids = postings.get(term)
+                    if ids is not None:
+                        ids.discard(entry_id)
+                        if not ids:
+                            del postings[term]
+        self._matches.clear()
+
+    def candidates(self, text, field):
+        """Ids that may hold text in a field (a superset), None when the text has nothing to look up"""
+
+        exact, partial = query_terms(text)
+        if not exact and not partial:
+            return None
+
+        postings = self.postings.get(field, {})
+        sets = []
+        for term in exact:
+            ids = postings.get(term)
+            if not ids:
+                return set()
+            sets.append(ids)
+        for piece in partial:
+            ids = set()
+            for term, term_ids in postings.items():
+                if piece in term:
+                    ids |= term_ids
+            if not ids:
+                return set()
+            sets.append(ids)
+
+        sets.sort(key=len)
+        result = set(sets[0])
+        for ids in sets[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
+
+    def matches(self, text, fields=TEXT_FIELDS):
+        """Ids whose text (any of fields) holds text, case ignored: same result as a substring scan,
+        only the candidates of the index are looked at"""
+
+        key = (text, tuple(fields))
+        if key in self._matches:
+            return self._matches[key]
+
+        search_text = text.lower()
+        found = set()
+        for field in fields:
+            candidates = self.candidates(text, field)
+            if candidates is None:
+                candidates = self.entries.keys()
+            for entry_id in candidates:
+                if entry_id not in found and search_text in str(self.entries[entry_id].get(field, '')).lower():
+                    found.add(entry_id)
+
+        self._matches[key] = found
+        return found
+
+def main():
+    """Search title, intro and notes of the bank: py -m src.utils.text_index <text>"""
+
+    import sys
+    import time
+    from src.utils.data_manager import DataManager
+
+    if len(sys.argv) < 2:
+        print(main.__doc__)
+        sys.exit(1)
+    entries = DataManager().load_all_data()
+    index = TextIndex()
+    cut = index.refresh(entries)
+    start = time.perf_counter()
+    found = index.matches(sys.argv[1])
+    elapsed = time.perf_counter() - start
+    for entry_id in list(found)[:20]:
+        print(f"{entries[entry_id].get('title', '')} ({entry_id})")
+    print(f"{len(found)} of {len(entries)} entries in {elapsed * 1000:.1f}ms ({cut} indexed)")
+
+if __name__ == "__main__":
+    main()
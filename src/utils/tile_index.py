@@ -0,0 +1,106 @@
+from collections import Counter
+
+from src.utils.validators import Validator
+
+class TileIndex:
+    def __init__(self):
+        """Tile -> posting lists: postings[tile][k - 1] holds the ids with at least k copies of tile,
+        so "at least these tiles" is one set intersection per distinct searched tile"""
+
+        self.postings = {}
+        self.hands = {}  # Hands string each id was indexed from, to see what changed
+
+    def build(self, entries):
+        """Index a whole {id: data} bank in one pass"""
+
+        self.postings.clear()
+        self.hands.clear()
+        for entry_id, data in entries.items():
+            self.add(entry_id, data)
+        return self
+
+    def refresh(self, entries):
+        """Bring the index in line with an {id: data} bank: only new, changed or deleted
+        entries are touched. Returns: number of entries (re)indexed or removed"""
+
+        removed = [entry_id for entry_id in self.hands if entry_id not in entries]
+        for entry_id in removed:
+            self.remove(entry_id)
+
+        changed = 0
+        for entry_id, data in entries.items():
+            if self.hands.get(entry_id) != data.get('hands', ''):
+                self.add(entry_id, data)
+                changed += 1
+        return changed + len(removed)
+
+    def add(self, entry_id, data):
+
+        if entry_id in self.hands:
+            self.remove(entry_id)
+        hands = data.get('hands', '')
+        self.hands[entry_id] = hands
+        for tile, count in Counter(Validator._parse_tiles_from_string(hands)).items():
+            lists = self.postings.setdefault(tile, [])
+            while len(lists) < count:
+                lists.append(set())
+            for k in range(count):
+                lists[k].add(entry_id)
+
+    def remove(self, entry_id):
+
+        hands = self.hands.pop(entry_id, None)
+        if hands is None:
+            return
+        for tile, count in Counter(Validator._parse_tiles_from_string(hands)).items():
+            lists = self.postings.get(tile, [])
+            for k in range(min(count, len(lists))):
+                lists[k].discard(entry_id)
+            # Drop emptied lists from the top, so a count nobody has any more is not kept
+            while lists and not lists[-1]:
+                lists.pop()
+            if not lists:
+                self.postings.pop(tile, None)
+
+    def find(self, search_tiles):
+        """Ids whose hands hold every tile of search_tiles ("1m1m5p" needs two 1m), as a set.
+        Red fives count as their own tile, like the search has always done"""
+
+        wanted = Counter(Validator._parse_tiles_from_string(search_tiles))
+        if not wanted:
+            return set(self.hands)
+
+        lists = []
+        for tile, count in wanted.items():
+            tile_lists = self.postings.get(tile, [])
+            if len(tile_lists) < count:
+                return set()
+            lists.append(tile_lists[count - 1])
+
+        # Smallest list first, the intersection can only shrink
+        lists.sort(key=len)
+        result = set(lists[0])
+        for ids in lists[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
+
+def main():
+    """Count the entries holding some tiles: py -m src.utils.tile_index 123m55z"""
+
+    import sys
+    from src.utils.data_manager import DataManager
+
+    if len(sys.argv) < 2:
+        print(main.__doc__)
+        sys.exit(1)
+    entries = DataManager().load_all_data()
+    index = TileIndex().build(entries)
+    found = index.find(sys.argv[1])
+    for entry_id in list(found)[:20]:
+        print(f"{entries[entry_id].get('title', '')} ({entry_id})")
+    print(f"{len(found)} of {len(entries)} entries hold {sys.argv[1]}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+import json
+import os
+from PyQt5.QtCore import Qt, QRect, QRectF
+from PyQt5.QtGui import QPixmap, QPainter
+
+from src.utils.path_finder import get_resource_path, get_saves_path
+
+TILES_DIR = os.path.join("src", "assets", "tiles")
+
+# Sizes the app draws tiles at: library grid and list, tile selector, dora box, quiz hand
+ATLAS_SIZES = [(21, 37), (31, 47), (42, 60), (45, 60), (56, 80)]
+# Built on first run (and again whenever a tile file changes), beside the other saves
+ATLAS_DIR = "atlas"
+ATLAS_INDEX = "atlas.json"
+
+class TilePixmaps:
+    """Process wide cache of the tile faces: every file is read once, every size scaled once.
+    QPixmap is implicitly shared, so handing out the cached one costs nothing"""
+
+    _originals = {}
+    _scaled = {}
+    _stats = {"loads": 0, "scales": 0, "hits": 0, "missing": 0, "atlas_loads": 0, "atlas_builds": 0}
+
+    @staticmethod
+    def names():
+        """Every tile face there is a file for ("0m"..."7z", "back")"""
+
+        folder = get_resource_path(TILES_DIR)
+        try:
+            return sorted(filename[:-4] for filename in os.listdir(folder) if filename.endswith(".png"))
+        except OSError:
+            return []
+
+    @staticmethod
+    def original(tile):
+        """Tile face at its file size ("1m", "0p", "back"...), a null pixmap if there is no such file"""
+
+        if tile not in TilePixmaps._originals:
+            path = get_resource_path(os.path.join(TILES_DIR, f"{tile}.png"))
+            pixmap = QPixmap(path) if os.path.exists(path) else QPixmap()
+            if pixmap.isNull():
+                TilePixmaps._stats["missing"] += 1
+            else:
+                TilePixmaps._stats["loads"] += 1
+            TilePixmaps._originals[tile] = pixmap
+        return TilePixmaps._originals[tile]
+
+    @staticmethod
+    def get(tile, width, height, ratio=1.0):
+        """Tile face fitted (aspect kept, smooth) in width x height logical pixels.
+        ratio: device pixel ratio of the screen it goes to, so it stays sharp on high DPI screens"""
+
+        key = (tile, width, height, ratio)
+        pixmap = TilePixmaps._scaled.get(key)
+        if pixmap is not None:
+            TilePixmaps._stats["hits"] += 1
+            return pixmap
+
+        # Common sizes are cut from their atlas, no tile file is read for them
+        if (width, height) in ATLAS_SIZES:
+            pixmap = TileAtlas.get(width, height, ratio).pixmap(tile)
+            TilePixmaps._scaled[key] = pixmap
+            return pixmap
+
+        pixmap = TilePixmaps.original(tile)
+        if not pixmap.isNull():
+            pixmap = pixmap.scaled(int(round(width * ratio)), int(round(height * ratio)), Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            pixmap.setDevicePixelRatio(ratio)
+            TilePixmaps._stats["scales"] += 1
+        TilePixmaps._scaled[key] = pixmap
+        return pixmap
+
+    @staticmethod
+    def stats():
+        """Counters since start: files read, sizes scaled, cache hits, missing files, and what is held"""
+
+        result = dict(TilePixmaps._stats)
+        result["originals"] = len(TilePixmaps._originals)
+        result["sizes"] = len(TilePixmaps._scaled)
+        return result
+
+    @staticmethod
+    def clear():
+        """Drop everything (tile assets replaced while running)"""
+
+        TilePixmaps._originals.clear()
+        TilePixmaps._scaled.clear()
+        TileAtlas._atlases.clear()
+
+# --- Atlas --- #
+
+class TileAtlas:
+    """Every tile face at one size side by side in one image: one file to read at start,
+    and hands are painted as blits of parts of one pixmap"""
+
+    _atlases = {}
+
+    def __init__(self, image, rects, ratio):
+
+        self.image = image
+        self.rects = rects  # {tile: QRect in atlas (device) pixels}
+        self.ratio = ratio
+
+    @staticmethod
+    def get(width, height, ratio=1.0):
+        """Atlas of one size: loaded from saves/atlas when it is still up to date, built otherwise"""
+
+        key = (width, height, ratio)
+        if key not in TileAtlas._atlases:
+            atlas = TileAtlas.load(width, height, ratio)
+            if atlas is None:
+                atlas = TileAtlas.build(width, height, ratio)
+                atlas.save(width, height)
+            TileAtlas._atlases[key] = atlas
+        return TileAtlas._atlases[key]
+
+    @staticmethod
+    def fingerprint():
+        """Names, sizes and times of the tile files, an atlas made from other files is stale"""
+
+        folder = get_resource_path(TILES_DIR)
+        parts = []
+        for name in TilePixmaps.names():
+            stat = os.stat(os.path.join(folder, f"{name}.png"))
+            parts.append(f"{name}:{stat.st_size}:{int(stat.st_mtime)}")
+        return "|".join(parts)
+
+    @staticmethod
+    def file_name(width, height, ratio):
+
+        return f"tiles_{width}x{height}@{ratio:g}.png"
+
+    @staticmethod
+    def load_index():
+
+        try:
+            with open(get_saves_path(os.path.join(ATLAS_DIR, ATLAS_INDEX)), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    @staticmethod
+    def load(width, height, ratio):
+        """Atlas from its file, None when missing or made from other tile files"""
+
+        index = TileAtlas.load_index()
+        name = TileAtlas.file_name(width, height, ratio)
+        entry = index.get("atlases", {}).get(name)
+        if not entry or index.get("fingerprint") != TileAtlas.fingerprint():
+            return None
+        image = QPixmap(get_saves_path(os.path.join(ATLAS_DIR, name)))
+        if image.isNull():
+            return None
+        image.setDevicePixelRatio(ratio)
+        TilePixmaps._stats["atlas_loads"] += 1
+        rects = {tile: QRect(*rect) for tile, rect in entry.items()}
+        return TileAtlas(image, rects, ratio)
+
+    @staticmethod
+    def build(width, height, ratio):
+        """Scale every tile file once and put them in one row"""
+
+        pixmaps = {}
+        for name in TilePixmaps.names():
+            original = TilePixmaps.original(name)
+            if not original.isNull():
+                pixmaps[name] = original.scaled(int(round(width * ratio)), int(round(height * ratio)),
+                                                Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+        total_width = sum(pixmap.width() for pixmap in pixmaps.values())
+        total_height = max([pixmap.height() for pixmap in pixmaps.values()], default=0)
+        image = QPixmap(max(1, total_width), max(1, total_height))
+        image.fill(Qt.transparent)
+
+        rects = {}
+        painter = QPainter(image)
+        x = 0
+        for name, pixmap in pixmaps.items():
+            painter.drawPixmap(x, 0, pixmap)
+            rects[name] = QRect(x, 0, pixmap.width(), pixmap.height())
+            x += pixmap.width()
+        painter.end()
+
+        image.setDevicePixelRatio(ratio)
+        TilePixmaps._stats["atlas_builds"] += 1
+        return TileAtlas(image, rects, ratio)
+
+    def save(self, width, height):
+        """Write the atlas image and its rects, failing quietly (it is only a cache)"""
+
+        try:
+            folder = get_saves_path(ATLAS_DIR)
+            os.makedirs(folder, exist_ok=True)
+            name = TileAtlas.file_name(width, height, self.ratio)
+            if not self.image.save(os.path.join(folder, name), "PNG"):
+                return False
+
+            index = TileAtlas.load_index()
+            fingerprint = TileAtlas.fingerprint()
+            if index.get("fingerprint") != fingerprint:
+                index = {"fingerprint": fingerprint, "atlases": {}}
+            index["atlases"][name] = {tile: [rect.x(), rect.y(), rect.width(), rect.height()] for tile, rect in self.rects.items()}
+            with open(os.path.join(folder, ATLAS_INDEX), 'w', encoding='utf-8') as f:
+                json.dump(index, f, separators=(',', ':'))
+            return True
+        except Exception as e:
+            # print(f"Save atlas wrong: {e}")
+            return False
+
+    def logical_size(self, tile):
+        """Size of one tile in logical pixels, None when there is no such tile"""
+
+        rect = self.rects.get(tile)
+        if rect is None:
+            return None
+        return int(rect.width() / self.ratio), int(rect.height() / self.ratio)
+
+    def pixmap(self, tile):
+        """One tile cut out of the atlas, a null pixmap when there is no such tile"""
+
+        rect = self.rects.get(tile)
+        if rect is None:
+            return QPixmap()
+        pixmap = self.image.copy(rect)
+        pixmap.setDevicePixelRatio(self.ratio)
+        return pixmap
+
+    def draw(self, painter, x, y, tile):
+        """Blit one tile with its top left at (x, y) logical pixels. False when there is no such tile"""
+
+        rect = self.rects.get(tile)
+        if rect is None:
+            return False
+        width, height = self.logical_size(tile)
+        painter.drawPixmap(QRectF(x, y, width, height), self.image, QRectF(rect))
+        return True
+
+def main():
+    """Build the tile atlases ahead of the first run: py -m src.utils.tile_pixmaps [ratio...]"""
+
+    import sys
+    from PyQt5.QtGui import QGuiApplication
+
+    app = QGuiApplication(sys.argv[:1])
+    ratios = [float(arg) for arg in sys.argv[1:]] or [1.0]
+    for ratio in ratios:
+        for width, height in ATLAS_SIZES:
+            TileAtlas.build(width, height, ratio).save(width, height)
+            print(f"{TileAtlas.file_name(width, height, ratio)} -> {get_saves_path(ATLAS_DIR)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+import os
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+from src.utils.path_finder import get_resource_path
+
+TILES_DIR = os.path.join("src", "assets", "tiles")
+
+# Tiles are found at a small size (fast), then each one found is read again at a bigger size
+FIND_H, FIND_W = 32, 22
+READ_H, READ_W = 56, 39
+# Band height in the crop tiles are found in: the tile plus some room to slide up and down
+BAND_H = 38
+# Tile height against the band's bright rows, to allow for shadows and highlights
+SCALES = (0.9, 1.0, 1.1)
+# Room around a found tile when it is read again, for the last bit of alignment
+READ_PAD = 0.12
+# Inner part of a template that is compared (the rounded corners and frame are left out)
+TEMPLATE_MARGIN = 0.08
+
+MIN_SCORE = 0.4
+# A plain white window is a haku: there is nothing to correlate on it
+FLAT_STD = 0.03
+FLAT_SCORE = 0.6
+# Bands are looked for on a screenshot sampled down to about this width
+FIND_WIDTH = 640
+# Bright, grey pixels: the tile faces
+FACE_VALUE = 0.7
+FACE_SATURATION = 0.2
+
+# --- Image helpers --- #
+
+def _to_rgb(image):
+    """Float RGB in [0, 1] from a uint8/float RGB(A) array"""
+
+    image = np.asarray(image)
+    if image.dtype == np.uint8:
+        image = image.astype(np.float32) / 255.0
+    return image[..., :3].astype(np.float32)
+
+def _resize(image, height, width):
+    """Bilinear resize of an H x W x C array"""
+
+    src_h, src_w = image.shape[:2]
+    ys = np.clip((np.arange(height) + 0.5) * src_h / height - 0.5, 0, src_h - 1)
+    xs = np.clip((np.arange(width) + 0.5) * src_w / width - 0.5, 0, src_w - 1)
+    y0 = np.floor(ys).astype(int)
+    x0 = np.floor(xs).astype(int)
+    y1 = np.minimum(y0 + 1, src_h - 1)
+    x1 = np.minimum(x0 + 1, src_w - 1)
+    wy = (ys - y0).astype(np.float32)[:, None, None]
+    wx = (xs - x0).astype(np.float32)[None, :, None]
+    top = image[y0][:, x0] * (1 - wx) + image[y0][:, x1] * wx
+    bottom = image[y1][:, x0] * (1 - wx) + image[y1][:, x1] * wx
+    return top * (1 - wy) + bottom * wy
+
+def _normalize(rows):
+    """Zero mean, unit length rows, so a dot product is the normalized cross-correlation"""
+
+    rows = rows - rows.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(rows, axis=1, keepdims=True)
+    return rows / np.maximum(norms, 1e-6)
+
+def _tiles_text(tiles):
+    """Tiles in screen order as a hand string, "123m45p6m" (the drawn tile stays last)"""
+
+    text = ""
+    for i, tile in enumerate(tiles):
+        text += tile[0]
+        if i == len(tiles) - 1 or tiles[i + 1][1] != tile[1]:
+            text += tile[1]
+    return text
+
+# --- Recognizer --- #
+
+class TileRecognizer:
+    def __init__(self, templates=None):
+        """templates: {name: RGB array}, the tile assets are read on first use when not given"""
+
+        self.templates = templates
+        self._matrices = {}
+
+    @staticmethod
+    def from_qimage(image):
+        """RGB array of a QImage (a pasted or loaded screenshot)"""
+
+        from PyQt5.QtGui import QImage
+
+        image = image.convertToFormat(QImage.Format_RGB888)
+        width, height = image.width(), image.height()
+        data = image.constBits()
+        data.setsize(image.bytesPerLine() * height)
+        rows = np.frombuffer(data, np.uint8).reshape(height, image.bytesPerLine())
+        return rows[:, :width * 3].reshape(height, width, 3).copy()
+
+    @staticmethod
+    def load_templates():
+        """Tile assets as {name: RGB array}, "back" included so face down dora are told apart"""
+
+        from PyQt5.QtGui import QImage
+
+        templates = {}
+        folder = get_resource_path(TILES_DIR)
+        for filename in sorted(os.listdir(folder)):
+            if filename.endswith(".png"):
+                image = QImage(os.path.join(folder, filename))
+                if not image.isNull():
+                    templates[filename[:-4]] = TileRecognizer.from_qimage(image)
+        return templates
+
+    def _template_matrix(self, height, width):
+        """Normalized templates at one size, one row each (built once per size)"""
+
+        if self.templates is None:
+            self.templates = TileRecognizer.load_templates()
+        if (height, width) not in self._matrices:
+            rows = []
+            for image in self.templates.values():
+                image = _to_rgb(image)
+                h, w = image.shape[:2]
+                dy, dx = int(h * TEMPLATE_MARGIN), int(w * TEMPLATE_MARGIN)
+                rows.append(_resize(image[dy:h - dy, dx:w - dx], height, width).ravel())
+            self._matrices[(height, width)] = _normalize(np.array(rows, dtype=np.float32))
+        return self._matrices[(height, width)], list(self.templates)
+
+    def _score(self, windows, height, width):
+        """Best template of every window: (indexes, scores)"""
+
+        matrix, names = self._template_matrix(height, width)
+        best = np.zeros(len(windows), dtype=int)
+        best_scores = np.zeros(len(windows), dtype=np.float32)
+
+        # Windows over the table or a gap are dark on average, whatever they would correlate with
+        means = windows.mean(axis=1)
+        bright = np.nonzero(means >= FACE_VALUE * 0.8)[0]
+        if not bright.size:
+            return best, best_scores
+        centered = windows[bright] - means[bright, None]
+        norms = np.linalg.norm(centered, axis=1)
+        scores = (centered / np.maximum(norms, 1e-6)[:, None]) @ matrix.T
+        best[bright] = scores.argmax(axis=1)
+        best_scores[bright] = scores[np.arange(len(bright)), best[bright]]
+
+        if "5z" in names:
+            flat = bright[norms / np.sqrt(windows.shape[1]) < FLAT_STD]
+            best[flat] = names.index("5z")
+            best_scores[flat] = FLAT_SCORE
+        return best, best_scores
+
+    @staticmethod
+    def find_bands(rgb):
+        """Row bands full of tile faces: [(top, bottom, left, right)], top to bottom"""
+
+        value = rgb.max(axis=2)
+        saturation = value - rgb.min(axis=2)
+        face = (value > FACE_VALUE) & (saturation < FACE_SATURATION)
+
+        height, width = face.shape
+        rows = face.sum(axis=1) >= max(3, width * 0.012)
+        # Ink on the faces can break a band for a row or two
+        for y in np.nonzero(~rows)[0]:
+            if rows[max(0, y - 2):y].any() and rows[y + 1:y + 3].any():
+                rows[y] = True
+        min_height = max(5, height // 60)
+
+        bands = []
+        start = None
+        for y, on in enumerate(np.append(rows, False)):
+            if on and start is None:
+                start = y
+            elif not on and start is not None:
+                if y - start >= min_height:
+                    columns = np.nonzero(face[start:y].mean(axis=0) > 0.3)[0]
+                    if columns.size:
+                        bands.append((start, y, int(columns[0]), int(columns[-1]) + 1))
+                start = None
+        return bands
+
+    def find_tiles(self, image, band):
+        """Boxes of the tiles in one band, left to right: [(x, y, width, height)] in image pixels"""
+
+        top, bottom, left, right = band
+        tile_h = bottom - top
+
+        # Crop with some room around the faces and scale it so the band is BAND_H high
+        pad = int(tile_h * 0.2)
+        y0, x0 = max(0, top - pad), max(0, left - pad)
+        crop = _to_rgb(image[y0:bottom + pad, x0:right + pad])
+        scale = BAND_H / crop.shape[0]
+        crop = _resize(crop, BAND_H, max(FIND_W + 1, int(crop.shape[1] * scale)))
+
+        candidates = []
+        for factor in SCALES:
+            # Resize the crop instead of the templates, so the template matrix is built only once
+            h = max(FIND_H + 1, int(round(BAND_H / factor * FIND_H / (tile_h * scale))))
+            w = max(FIND_W + 1, int(round(crop.shape[1] * h / BAND_H)))
+            windows = np.lib.stride_tricks.sliding_window_view(_resize(crop, h, w), (FIND_H, FIND_W, 3))[::2, ::2, 0]
+            ny, nx = windows.shape[:2]
+            _, scores = self._score(windows.reshape(ny * nx, -1), FIND_H, FIND_W)
+            # Keep the best vertical offset of every column
+            scores = scores.reshape(ny, nx)
+            rows = scores.argmax(axis=0)
+            # Back to image pixels
+            ratio = BAND_H / h / scale
+            for x in range(nx):
+                if scores[rows[x], x] >= MIN_SCORE:
+                    candidates.append((float(scores[rows[x], x]), x0 + 2 * x * ratio, y0 + 2 * rows[x] * ratio,
+                                       FIND_W * ratio, FIND_H * ratio))
+
+        # Greedy non-maximum suppression along the band
+        candidates.sort(key=lambda candidate: -candidate[0])
+        kept = []
+        for candidate in candidates:
+            centre, width = candidate[1] + candidate[3] / 2, candidate[3]
+            if all(abs(centre - other[1] - other[3] / 2) >= 0.8 * max(width, other[3]) for other in kept):
+                kept.append(candidate)
+        kept.sort(key=lambda candidate: candidate[1])
+        return [box for _, *box in kept]
+
+    def read_tile(self, image, box):
+        """Name of the tile in one box, read at READ_H x READ_W with a little room to align"""
+
+        x, y, width, height = box
+        pad_x, pad_y = width * READ_PAD, height * READ_PAD
+        top, left = max(0, int(y - pad_y)), max(0, int(x - pad_x))
+        crop = _to_rgb(image[top:int(y + height + pad_y) + 1, left:int(x + width + pad_x) + 1])
+        size_h = int(round(READ_H * crop.shape[0] / height))
+        size_w = int(round(READ_W * crop.shape[1] / width))
+        crop = _resize(crop, max(READ_H, size_h), max(READ_W, size_w))
+
+        windows = np.lib.stride_tricks.sliding_window_view(crop, (READ_H, READ_W, 3))[::2, ::2, 0]
+        best, scores = self._score(windows.reshape(-1, READ_H * READ_W * 3), READ_H, READ_W)
+        top_window = scores.argmax()
+        return list(self.templates)[best[top_window]], float(scores[top_window])
+
+    def match_band(self, image, band):
+        """Tiles of one band, left to right: [(name, score)]"""
+
+        return [self.read_tile(image, box) for box in self.find_tiles(image, band)]
+
+    def recognize(self, image):
+        """Hand and dora of a screenshot (RGB array).
+        The band with the most tiles is the hand, a short band above it the dora indicators.
+        Returns: {"hands": str, "dora": str}, empty strings when nothing was found"""
+
+        if not HAS_NUMPY:
+            return {"hands": "", "dora": ""}
+
+        image = np.asarray(image)
+        # Bands are found on a sample of the screenshot, tiles are then read at full resolution
+        step = max(1, image.shape[1] // FIND_WIDTH)
+        bands = [tuple(value * step for value in band) for band in TileRecognizer.find_bands(_to_rgb(image[::step, ::step]))]
+
+        found = []
+        for band in bands:
+            tiles = [name for name, _ in self.match_band(image, band)]
+            if tiles:
+                found.append((band, tiles))
+        if not found:
+            return {"hands": "", "dora": ""}
+
+        hand_band, hand_tiles = max(found, key=lambda item: len(item[1]))
+        dora = ""
+        for band, tiles in found:
+            shown = [tile for tile in tiles if tile != "back"]
+            if band[0] < hand_band[0] and 1 <= len(shown) <= 5:
+                dora = _tiles_text(shown)
+                break
+
+        return {"hands": _tiles_text([tile for tile in hand_tiles if tile != "back"]), "dora": dora}
@@ -52,95 +52,31 @@ class Validator:
 
     @staticmethod
     def can_chi(hands_text):
-        """Check if can chi"""
+        """Check if can chi (every concrete call is in src/utils/melds.py)"""
 
-        '''print(len(hands_text))'''
-        if not hands_text:
-            return False
-            
-        tile_list = Validator._parse_tiles_from_string(hands_text)
-        
-        suits = {'m': [], 'p': [], 's': []}
-        
-        for tile in tile_list:
-            num = tile[0]
-            suit = tile[1]
-            if suit in suits:
-                fivedized_num = '5' if num == '0' else num
-                suits[suit].append(int(fivedized_num))
-        
-        # Check m, p, s
-        for suit, numbers in suits.items():
-            if len(numbers) < 2:
-                continue
-                
-            # Remove repeat tiles
-            sorted_nums = sorted(set(numbers))
-            
-            for i in range(len(sorted_nums)):
-                current = sorted_nums[i]
-                
-                # Check if consecutive tiles
-                if (current + 1 in sorted_nums):
-                    return True
-                
-                # Check if closed wait (?)
-                if (current + 2 in sorted_nums):
-                    return True
-        
-        return False
+        from src.utils.melds import Melds
+        return Melds.can_call(hands_text, "chi")
 
     @staticmethod
     def can_pon(hands_text):
         """Check if can pon"""
 
-        if not hands_text:
-            return False
-            
-        tile_list = Validator._parse_tiles_from_string(hands_text)
-
-        fivedized_tiles = [Validator._fivedize_zero(tile) for tile in tile_list]
-        tile_counter = Counter(fivedized_tiles)
-        
-        # Find out all pairs
-        pairs = [tile for tile, count in tile_counter.items() if count >= 2]
-        
-        if not pairs:
-            return False
-        
-        # Check if all pairs are in 4
-        all_pairs_are_quads = all(tile_counter[tile] == 4 for tile in pairs)
-        
-        return not all_pairs_are_quads
+        from src.utils.melds import Melds
+        return Melds.can_call(hands_text, "pon")
 
     @staticmethod
     def can_kan(hands_text):
         """Check if can kan"""
 
-        if not hands_text:
-            return False
-            
-        tile_list = Validator._parse_tiles_from_string(hands_text)
-
-        fivedized_tiles = [Validator._fivedize_zero(tile) for tile in tile_list]
-        tile_counter = Counter(fivedized_tiles)
-        
-        # Find out all triplets
-        triplets = [tile for tile, count in tile_counter.items() if count >= 3]
-        
-        if not triplets:
-            return False
-        
-        # Check if all triplets are in 4
-        all_triplets_are_quads = all(tile_counter[tile] == 4 for tile in triplets)
-        
-        return not all_triplets_are_quads
+        from src.utils.melds import Melds
+        return Melds.can_call(hands_text, "kan")
     
     '''@staticmethod
     def get_required_tiles_for_meld(hands_text, action_type):
         """Get tiles those must be used for furo, to disable them in tile selector.. @.@
         This is extremely difficult so I have given up. 
-        You will need to find all possible Chi combinations, to disable tiles those "are totally not possible to be discarded" after a Chi. Which is very difficult. """
+        You will need to find all possible Chi combinations, to disable tiles those "are totally not possible to be discarded" after a Chi. Which is very difficult. 
+        Done at last: see Melds.discardable_tiles in src/utils/melds.py """
 
         if not hands_text:
             return []
@@ -398,122 +334,27 @@ class Validator:
         
         return None
 
-    @staticmethod
-    def is_all_melds(cards):
-        """Check if all can be melds. Use recursion to check all combinations"""
-
-        if len(cards) == 0:
-            return True
-            
-        cards_sorted = sorted(cards)
-        
-        # Check triplets
-        if len(cards_sorted) >= 3 and cards_sorted[0] == cards_sorted[1] and cards_sorted[1] == cards_sorted[2]:
-            if Validator.is_all_melds(cards_sorted[3:]):
-                return True
-        
-        # Check straights
-        if cards_sorted[0] <= 29 and cards_sorted[0] % 10 <= 7:
-            if cards_sorted[0] + 1 in cards_sorted and cards_sorted[0] + 2 in cards_sorted:
-                new_cards = cards_sorted.copy()
-                new_cards.remove(cards_sorted[0])
-                new_cards.remove(cards_sorted[0] + 1)
-                new_cards.remove(cards_sorted[0] + 2)
-                if Validator.is_all_melds(new_cards):
-                    return True
-                    
-        return False
-
-    @staticmethod
-    def is_chiitoi(hand_codes):
-        """Check if is Chiitoi (seven pairs)"""
-
-        if len(hand_codes) != 14:
-            return False
-            
-        counts = {}
-        for code in hand_codes:
-            counts[code] = counts.get(code, 0) + 1
-            
-        # All tiles must be in pairs, and each type can only exist once
-        return all(count == 2 for count in counts.values()) and len(counts) == 7
-
-    @staticmethod
-    def is_kokushi(hand_codes):
-        """Check if is kokushi (13 1/9)"""
-
-        if len(hand_codes) != 14:
-            return False
-            
-        orphans = [1, 9, 11, 19, 21, 29, 31, 32, 33, 34, 35, 36, 37]
-        counts = {}
-        for code in hand_codes:
-            counts[code] = counts.get(code, 0) + 1
-            
-        # Must include all 1/9, and one type is in pair
-        has_duplicate = False
-        for orphan in orphans:
-            if orphan not in counts:
-                return False
-            if counts[orphan] == 2:
-                has_duplicate = True
-            elif counts[orphan] != 1:
-                return False
-                
-        return has_duplicate
-
     @staticmethod
     def is_agari(hand_codes):
-        """Check if is agari"""
+        """Check if is agari (table driven, see src/utils/waits.py)"""
 
-        n = len(hand_codes)
-        if n not in [2, 5, 8, 11, 14]:
-            return False
+        from src.utils.efficiency import Efficiency
+        from src.utils.waits import Waits
 
-        if n == 14:
-            if Validator.is_chiitoi(hand_codes):
-                return True
-            if Validator.is_kokushi(hand_codes):
-                return True
-        
-        # How many mentsu needs to be formed?
-        m = (n - 2) // 3
-        codes_sorted = sorted(hand_codes)
-        
-        # Try all
-        for i in set(codes_sorted):
-            if codes_sorted.count(i) >= 2:
-                new_codes = codes_sorted.copy()
-                new_codes.remove(i)
-                new_codes.remove(i)
-                if Validator.is_all_melds(new_codes):
-                    return True
-        return False
+        if len(hand_codes) not in [2, 5, 8, 11, 14]:
+            return False
+        return Waits.is_agari(Efficiency.to_counts(hand_codes))
 
     @staticmethod
     def is_tenpai(hand_codes):
-        """Check if is tenpai, by adding all tiles to it, and then check if is agari"""
+        """Check if is tenpai. Use Waits.enumerate when the waits themselves are needed"""
 
-        n = len(hand_codes)
-        if n not in [1, 4, 7, 10, 13]:
-            return False
-            
-        all_tiles = (
-            list(range(1, 10)) +
-            list(range(11, 20)) +
-            list(range(21, 30)) +
-            list(range(31, 38))
-        )
+        from src.utils.efficiency import Efficiency
+        from src.utils.waits import Waits
 
-        new_hand = []
-        
-        for tile in all_tiles:
-            # Check if that tile can be added
-            if hand_codes.count(tile) < 4:
-                new_hand = hand_codes + [tile]
-            if Validator.is_agari(new_hand):
-                return True
-        return False
+        if len(hand_codes) not in [1, 4, 7, 10, 13]:
+            return False
+        return Waits.enumerate(Efficiency.to_counts(hand_codes))["tenpai"]
     
     @staticmethod
     def check_mahjong_hand(hand_list):
@@ -536,25 +377,9 @@ class Validator:
                 return 0
             hand_codes.append(code)
         
-        # In turn
-        if n in [2, 5, 8, 11, 14]:
-            if Validator.is_agari(hand_codes):
-                return 3
-            else:
-                # Check if tenpai in turn: Remove tile one by one to create new hands, and check tenpai for each hands.
-                for tile in set(hand_codes):
-                    new_hand = hand_codes.copy()
-                    new_hand.remove(tile)
-                    if Validator.is_tenpai(new_hand):
-                        return 2
-                return 0
-                
-        # Out of turn      
-        elif n in [1, 4, 7, 10, 13]:
-            if Validator.is_tenpai(hand_codes):
-                return 1
-            else:
-                return 0
-                
-        else:
-            return 0
\ No newline at end of file
+        if n not in [1, 2, 4, 5, 7, 8, 10, 11, 13, 14]:
+            return 0
+
+        # One pass for both in turn and out of turn hands
+        from src.utils.waits import Waits
+        return Waits.hand_code(hand_codes)
\ No newline at end of file
@@ -0,0 +1,84 @@
+import random
+import re
+
+from src.utils.canonical import Canonical, _transform
+from src.utils.efficiency import Efficiency
+from src.utils.validators import Validator
+
+# Number runs right before a suit letter, e.g. "123m" or "0p" in hands and answers
+TILE_RUN = re.compile(r'([0-9]+)([mps])')
+
+IDENTITY = ((0, 1, 2), False)
+
+# --- Variants --- #
+
+class Variants:
+    @staticmethod
+    def transform_tile(tile, order, mirror):
+        """One tile string under a transform. A red 5 stays red (mirror keeps 5 on 5)"""
+
+        if tile[1] == 'z':
+            return tile
+        suit = 'mps'.index(tile[1])
+        rank = int(tile[0])
+        if rank and mirror:
+            rank = 10 - rank
+        return f"{rank}{'mps'[order[suit]]}"
+
+    @staticmethod
+    def transform_text(text, order, mirror):
+        """Every tile run in a string, keeping the run layout ("123m" -> "789m" mirrored)"""
+
+        def replace(match):
+            suit = 'mps'[order['mps'.index(match.group(2))]]
+            digits = "".join(str(10 - int(d)) if mirror and d != '0' else d for d in match.group(1))
+            return digits + suit
+
+        return TILE_RUN.sub(replace, text or "")
+
+    @staticmethod
+    def transform_dora(dora, order, mirror, tile_set):
+        """Indicators under a transform. With a mirror the indicator is not simply flipped:
+        the new indicator is the one pointing at the flipped dora"""
+
+        previous = {after: before for before, after in tile_set.dora_next.items()}
+
+        def replace(match):
+            if match.group(2) == 'z':
+                return match.group(0)
+            tiles = []
+            for digit in match.group(1):
+                tile = digit + match.group(2)
+                if not mirror:
+                    tiles.append(Variants.transform_tile(tile, order, mirror))
+                    continue
+                code = Validator.to_code(Validator._fivedize_zero(tile))
+                target = _transform(tile_set.dora_next.get(code, code), order, mirror)
+                tiles.append(Efficiency.code_to_tile(previous.get(target, target)))
+            return "".join(tiles)
+
+        return re.sub(r'([0-9]+)([mpsz])', replace, dora or "")
+
+    @staticmethod
+    def apply(data, order, mirror):
+        """Copy of an entry with hand, dora and answer transformed. Intro and notes are kept as they are:
+        in free text "30s" or "2000ms" cannot be told apart from tiles"""
+
+        if (order, mirror) == IDENTITY:
+            return dict(data)
+
+        tile_set = Efficiency.tile_set(data.get('players', ''))
+        variant = dict(data)
+        variant['hands'] = Variants.transform_text(data.get('hands', ''), order, mirror)
+        variant['dora'] = Variants.transform_dora(data.get('dora', ''), order, mirror, tile_set)
+        variant['answer_input'] = Variants.transform_text(data.get('answer_input', ''), order, mirror)
+        return variant
+
+    @staticmethod
+    def random_transform(data, rng=None):
+        """Any transform but the identity. Entries with an image keep theirs (the image cannot follow)"""
+
+        if data.get('image_filename', ''):
+            return IDENTITY
+        options = [option for option in Canonical.transforms(data.get('players', ''), mirror=True) if option != IDENTITY]
+        return (rng or random).choice(options)
@@ -0,0 +1,237 @@
+from functools import lru_cache
+from itertools import product
+
+from src.utils.efficiency import Efficiency, ALL_CODES, TERMINAL_CODES, SUIT_STARTS
+
+# Better shapes first, this is also the order used for the summary of a hand
+SHAPE_ORDER = ["ryanmen", "shanpon", "kanchan", "penchan", "nobetan", "tanki", "kokushi13", "kokushi"]
+
+# --- Decomposition tables --- #
+
+def _split_complete(counts, i, is_honor, blocks, pairs, found):
+    """Split one suit into mentsu and pairs, using every tile"""
+
+    while i < 9 and counts[i] == 0:
+        i += 1
+    if i >= 9:
+        found.add((tuple(blocks), pairs))
+        return
+
+    if counts[i] >= 3:
+        counts[i] -= 3
+        blocks.append(("koutsu", i))
+        _split_complete(counts, i, is_honor, blocks, pairs, found)
+        blocks.pop()
+        counts[i] += 3
+
+    if not is_honor and i <= 6 and counts[i + 1] and counts[i + 2]:
+        counts[i] -= 1; counts[i + 1] -= 1; counts[i + 2] -= 1
+        blocks.append(("shuntsu", i))
+        _split_complete(counts, i, is_honor, blocks, pairs, found)
+        blocks.pop()
+        counts[i] += 1; counts[i + 1] += 1; counts[i + 2] += 1
+
+    if counts[i] >= 2 and pairs == 0:
+        counts[i] -= 2
+        blocks.append(("pair", i))
+        _split_complete(counts, i, is_honor, blocks, pairs + 1, found)
+        blocks.pop()
+        counts[i] += 2
+
+@lru_cache(maxsize=None)
+def _suit_splits(suit_counts, is_honor):
+    """Every complete split of one suit, in ranks 0-8. Empty tuple if there is none"""
+
+    if is_honor:
+        # Honors never connect, so there is at most one split
+        blocks = []
+        pairs = 0
+        for rank, count in enumerate(suit_counts):
+            if count == 3:
+                blocks.append(("koutsu", rank))
+            elif count == 2:
+                blocks.append(("pair", rank))
+                pairs += 1
+            elif count:
+                return ()
+        return ((tuple(blocks), pairs),) if pairs <= 1 else ()
+
+    found = set()
+    _split_complete(list(suit_counts) + [0, 0], 0, False, [], 0, found)
+    return tuple(sorted(found))
+
+def _parts(counts):
+    """(base code, split table) of the 3 suits and the honors"""
+
+    parts = [(start, _suit_splits(tuple(counts[start:start + 9]), False)) for start in SUIT_STARTS]
+    parts.append((31, _suit_splits(tuple(counts[31:38]) + (0, 0), True)))
+    return parts
+
+@lru_cache(maxsize=1 << 16)
+def _decompositions(counts):
+    """All mentsu + pair decompositions of a complete hand, blocks as (kind, code)"""
+
+    if sum(counts) % 3 != 2:
+        return ()
+
+    tables = []
+    for start, splits in _parts(counts):
+        if not splits:
+            return ()
+        tables.append([
+            (tuple((kind, start + rank) for kind, rank in blocks), pairs)
+            for blocks, pairs in splits
+        ])
+
+    results = []
+    for combo in product(*tables):
+        if sum(pairs for _, pairs in combo) != 1:
+            continue
+        blocks = []
+        for part_blocks, _ in combo:
+            blocks.extend(part_blocks)
+        results.append(tuple(blocks))
+    return tuple(results)
+
+def _is_chiitoi(counts):
+    return sum(counts) == 14 and all(c in (0, 2) for c in counts) and counts.count(2) == 7
+
+def _is_kokushi(counts):
+    return sum(counts) == 14 and all(counts[code] for code in TERMINAL_CODES) and \
+        sum(counts[code] for code in TERMINAL_CODES) == 14
+
+def _block_shape(kind, start, code):
+    """Shape of the wait when code completes this block"""
+
+    if kind == "pair":
+        return "tanki"
+    if kind == "koutsu":
+        return "shanpon"
+
+    position = code - start
+    rank = start % 10
+    if position == 1:
+        return "kanchan"
+    if (position == 2 and rank == 1) or (position == 0 and rank == 7):
+        return "penchan"
+    return "ryanmen"
+
+# --- Waits --- #
+
+class Waits:
+    @staticmethod
+    def decompositions(counts):
+        """Mentsu + pair decompositions of a complete hand (chiitoi/kokushi are not included)"""
+
+        return _decompositions(tuple(counts))
+
+    @staticmethod
+    def is_agari(counts):
+        """Agari check on a count tuple"""
+
+        counts = tuple(counts)
+        return bool(_decompositions(counts)) or _is_chiitoi(counts) or _is_kokushi(counts)
+
+    @staticmethod
+    def wait_shapes(counts, code):
+        """Shapes with which code completes this out of turn hand, empty if it does not"""
+
+        drawn = list(counts)
+        drawn[code] += 1
+        drawn = tuple(drawn)
+
+        shapes = set()
+        for blocks in _decompositions(drawn):
+            for kind, start in blocks:
+                if kind == "shuntsu" and start <= code <= start + 2:
+                    shapes.add(_block_shape(kind, start, code))
+                elif kind != "shuntsu" and start == code:
+                    shapes.add(_block_shape(kind, start, code))
+
+        if _is_chiitoi(drawn):
+            shapes.add("tanki")
+        if _is_kokushi(drawn):
+            shapes.add("kokushi13" if counts[code] == 1 else "kokushi")
+        return shapes
+
+    @staticmethod
+    def enumerate(counts, visible=None, tile_set=None):
+        """Full wait set of an out of turn hand.
+        Returns: {"tenpai", "waits": [{"code", "tile", "shapes", "remaining"}], "remaining", "shapes"}"""
+
+        counts = tuple(counts)
+        left = Efficiency.remaining(counts, visible, tile_set)
+
+        waits = []
+        for code in Efficiency.candidate_draws(counts, tile_set):
+            # The 5th copy of a tile is not a wait
+            if counts[code] >= 4:
+                continue
+            shapes = Waits.wait_shapes(counts, code)
+            if shapes:
+                waits.append({"code": code, "tile": Efficiency.code_to_tile(code), "shapes": shapes, "remaining": left[code]})
+
+        # Nobetan: a tanki that is also a tanki 3 ranks away (1234 -> 1/4)
+        tanki_codes = {wait["code"] for wait in waits if "tanki" in wait["shapes"] and wait["code"] < 30}
+        for wait in waits:
+            code = wait["code"]
+            if code in tanki_codes and any(other // 10 == code // 10 and other in tanki_codes for other in (code - 3, code + 3)):
+                wait["shapes"].discard("tanki")
+                wait["shapes"].add("nobetan")
+
+        for wait in waits:
+            wait["shapes"] = sorted(wait["shapes"], key=SHAPE_ORDER.index)
+
+        shapes = sorted({shape for wait in waits for shape in wait["shapes"]}, key=SHAPE_ORDER.index)
+        return {
+            "tenpai": bool(waits),
+            "waits": waits,
+            "remaining": sum(wait["remaining"] for wait in waits),
+            "shapes": shapes,
+        }
+
+    @staticmethod
+    def analyse_hand(tiles, visible=None, tile_set=None):
+        """One call for a whole hand (string, tile list or codes), in or out of turn.
+        Returns: {"state": "agari"/"tenpai"/"noten"/"invalid", "waits": ... (out of turn),
+        "discards": {code: enumerate result} (in turn, tenpai discards only)}"""
+
+        counts = Efficiency.to_counts(tiles)
+        n = sum(counts)
+
+        if n in [1, 4, 7, 10, 13]:
+            result = Waits.enumerate(counts, visible, tile_set)
+            return {"state": "tenpai" if result["tenpai"] else "noten", "waits": result, "discards": {}}
+
+        if n in [2, 5, 8, 11, 14]:
+            discards = {}
+            # Cheap shanten check first, only tenpai discards are enumerated
+            for code in ALL_CODES:
+                if not counts[code]:
+                    continue
+                after = list(counts)
+                after[code] -= 1
+                if Efficiency.shanten(after) > 0:
+                    continue
+                result = Waits.enumerate(after, visible, tile_set)
+                if result["tenpai"]:
+                    discards[code] = result
+
+            if Waits.is_agari(counts):
+                state = "agari"
+            else:
+                state = "tenpai" if discards else "noten"
+            return {"state": state, "waits": None, "discards": discards}
+
+        return {"state": "invalid", "waits": None, "discards": {}}
+
+    @staticmethod
+    def hand_code(tiles):
+        """Same codes as Validator.check_mahjong_hand, from the single call above"""
+
+        result = Waits.analyse_hand(tiles)
+        if result["state"] == "agari":
+            return 3
+        if result["state"] == "tenpai":
+            return 2 if result["waits"] is None else 1
+        return 0
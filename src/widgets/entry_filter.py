@@ -8,6 +8,10 @@ from datetime import datetime
 
 from src.utils.i18n import Dict
 from src.utils.format_applier import apply_font_to_widgets
+from src.utils.analysis_store import SHANTEN_BUCKETS, WAIT_FILTER_SHAPES
+
+# Label of each shanten bucket of the filter
+SHANTEN_LABELS = ["shanten.agari", "shanten.tenpai", "shanten.one", "shanten.two", "shanten.more"]
 from src.widgets.hint_dialog import StyledMessageBox
 
 class NoWheelSlider(QSlider):
@@ -34,6 +38,8 @@ class EntryFilterDialog(QDialog):
             'wind': [],
             'self_wind': [],
             'game': [],
+            'shanten': [],
+            'waits': [],
             'difficulty_min': 0,
             'difficulty_max': 100,
             'accuracy_min': 0,
@@ -318,6 +324,52 @@ class EntryFilterDialog(QDialog):
         row2_layout.setAlignment(wind_layout, Qt.AlignTop)
         row2_layout.setAlignment(game_layout, Qt.AlignTop)
         layout.addLayout(row2_layout)
+
+        # Shanten (precomputed columns, see AnalysisStore)
+        row3_layout = QHBoxLayout()
+        row3_layout.setSpacing(10)
+        row3_layout.setContentsMargins(0, 0, 0, 0)
+
+        shanten_layout = QVBoxLayout()
+        self.shanten_title = QLabel(Dict.t("filter.shanten"))
+        self.shanten_title.setStyleSheet("QLabel{padding:8; color: #585858;}")
+        shanten_checkboxes = QHBoxLayout()
+        shanten_checkboxes.setSpacing(5)
+        self.shanten_cbs = {}
+        for bucket, label in zip(SHANTEN_BUCKETS, SHANTEN_LABELS):
+            self.shanten_cbs[bucket] = QCheckBox(Dict.t(label))
+            shanten_checkboxes.addWidget(self.shanten_cbs[bucket])
+        shanten_checkboxes.addStretch()
+
+        shanten_layout.addWidget(self.shanten_title)
+        shanten_layout.addLayout(shanten_checkboxes)
+        row3_layout.addLayout(shanten_layout, 1)
+
+        row3_layout.setAlignment(Qt.AlignTop)
+        layout.addLayout(row3_layout)
+
+        # Wait shapes (same columns)
+        row4_layout = QHBoxLayout()
+        row4_layout.setSpacing(10)
+        row4_layout.setContentsMargins(0, 0, 0, 0)
+
+        waits_layout = QVBoxLayout()
+        self.waits_title = QLabel(Dict.t("filter.waits"))
+        self.waits_title.setStyleSheet("QLabel{padding:8; color: #585858;}")
+        waits_checkboxes = QHBoxLayout()
+        waits_checkboxes.setSpacing(5)
+        self.wait_cbs = {}
+        for shape in WAIT_FILTER_SHAPES:
+            self.wait_cbs[shape] = QCheckBox(Dict.t(f"wait.{shape}"))
+            waits_checkboxes.addWidget(self.wait_cbs[shape])
+        waits_checkboxes.addStretch()
+
+        waits_layout.addWidget(self.waits_title)
+        waits_layout.addLayout(waits_checkboxes)
+        row4_layout.addLayout(waits_layout, 1)
+
+        row4_layout.setAlignment(Qt.AlignTop)
+        layout.addLayout(row4_layout)
         
         group.setLayout(layout)
         parent_layout.addWidget(group)
@@ -605,7 +657,8 @@ class EntryFilterDialog(QDialog):
                         self.image_have_cb, self.image_no_have_cb,
                         self.wind_east_cb, self.wind_south_cb, self.wind_west_cb, self.wind_north_cb,
                         self.swind_east_cb, self.swind_south_cb, self.swind_west_cb, self.swind_north_cb,
-                        self.game_1_cb, self.game_2_cb, self.game_3_cb, self.game_4_cb]:
+                        self.game_1_cb, self.game_2_cb, self.game_3_cb, self.game_4_cb] + \
+                        list(self.shanten_cbs.values()) + list(self.wait_cbs.values()):
             checkbox.toggled.connect(self.update_label_colors)
         
         # Slider
@@ -678,6 +731,10 @@ class EntryFilterDialog(QDialog):
                          self.game_3_cb.isChecked(),
                          self.game_4_cb.isChecked()])
         
+        shanten_active = any(checkbox.isChecked() for checkbox in self.shanten_cbs.values())
+
+        waits_active = any(checkbox.isChecked() for checkbox in self.wait_cbs.values())
+        
         # Value filter
         difficulty_active = not (self.difficulty_min_slider.value() == 0 and self.difficulty_max_slider.value() == 100)
         accuracy_active = not (self.accuracy_min_slider.value() == 0 and self.accuracy_max_slider.value() == 100)
@@ -712,6 +769,8 @@ class EntryFilterDialog(QDialog):
         apply_title_color(getattr(self, 'wind_title', None), wind_active)
         apply_title_color(getattr(self, 'game_title', None), game_active)
         apply_title_color(getattr(self, 'swind_title', None), swind_active)
+        apply_title_color(getattr(self, 'shanten_title', None), shanten_active)
+        apply_title_color(getattr(self, 'waits_title', None), waits_active)
 
         apply_title_color(getattr(self, 'difficulty_title', None), difficulty_active)
         apply_title_color(getattr(self, 'accuracy_title', None), accuracy_active)
@@ -741,7 +800,8 @@ class EntryFilterDialog(QDialog):
                         self.image_have_cb, self.image_no_have_cb,
                         self.wind_east_cb, self.wind_south_cb, self.wind_west_cb, self.wind_north_cb,
                         self.swind_east_cb, self.swind_south_cb, self.swind_west_cb, self.swind_north_cb,
-                        self.game_1_cb, self.game_2_cb, self.game_3_cb, self.game_4_cb]:
+                        self.game_1_cb, self.game_2_cb, self.game_3_cb, self.game_4_cb] + \
+                        list(self.shanten_cbs.values()) + list(self.wait_cbs.values()):
             checkbox.setChecked(False)
         
         self.difficulty_min_slider.setValue(0)
@@ -842,12 +902,16 @@ class EntryFilterDialog(QDialog):
         if self.game_4_cb.isChecked():
             game_values.append('4')
         
+        shanten_values = [bucket for bucket, checkbox in self.shanten_cbs.items() if checkbox.isChecked()]
+        
         self.filter_state['source'] = source_values
         self.filter_state['players'] = players_values
         self.filter_state['image'] = image_values
         self.filter_state['wind'] = wind_values
         self.filter_state['game'] = game_values
         self.filter_state['self_wind'] = swind_values
+        self.filter_state['shanten'] = shanten_values
+        self.filter_state['waits'] = [shape for shape, checkbox in self.wait_cbs.items() if checkbox.isChecked()]
         
         difficulty_min, difficulty_max = self.difficulty_min_slider.value(), self.difficulty_max_slider.value()
         accuracy_min, accuracy_max = self.accuracy_min_slider.value(), self.accuracy_max_slider.value()
@@ -1022,6 +1086,14 @@ class EntryFilterDialog(QDialog):
             elif game == '4':
                 self.game_4_cb.setChecked(True)
         
+        for bucket in self.filter_state.get('shanten', []):
+            if bucket in self.shanten_cbs:
+                self.shanten_cbs[bucket].setChecked(True)
+
+        for shape in self.filter_state.get('waits', []):
+            if shape in self.wait_cbs:
+                self.wait_cbs[shape].setChecked(True)
+        
         self.difficulty_min_slider.setValue(self.filter_state['difficulty_min'])
         self.difficulty_max_slider.setValue(self.filter_state['difficulty_max'])
         self.accuracy_min_slider.setValue(self.filter_state['accuracy_min'])
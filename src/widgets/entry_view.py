@@ -0,0 +1,351 @@
+import os
+from collections import OrderedDict
+from PyQt5.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize, pyqtSignal
+from PyQt5.QtGui import QPixmap, QFont, QFontMetrics, QColor, QPen
+
+from src.utils.i18n import Dict
+from src.utils.tile_pixmaps import TileAtlas
+from src.utils.validators import Validator
+
+ENTRY_ID_ROLE = Qt.UserRole
+ENTRY_ROLE = Qt.UserRole + 1
+SELECTED_ROLE = Qt.UserRole + 2
+
+# Cells per row and card size of each layout (same as the old frame cards)
+LAYOUTS = {
+    "grid": {"columns": 4, "height": 360, "min_width": 200, "max_width": 500, "tile_size": 32, "tile_spacing": 0, "drawn_gap": 20},
+    "list": {"columns": 2, "height": 108, "min_width": 0, "max_width": 0, "tile_size": 42, "tile_spacing": 1, "drawn_gap": 38},
+}
+SPACING = 12
+PADDING = 10
+IMAGE_HEIGHT = 200
+IMAGE_WIDTH = 300
+
+# Scaled images kept for scrolling back, whatever the size of the bank
+THUMBNAIL_CACHE = 120
+
+# --- Model --- #
+
+class EntryListModel(QAbstractListModel):
+    def __init__(self, parent=None):
+
+        super().__init__(parent)
+        self.ids = []
+        self.rows = {}
+        self.entries = {}
+        self.selected = {}  # Shared with the page (its selected_entries)
+
+    def set_entries(self, entries):
+        """Show an ordered {id: data}, only the rows on screen are ever painted"""
+
+        self.beginResetModel()
+        self.entries = entries
+        self.ids = list(entries)
+        self.rows = {entry_id: row for row, entry_id in enumerate(self.ids)}
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+
+        return 0 if parent.isValid() else len(self.ids)
+
+    def data(self, index, role=Qt.DisplayRole):
+
+        if not index.isValid() or not 0 <= index.row() < len(self.ids):
+            return None
+        entry_id = self.ids[index.row()]
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return self.entries[entry_id].get('title', '')
+        if role == ENTRY_ID_ROLE:
+            return entry_id
+        if role == ENTRY_ROLE:
+            return self.entries[entry_id]
+        if role == SELECTED_ROLE:
+            return entry_id in self.selected
+        return None
+
+    def refresh(self, entry_id=None):
+        """Repaint one entry (its selection changed), or all of them"""
+
+        if not self.ids:
+            return
+        if entry_id is None:
+            self.dataChanged.emit(self.index(0), self.index(len(self.ids) - 1), [SELECTED_ROLE])
+        elif entry_id in self.rows:
+            index = self.index(self.rows[entry_id])
+            self.dataChanged.emit(index, index, [SELECTED_ROLE])
+
+# --- Delegate --- #
+
+class EntryDelegate(QStyledItemDelegate):
+    def __init__(self, images_dir, meta_text, parent=None):
+        """meta_text: entry data -> the grey "source | game" line"""
+
+        super().__init__(parent)
+        self.images_dir = images_dir
+        self.meta_text = meta_text
+        self.layout = "list"
+        self.cell_size = QSize(400, LAYOUTS["list"]["height"] + SPACING)
+        self.font = QFont()
+        self.bold_font = QFont()
+        self.thumbnails = OrderedDict()
+
+    def set_font(self, font):
+
+        self.font = QFont(font)
+        self.bold_font = QFont(font)
+        self.bold_font.setBold(True)
+
+    def sizeHint(self, option, index):
+
+        return self.cell_size
+
+    # Pixmaps
+
+    def thumbnail(self, image_filename):
+        """Scaled image of an entry, the least recently painted ones are dropped"""
+
+        if image_filename in self.thumbnails:
+            self.thumbnails.move_to_end(image_filename)
+            return self.thumbnails[image_filename]
+
+        image_path = os.path.join(self.images_dir, image_filename)
+        pixmap = QPixmap(image_path) if os.path.exists(image_path) else QPixmap()
+        if not pixmap.isNull():
+            pixmap = pixmap.scaled(IMAGE_WIDTH, IMAGE_HEIGHT, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self.thumbnails[image_filename] = pixmap
+        if len(self.thumbnails) > THUMBNAIL_CACHE:
+            self.thumbnails.popitem(last=False)
+        return pixmap
+
+    def forget_images(self):
+        """Drop the scaled images (an image may have been replaced under the same name)"""
+
+        self.thumbnails.clear()
+
+    # Painting
+
+    def card_rect(self, cell):
+
+        rect = cell.adjusted(SPACING // 2, SPACING // 2, -SPACING // 2, -SPACING // 2)
+        max_width = LAYOUTS[self.layout]["max_width"]
+        if max_width and rect.width() > max_width:
+            rect.setLeft(rect.left() + (rect.width() - max_width) // 2)
+            rect.setWidth(max_width)
+        return rect
+
+    def paint(self, painter, option, index):
+
+        entry_data = index.data(ENTRY_ROLE)
+        if entry_data is None:
+            return
+        rect = self.card_rect(option.rect)
+
+        painter.save()
+
+        # Card: black border, blue with a light fill when hovered, blue with a blue fill when selected
+        if index.data(SELECTED_ROLE):
+            painter.fillRect(rect, QColor("#E0EEF9"))
+            border = QColor("#0078d4")
+        elif option.state & QStyle.State_MouseOver:
+            painter.fillRect(rect, QColor("#f8fbff"))
+            border = QColor("#0078d4")
+        else:
+            border = QColor("#000000")
+        painter.setPen(QPen(border, 1))
+        painter.drawRect(rect.adjusted(0, 0, -1, -1))
+
+        inner = rect.adjusted(PADDING, PADDING, -PADDING, -PADDING)
+        if self.layout == "grid":
+            self.paint_grid(painter, inner, entry_data)
+        else:
+            self.paint_list(painter, inner, entry_data)
+        painter.restore()
+
+    def paint_grid(self, painter, inner, entry_data):
+        """Image, title, metadata and hand, top to bottom"""
+
+        image_rect = QRect(inner.left(), inner.top(), inner.width(), IMAGE_HEIGHT)
+        painter.fillRect(image_rect, QColor("#f5f5f5"))
+        pixmap = self.thumbnail(entry_data['image_filename']) if entry_data.get('image_filename') else None
+        if pixmap is not None and not pixmap.isNull():
+            x = image_rect.left() + (image_rect.width() - pixmap.width()) // 2
+            y = image_rect.top() + (image_rect.height() - pixmap.height()) // 2
+            painter.drawPixmap(x, y, pixmap)
+        else:
+            painter.setFont(self.font)
+            painter.setPen(QColor("#000000"))
+            painter.drawText(image_rect, Qt.AlignCenter, Dict.t("library.no_image"))
+
+        top = image_rect.bottom() + 1 + 8
+        top = self.paint_text(painter, inner.left(), top, min(inner.width(), 320), entry_data.get('title', ''), self.bold_font, "#000000")
+        top = self.paint_text(painter, inner.left(), top + 8, inner.width(), self.meta_text(entry_data), self.font, "#666666")
+        self.paint_hand(painter, inner.left(), top + 8, entry_data.get('hands', ''))
+
+    def paint_list(self, painter, inner, entry_data):
+        """Title and metadata on one row, the hand below"""
+
+        metrics = QFontMetrics(self.font)
+        meta = self.meta_text(entry_data)
+        meta_width = metrics.horizontalAdvance(meta)
+        painter.setFont(self.font)
+        painter.setPen(QColor("#666666"))
+        painter.drawText(QRect(inner.right() - meta_width, inner.top(), meta_width + 1, metrics.height()),
+                         Qt.AlignRight | Qt.AlignVCenter, meta)
+
+        title_width = min(350, max(0, inner.width() - meta_width - 8))
+        top = self.paint_text(painter, inner.left(), inner.top(), title_width, entry_data.get('title', ''), self.bold_font, "#000000")
+        self.paint_hand(painter, inner.left(), top + 8, entry_data.get('hands', ''))
+
+    def paint_text(self, painter, left, top, width, text, font, color):
+        """One elided line, returns: the y under it"""
+
+        metrics = QFontMetrics(font)
+        painter.setFont(font)
+        painter.setPen(QColor(color))
+        painter.drawText(QRect(left, top, width, metrics.height()), Qt.AlignLeft | Qt.AlignVCenter,
+                         metrics.elidedText(text, Qt.ElideRight, width))
+        return top + metrics.height()
+
+    def paint_hand(self, painter, left, top, hand_text):
+        """Sorted tiles, the drawn one apart when the hand is in turn"""
+
+        settings = LAYOUTS[self.layout]
+        width, height = settings["tile_size"] - 11, settings["tile_size"] + 5
+        try:
+            tiles = Validator.parse_hand_tiles_for_display(hand_text)
+        except Exception as e:
+            painter.setFont(self.font)
+            painter.setPen(QColor("#000000"))
+            painter.drawText(QRect(left, top, 200, height), Qt.AlignLeft | Qt.AlignVCenter, "Hand error")
+            return
+
+        # All tiles of one size are blits from one atlas pixmap
+        atlas = TileAtlas.get(width, height, painter.device().devicePixelRatioF())
+        x = left
+        for i, tile in enumerate(tiles):
+            if i == len(tiles) - 1 and len(tiles) in [2, 5, 8, 11, 14]:
+                x += settings["drawn_gap"] + settings["tile_spacing"]
+            size = atlas.logical_size(tile)
+            if size is None:
+                painter.setFont(self.font)
+                painter.setPen(QColor("#cccccc"))
+                painter.drawRect(x, top, width - 1, height - 1)
+                painter.setPen(QColor("#000000"))
+                painter.drawText(QRect(x, top, width, height), Qt.AlignCenter, tile)
+            else:
+                atlas.draw(painter, x + (width - size[0]) // 2, top + (height - size[1]) // 2, tile)
+            x += width + settings["tile_spacing"]
+
+# --- View --- #
+
+class EntryView(QListView):
+
+    entry_clicked = pyqtSignal(str)   # Normal mode: open the editor
+    entry_toggled = pyqtSignal(str)   # Selection mode: select / unselect
+
+    def __init__(self, images_dir, meta_text, parent=None):
+
+        super().__init__(parent)
+        self.entry_model = EntryListModel(self)
+        self.delegate = EntryDelegate(images_dir, meta_text, self)
+        self.setModel(self.entry_model)
+        self.setItemDelegate(self.delegate)
+
+        # Cards flow left to right and wrap, the rows are laid out a batch at a time
+        self.setViewMode(QListView.ListMode)
+        self.setFlow(QListView.LeftToRight)
+        self.setWrapping(True)
+        self.setResizeMode(QListView.Adjust)
+        self.setMovement(QListView.Static)
+        self.setLayoutMode(QListView.Batched)
+        self.setBatchSize(200)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.verticalScrollBar().setSingleStep(24)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setFocusPolicy(Qt.NoFocus)
+        self.setMouseTracking(True)
+        self.viewport().setAttribute(Qt.WA_Hover, True)
+        self.viewport().setCursor(Qt.PointingHandCursor)
+        self.setStyleSheet("""
+            QListView {
+                background-color: #FFFFFF;
+                border: 1px solid #FFFFFF;
+            }
+        """)
+
+        self.selection_mode = False
+        self.is_dragging = False
+        self.drag_start_selected = False
+
+    def set_layout(self, layout):
+
+        self.delegate.layout = layout
+        self.update_cell_size()
+
+    def set_font(self, font):
+
+        self.delegate.set_font(font)
+        self.viewport().update()
+
+    def set_entries(self, entries, selected):
+
+        self.entry_model.selected = selected
+        self.entry_model.set_entries(entries)
+        self.scrollToTop()
+
+    def update_cell_size(self):
+        """Cells split the width into the layout's columns (the scroll bar's room is always kept,
+        so showing it does not lay everything out again). QListView wraps at right(), one pixel
+        inside the width, so the columns must come to at most width - 1 or the last one wraps"""
+
+        settings = LAYOUTS[self.delegate.layout]
+        width = self.maximumViewportSize().width() - self.verticalScrollBar().sizeHint().width()
+        cell_width = max(settings["min_width"] + SPACING, (width - 1) // settings["columns"])
+        size = QSize(cell_width, settings["height"] + SPACING)
+        if size != self.delegate.cell_size or size != self.gridSize():
+            self.delegate.cell_size = size
+            self.setGridSize(size)
+
+    def resizeEvent(self, event):
+
+        self.update_cell_size()
+        super().resizeEvent(event)
+
+    # Mouse: click to edit, or click and drag to select many
+
+    def mousePressEvent(self, event):
+
+        index = self.indexAt(event.pos())
+        if event.button() != Qt.LeftButton or not index.isValid():
+            super().mousePressEvent(event)
+            return
+
+        entry_id = index.data(ENTRY_ID_ROLE)
+        if self.selection_mode:
+            self.is_dragging = True
+            # Drag start's status
+            self.drag_start_selected = entry_id in self.entry_model.selected
+            self.entry_toggled.emit(entry_id)
+        else:
+            self.entry_clicked.emit(entry_id)
+
+    def mouseMoveEvent(self, event):
+
+        if self.selection_mode and self.is_dragging and event.buttons() & Qt.LeftButton:
+            index = self.indexAt(event.pos())
+            if index.isValid():
+                entry_id = index.data(ENTRY_ID_ROLE)
+                # Entries already switched by this drag are skipped
+                if (entry_id in self.entry_model.selected) == self.drag_start_selected:
+                    self.entry_toggled.emit(entry_id)
+            return
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+
+        if event.button() == Qt.LeftButton:
+            self.is_dragging = False
+        super().mouseReleaseEvent(event)
@@ -0,0 +1,176 @@
+from PyQt5.QtWidgets import QWidget, QSizePolicy
+from PyQt5.QtCore import Qt, QRect, QRectF, QSize, pyqtSignal
+from PyQt5.QtGui import QPainter, QPen, QColor, QCursor
+
+from src.utils.tile_pixmaps import TileAtlas
+
+SELECTED_COLOR = "#0056B3"
+CORRECT_COLOR = "#00ad00"
+WRONG_COLOR = "#ff0000"
+
+BORDER_WIDTH = 8
+BORDER_RADIUS = 6
+DIMMED_OPACITY = 0.4
+
+class HandView(QWidget):
+    """A whole row of tiles in one widget: painted in one paintEvent (drawn tile apart,
+    selection and feedback borders) and clicks are hit-tested here, no QLabel per tile"""
+
+    tile_clicked = pyqtSignal(int)
+
+    def __init__(self, tile_width, tile_height, spacing=0, drawn_gap=0, slots=0, clickable=True, parent=None):
+        """drawn_gap: extra space before the last tile of a hand in turn (2, 5, 8, 11, 14 tiles).
+        slots: always show this many tiles, the missing ones as backs (dora box).
+        clickable: False for a row only to look at, never dimmed and never clicked"""
+
+        super().__init__(parent)
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self.spacing = spacing
+        self.drawn_gap = drawn_gap
+        self.slots = slots
+        self.clickable = clickable
+
+        self.tiles = []
+        self.selected = None
+        self.interactive = False
+        self.blocked = set()   # Indexes that cannot be clicked (dimmed, forbidden cursor)
+        self.feedback = None   # {index: color} once answered, the other tiles are dimmed
+
+        self.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
+        self.setMouseTracking(clickable)
+        self.set_tiles([])
+
+    # --- State --- #
+
+    def set_tiles(self, tiles):
+        """Show these tiles ("1m", "0p"...) and forget selection, limits and feedback"""
+
+        self.tiles = list(tiles) + ["back"] * max(0, self.slots - len(tiles))
+        self.selected = None
+        self.blocked = set()
+        self.feedback = None
+        self.rects = self.tile_rects()
+        right = max([rect.right() + 1 for rect in self.rects], default=0)
+        self.setFixedSize(right, self.tile_height)
+        self.update()
+
+    def set_interactive(self, interactive):
+        """Clickable (full opacity) or not (dimmed)"""
+
+        self.interactive = interactive
+        self.update_cursor()
+        self.update()
+
+    def set_blocked(self, indexes):
+
+        self.blocked = set(indexes)
+        self.update_cursor()
+        self.update()
+
+    def set_selected(self, index):
+
+        self.selected = index
+        self.update()
+
+    def set_feedback(self, borders):
+        """Answered: {index: color} tiles get a border, every other one is dimmed"""
+
+        self.feedback = dict(borders)
+        self.update_cursor()
+        self.update()
+
+    def tile_rects(self):
+        """Rect of every tile in widget coordinates"""
+
+        in_turn = len(self.tiles) in [2, 5, 8, 11, 14] and not self.slots
+        rects = []
+        x = 0
+        for i in range(len(self.tiles)):
+            if in_turn and i == len(self.tiles) - 1:
+                x += self.drawn_gap
+            rects.append(QRect(x, 0, self.tile_width, self.tile_height))
+            x += self.tile_width + self.spacing
+        return rects
+
+    def index_at(self, pos):
+        """Index of the tile under a point, None between or beside tiles"""
+
+        for i, rect in enumerate(self.rects):
+            if rect.contains(pos):
+                return i
+        return None
+
+    def is_clickable(self, index):
+
+        return index is not None and self.clickable and self.interactive and self.feedback is None and index not in self.blocked
+
+    # --- Qt --- #
+
+    def sizeHint(self):
+
+        return QSize(self.width(), self.tile_height)
+
+    def mousePressEvent(self, event):
+
+        index = self.index_at(event.pos())
+        if event.button() == Qt.LeftButton and self.is_clickable(index):
+            self.tile_clicked.emit(index)
+        else:
+            event.ignore()
+
+    def mouseMoveEvent(self, event):
+
+        self.update_cursor(event.pos())
+        super().mouseMoveEvent(event)
+
+    def update_cursor(self, pos=None):
+
+        if pos is None:
+            pos = self.mapFromGlobal(QCursor.pos())
+        index = self.index_at(pos)
+        if self.is_clickable(index):
+            self.setCursor(Qt.PointingHandCursor)
+        elif index is not None and self.clickable and self.interactive and self.feedback is None:
+            self.setCursor(Qt.ForbiddenCursor)
+        else:
+            self.setCursor(Qt.ArrowCursor)
+
+    def paintEvent(self, event):
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        atlas = TileAtlas.get(self.tile_width, self.tile_height, self.devicePixelRatioF())
+
+        for i, (tile, rect) in enumerate(zip(self.tiles, self.rects)):
+            if not rect.intersects(event.rect()):
+                continue
+
+            if self.feedback is not None:
+                border = self.feedback.get(i)
+                dimmed = border is None
+            else:
+                border = SELECTED_COLOR if i == self.selected else None
+                dimmed = self.clickable and (not self.interactive or i in self.blocked)
+            painter.setOpacity(DIMMED_OPACITY if dimmed else 1.0)
+
+            size = atlas.logical_size(tile)
+            if size is None:
+                # Fallback..
+                painter.setPen(QColor("#000000"))
+                painter.drawRect(rect.adjusted(0, 0, -1, -1))
+                painter.drawText(rect, Qt.AlignCenter, "?" if tile == "back" else tile)
+            else:
+                atlas.draw(painter, rect.x() + (rect.width() - size[0]) // 2,
+                           rect.y() + (rect.height() - size[1]) // 2, tile)
+
+            if border is not None:
+                pen = QPen(QColor(border))
+                pen.setWidth(BORDER_WIDTH)
+                painter.setPen(pen)
+                painter.setBrush(Qt.NoBrush)
+                border_rect = QRectF(rect.x() + 3, rect.y() + 3, rect.width() - 6, rect.height() - 6)
+                painter.drawRoundedRect(border_rect, BORDER_RADIUS, BORDER_RADIUS)
+
+        painter.end()
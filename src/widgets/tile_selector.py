@@ -1,14 +1,14 @@
-import os
 from PyQt5.QtWidgets import (   QDialog, QVBoxLayout, QHBoxLayout, QPushButton, 
                                 QLabel, QFrame, QScrollArea, QWidget, QMessageBox,
                                 QApplication, QGraphicsOpacityEffect)
 from PyQt5.QtCore import Qt, pyqtSignal, QEvent
-from PyQt5.QtGui import QPixmap, QFont
+from PyQt5.QtGui import QFont
 from collections import Counter
 
 from src.utils.i18n import Dict
 from src.utils.format_applier import apply_font_to_widgets
-from src.utils.path_finder import get_resource_path
+from src.utils.melds import Melds
+from src.utils.tile_pixmaps import TilePixmaps
 
 class TileSelector(QDialog):
 
@@ -363,11 +363,7 @@ class TileSelector(QDialog):
             tile_label = QLabel()
             
             # Load tile image
-            tile_filename = f"{tile}.png"
-            tile_path = get_resource_path(os.path.join("src", "assets", "tiles", tile_filename))
-            
-            pixmap = QPixmap(tile_path)
-            pixmap = pixmap.scaled(42, 60, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            pixmap = TilePixmaps.get(tile, 42, 60, self.devicePixelRatioF())
             tile_label.setPixmap(pixmap)
             
             tile_label.setFixedSize(42, 60)
@@ -487,11 +483,7 @@ class TileSelector(QDialog):
         
         tile_label = QLabel()
         
-        tile_filename = f"{tile}.png"
-        tile_path = get_resource_path(os.path.join("src", "assets", "tiles", tile_filename))
-        
-        pixmap = QPixmap(tile_path)
-        pixmap = pixmap.scaled(45, 60, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        pixmap = TilePixmaps.get(tile, 45, 60, self.devicePixelRatioF())
         tile_label.setPixmap(pixmap)
         tile_label.setFixedSize(45, 60)
         
@@ -512,10 +504,7 @@ class TileSelector(QDialog):
 
         tile_label = QLabel()
 
-        back_path = get_resource_path(os.path.join("src", "assets", "tiles", "back.png"))
-
-        pixmap = QPixmap(back_path)
-        pixmap = pixmap.scaled(45, 60, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        pixmap = TilePixmaps.get("back", 45, 60, self.devicePixelRatioF())
         tile_label.setPixmap(pixmap)
         tile_label.setFixedSize(45, 60)
 
@@ -551,11 +540,7 @@ class TileSelector(QDialog):
                     
                     tile_label = QLabel()
                     
-                    tile_filename = f"{tile}.png"
-                    tile_path = get_resource_path(os.path.join("src", "assets", "tiles", tile_filename))
-                    
-                    pixmap = QPixmap(tile_path)
-                    pixmap = pixmap.scaled(45, 60, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                    pixmap = TilePixmaps.get(tile, 45, 60, self.devicePixelRatioF())
                     tile_label.setPixmap(pixmap)
                     tile_label.setFixedSize(45, 60)
                     
@@ -575,9 +560,7 @@ class TileSelector(QDialog):
                     placeholder_label = QLabel()
                     
                     # Load back tile image
-                    back_path = get_resource_path(os.path.join("src", "assets", "tiles", "back.png"))
-                    pixmap = QPixmap(back_path)
-                    pixmap = pixmap.scaled(45, 60, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                    pixmap = TilePixmaps.get("back", 45, 60, self.devicePixelRatioF())
                     placeholder_label.setPixmap(pixmap)
                     placeholder_label.setFixedSize(45, 60)
                     placeholder_label.setCursor(Qt.ArrowCursor)
@@ -606,11 +589,7 @@ class TileSelector(QDialog):
                 tile_label = QLabel()
                 
                 # Load tile image
-                tile_filename = f"{tile}.png"
-                tile_path = get_resource_path(os.path.join("src", "assets", "tiles", tile_filename))
-                
-                pixmap = QPixmap(tile_path)
-                pixmap = pixmap.scaled(45, 60, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                pixmap = TilePixmaps.get(tile, 45, 60, self.devicePixelRatioF())
                 tile_label.setPixmap(pixmap)
                 tile_label.setFixedSize(45, 60)
 
@@ -668,11 +647,7 @@ class TileSelector(QDialog):
                 tile_label = QLabel()
                 
                 # Load tile image
-                tile_filename = f"{tile}.png"
-                tile_path = get_resource_path(os.path.join("src", "assets", "tiles", tile_filename))
-                
-                pixmap = QPixmap(tile_path)
-                pixmap = pixmap.scaled(45, 60, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                pixmap = TilePixmaps.get(tile, 45, 60, self.devicePixelRatioF())
                 tile_label.setPixmap(pixmap)
                 tile_label.setFixedSize(45, 60)
 
@@ -733,6 +708,14 @@ class TileSelector(QDialog):
 
         total_used_tiles = Counter(self.hands_tiles + self.dora_tiles)
 
+        # Tiles that can be discarded after at least one legal call
+        meld_discards = None
+        if (self.mode == "answer" and self.answer_action in ["chi", "pon", "kan"] and 
+            self.hands_for_validation):
+            meld_discards = Melds.discardable_tiles(
+                self.hands_for_validation, self.answer_action, self.is_three_player
+            )
+
         for row in range(self.tiles_layout.count()):
             row_widget = self.tiles_layout.itemAt(row).widget()
 
@@ -800,18 +783,9 @@ class TileSelector(QDialog):
                                 is_enabled = (  not reached_selector_max and 
                                                 not reached_global_limit)'''
 
-                            '''# Check if tiles are needed for furo
-                            if (is_enabled and self.mode == "answer" and self.answer_action and 
-                                self.answer_action in ["chi", "pon", "kan"] and 
-                                self.hands_for_validation):
-                                
-                                from src.utils.validators import Validator
-                                required_tiles = Validator.get_required_tiles_for_meld(
-                                    self.hands_for_validation, self.answer_action
-                                )
-                                
-                                if tile in required_tiles:
-                                    is_enabled = False'''
+                            # Check if tiles are needed for furo
+                            if is_enabled and meld_discards is not None and tile not in meld_discards:
+                                is_enabled = False
                             
                             effect = QGraphicsOpacityEffect()
                             effect.setOpacity(0.2 if not is_enabled else 1.0)